@@ -0,0 +1,75 @@
+#
+#   nueva_aerolinea sobre la red completa: Prim (que arma un Grafo con el
+#   árbol) más la escritura línea por línea, contra Kruskal con union-find
+#   más la escritura de una sola vez. Mide por separado cada etapa de
+#   Kruskal (sacar las aristas, ordenarlas, recorrerlas con el union-find y
+#   escribir el archivo) y verifica que los dos árboles pesen lo mismo.
+#
+
+import os
+import operator
+import tempfile
+import time
+import comun
+from comun import generar_csv, medir_tiempo
+from biblioteca import prim, kruskal
+from grafo import ConjuntosDisjuntos
+from flycombi import leer_archivo, escribir_archivo, PRECIO, TIEMPO, FRECUENCIA
+
+TAMANIOS = [(10000,50000),(50000,250000)]
+
+
+def escribir_por_linea(grafo,arbol,ruta):
+    """La exportación anterior: una escritura por arista del árbol."""
+    with open(ruta,"w") as f:
+        for (v,w),_ in arbol.ver_aristas():
+            pesos = grafo.ver_pesos(v,w)
+            f.write(f"{v},{w},{pesos[TIEMPO]},{pesos[PRECIO]},{pesos[FRECUENCIA]}" + "\n")
+
+
+def etapas_kruskal(grafo):
+    """Repite los pasos de kruskal() midiendo cada uno."""
+
+    tiempos = {}
+    inicio = time.perf_counter()
+    vista = grafo.vista(PRECIO)
+    indices = {v:i for i,v in enumerate(vista.ver_vertices())}
+    aristas = vista.ver_aristas()
+    tiempos["aristas"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    aristas.sort(key=operator.itemgetter(1))
+    tiempos["orden"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    conjuntos = ConjuntosDisjuntos(len(indices))
+    bosque = [arista for arista in aristas if conjuntos.unir(indices[arista[0][0]],indices[arista[0][1]])]
+    tiempos["union-find"] = time.perf_counter() - inicio
+    return tiempos,bosque
+
+
+def main():
+    print(f"{'V':>6} {'E':>7} | {'prim':>7} {'escribir':>8} | {'aristas':>7} {'orden':>7} {'unir':>7} "
+          f"{'escribir':>8} {'total':>7} {'mejora':>7}")
+    for n,m in TAMANIOS:
+        with tempfile.TemporaryDirectory() as directorio:
+            grafo,cities,flights = leer_archivo(*generar_csv(directorio,n,m))
+            ruta = os.path.join(directorio,"aerolinea.csv")
+
+            t_prim,arbol = medir_tiempo(prim,grafo,PRECIO)
+            t_escribir_linea = medir_tiempo(escribir_por_linea,grafo,arbol,ruta)[0]
+
+            tiempos,bosque = etapas_kruskal(grafo)
+            t_escribir = medir_tiempo(escribir_archivo,grafo,bosque,ruta)[0]
+            t_kruskal = medir_tiempo(kruskal,grafo,PRECIO)[0]
+
+            if sum(p for _,p in arbol.ver_aristas()) != sum(p for _,p in bosque):
+                raise SystemExit("Kruskal y Prim no dan árboles del mismo peso")
+            antes = t_prim + t_escribir_linea
+            despues = t_kruskal + t_escribir
+            print(f"{n:>6} {m:>7} | {t_prim:>6.2f}s {t_escribir_linea:>7.2f}s | {tiempos['aristas']:>6.2f}s "
+                  f"{tiempos['orden']:>6.2f}s {tiempos['union-find']:>6.2f}s {t_escribir:>7.2f}s {despues:>6.2f}s "
+                  f"{antes / despues:>6.1f}x")
+
+
+main()
@@ -0,0 +1,32 @@
+#
+#   Tiempo de arranque: leer los csv con leer_archivo (línea por línea) o
+#   con leer_red (por bloques), contra compilar el snapshot binario (primera
+#   vez) y cargarlo mapeado en memoria (siguientes).
+#
+
+import os
+import tempfile
+import comun
+from comun import generar_csv, medir_tiempo
+from flycombi import leer_archivo, COLUMNAS_VUELOS
+from snapshot import compilar, cargar
+from carga import leer_red, TAM_BLOQUE
+
+TAMANIOS = [(10000,50000),(50000,250000)]
+
+
+def main():
+    print(f"{'V':>6} {'E':>7} | {'leer_archivo':>12} {'leer_red':>9} {'filas/s':>9} | {'compilar':>9} {'cargar':>8}")
+    for n,m in TAMANIOS:
+        with tempfile.TemporaryDirectory() as directorio:
+            aeropuertos,vuelos = generar_csv(directorio,n,m)
+            ruta = os.path.join(directorio,"red.snap")
+            t_csv = medir_tiempo(leer_archivo,aeropuertos,vuelos)[0]
+            t_bloques = medir_tiempo(leer_red,aeropuertos,vuelos,COLUMNAS_VUELOS,TAM_BLOQUE,None)[0]
+            t_compilar = medir_tiempo(compilar,aeropuertos,vuelos,ruta,COLUMNAS_VUELOS)[0]
+            t_cargar = medir_tiempo(cargar,ruta,repeticiones=3)[0]
+            print(f"{n:>6} {m:>7} | {t_csv:>11.2f}s {t_bloques:>8.2f}s {m/t_bloques:>9,.0f} | "
+                  f"{t_compilar:>8.2f}s {1000*t_cargar:>6.1f}ms")
+
+
+main()
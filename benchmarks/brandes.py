@@ -0,0 +1,72 @@
+#
+#   Regresión de velocidad y correctitud de centralidad_betweeness
+#   (Brandes) contra la versión anterior, que seguía un único padre por
+#   vértice y ordenaba las distancias con quick_sort en cada fuente.
+#
+#   Con pesos reales aleatorios los caminos mínimos son únicos y ambas
+#   deben coincidir; con pesos enteros chicos hay empates y la versión
+#   anterior cuenta un solo camino por par, así que sólo se informa la
+#   diferencia.
+#
+
+import sys
+import random
+import comun
+from comun import grafo_aleatorio, medir_tiempo
+from grafo import Grafo
+from biblioteca import centralidad_betweeness, dijkstra, quick_sort
+
+TAMANIOS = [(200,600),(500,1500),(1000,3000)]
+TOLERANCIA = 1e-6
+
+
+def centralidad_un_padre(grafo):
+    """Versión anterior de centralidad_betweeness, como referencia."""
+    sys.setrecursionlimit(max(sys.getrecursionlimit(),10 * grafo.cantidad_vertices()))
+    cent = {}
+    vertices = grafo.ver_vertices()
+    for v in vertices:
+        cent[v] = 0
+    for v in vertices:
+        padre,distancia,x = dijkstra(grafo, v)
+        cent_aux = {}
+        for w in vertices:
+            cent_aux[w] = 0
+        distancias=list(distancia.items())
+        quick_sort(distancias)
+        for i in range (len(distancias)-1,-1,-1):
+            if padre[distancias[i][0]]!=None:
+                cent_aux[padre[distancias[i][0]]] +=  1 + cent_aux[distancias[i][0]]
+        for w in vertices:
+            if w ==  v: continue
+            cent[w] +=  cent_aux[w]
+    return cent
+
+
+def con_pesos_reales(grafo,semilla):
+    rnd = random.Random(semilla)
+    copia = Grafo()
+    for v in grafo.ver_vertices():
+        copia.agregar_vertice(v)
+    for (v,w),peso in grafo.ver_aristas():
+        copia.agregar_arista(v,w,rnd.random())
+    return copia
+
+
+def main():
+    fallas = 0
+    print(f"{'V':>5} {'E':>5} {'pesos':>8} | {'anterior':>9} {'brandes':>8} | {'dif max':>8}")
+    for n,m in TAMANIOS:
+        enteros = grafo_aleatorio(n,m,peso_max=5)
+        for nombre,grafo in (("reales",con_pesos_reales(enteros,n)),("enteros",enteros)):
+            t_anterior,anterior = medir_tiempo(centralidad_un_padre,grafo)
+            t_brandes,brandes = medir_tiempo(centralidad_betweeness,grafo)
+            diferencia = max(abs(anterior[v] - brandes[v]) for v in brandes)
+            if nombre == "reales" and diferencia > TOLERANCIA:
+                fallas += 1
+            print(f"{n:>5} {m:>5} {nombre:>8} | {t_anterior:>8.2f}s {t_brandes:>7.2f}s | {diferencia:>8.2f}")
+    print("OK" if fallas == 0 else f"{fallas} DIFERENCIAS")
+    sys.exit(1 if fallas else 0)
+
+
+main()
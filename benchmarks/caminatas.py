@@ -0,0 +1,56 @@
+#
+#   Pasos por segundo del recorrido aleatorio de centralidad_aproximada:
+#   elección lineal del vecino (pesos_ady + vertice_aleatorio, como antes)
+#   contra tablas de alias, y recorridos en lotes (NumPy, si está).
+#   El grafo tiene algunos aeropuertos "hub" de grado muy alto.
+#
+
+import random
+import comun
+from comun import grafo_aleatorio, medir_tiempo
+from biblioteca import pesos_ady, vertice_aleatorio, TablasAlias
+from biblioteca import centralidad_aproximada, centralidad_aproximada_lotes, np
+
+N = 20000
+M = 60000
+HUBS = 20
+GRADO_HUB = 2000
+CAMINOS = 100
+LARGO = 1000
+CAMINOS_LOTES = 10000 # Misma cantidad de pasos, en lotes anchos
+LARGO_LOTES = 10
+
+
+def grafo_con_hubs():
+    grafo = grafo_aleatorio(N,M)
+    vertices = grafo.ver_vertices()
+    rnd = random.Random(3)
+    for hub in vertices[:HUBS]:
+        for w in rnd.sample(vertices,GRADO_HUB):
+            if w != hub:
+                grafo.agregar_arista(hub,w,rnd.randint(1,50))
+    return grafo
+
+
+def caminata_lineal(grafo,cant_caminos,largo_camino):
+    vertice = grafo.vertice_aleatorio()
+    for i in range(cant_caminos):
+        for j in range(largo_camino):
+            vertice = vertice_aleatorio(pesos_ady(grafo,vertice))
+
+
+def main():
+    grafo = grafo_con_hubs()
+    pasos = CAMINOS * LARGO
+    t_tablas,tablas = medir_tiempo(TablasAlias,grafo)
+    print(f"armado de tablas de alias: {t_tablas:.2f}s (una sola vez)")
+    t_lineal = medir_tiempo(caminata_lineal,grafo,CAMINOS,LARGO)[0]
+    t_alias = medir_tiempo(centralidad_aproximada,grafo,CAMINOS,LARGO,None,tablas)[0]
+    tablas.arreglos()
+    t_lotes = medir_tiempo(centralidad_aproximada_lotes,grafo,CAMINOS_LOTES,LARGO_LOTES,None,tablas,0)[0]
+    print(f"{'lineal':>8}: {pasos/t_lineal:>12,.0f} pasos/s")
+    print(f"{'alias':>8}: {pasos/t_alias:>12,.0f} pasos/s")
+    print(f"{'lotes':>8}: {pasos/t_lotes:>12,.0f} pasos/s" + ("" if np else " (sin NumPy)"))
+
+
+main()
@@ -0,0 +1,35 @@
+#
+#   Tiempo y calidad de centralidad_muestreada (pivotes) frente a la
+#   centralidad exacta: coincidencia del top-n y error máximo sobre la
+#   centralidad normalizada, para distintos valores de epsilon.
+#
+
+import comun
+from comun import grafo_aleatorio, medir_tiempo
+from biblioteca import centralidad_betweeness, centralidad_muestreada, cantidad_pivotes
+
+N = 1500
+M = 4500
+TOP = 20
+CONFIANZA = 0.9
+EPSILONS = [0.2,0.1,0.07]
+
+
+def top(centralidad,n):
+    return set(sorted(centralidad,key=centralidad.get,reverse=True)[:n])
+
+
+def main():
+    grafo = grafo_aleatorio(N,M)
+    t_exacta,exacta = medir_tiempo(centralidad_betweeness,grafo,None,1,True)
+    print(f"exacta: {t_exacta:.2f}s")
+    print(f"{'epsilon':>7} {'pivotes':>7} | {'tiempo':>7} {'fraccion':>8} | {'top'+str(TOP):>6} {'error max':>9}")
+    for epsilon in EPSILONS:
+        k = cantidad_pivotes(N,epsilon,CONFIANZA)
+        t,aprox = medir_tiempo(centralidad_muestreada,grafo,epsilon,CONFIANZA,0,None,1,True)
+        coincidencia = len(top(exacta,TOP) & top(aprox,TOP)) / TOP
+        error = max(abs(exacta[v] - aprox[v]) for v in exacta)
+        print(f"{epsilon:>7} {k:>7} | {t:>6.2f}s {t/t_exacta:>8.2f} | {coincidencia:>6.0%} {error:>9.5f}")
+
+
+main()
@@ -0,0 +1,214 @@
+#
+#   Suite de comandos de flycombi sobre redes sintéticas: genera los csv de
+#   aeropuertos y vuelos de cada red y tamaño, corre cada comando en un
+#   proceso nuevo (como se usa el programa) y registra el tiempo y el pico
+#   de memoria (RSS máximo del proceso). Cada comando se corre
+#   --repeticiones veces y se queda el mejor tiempo. El tiempo incluye la
+#   carga de los csv, que se mide aparte como el comando "carga" (sin
+#   ningún comando), y se informa también descontándola.
+#
+#   Los resultados se guardan en JSON con --salida y se pueden comparar
+#   contra una corrida anterior con --base: se marcan los comandos cuyo
+#   tiempo sin la carga (o su memoria) supera en más de 'tolerancia' al de
+#   la base, y por más de --margen segundos para que unos milisegundos de
+#   ruido no cuenten; en ese caso el script termina con código 1. Por
+#   ejemplo:
+#
+#       python3 benchmarks/comandos.py --tamanios 1000,10000 --salida base.json
+#       python3 benchmarks/comandos.py --tamanios 1000,10000 --base base.json
+#
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from comun import generar_csv, grafo_con_hubs, grafo_radial
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FLYCOMBI = os.path.join(RAIZ,"flycombi.py")
+REDES = {"hubs":grafo_con_hubs,"radial":grafo_radial}
+TAMANIOS = [1000,10000]
+VUELOS_POR_AEROPUERTO = 3
+LIMITE = 300 # Segundos que puede tardar cada comando antes de cortarlo
+TOLERANCIA = 0.2
+MARGEN = 0.05 # Segundos que un comando puede empeorar sin que cuente, cualquiera sea la tolerancia
+REPETICIONES = 3
+CARGA = "carga"
+
+# (nombre, línea de comando, máximo de aeropuertos en el que se corre, o None)
+COMANDOS = [
+    (CARGA,"",None),
+    ("camino_mas barato","camino_mas barato,{origen},{destino}",None),
+    ("camino_mas rapido","camino_mas rapido,{origen},{destino}",None),
+    ("camino_escalas","camino_escalas {origen},{destino}",None),
+    ("vacaciones","vacaciones {origen},5",None),
+    ("nueva_aerolinea","nueva_aerolinea {aerolinea}",None),
+    ("centralidad_aprox","centralidad_aprox 10",None),
+    ("centralidad","centralidad 10",2000),
+]
+
+
+def correr(aeropuertos,vuelos,linea,limite):
+    """Corre flycombi con 'linea' por entrada estándar. Devuelve (estado,
+    segundos, pico de memoria en MB), con estado "ok", "error" o
+    "tiempo agotado"."""
+
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen([sys.executable,FLYCOMBI,aeropuertos,vuelos],stdin=subprocess.PIPE,
+                               stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL)
+    cortado = threading.Event()
+    def cortar():
+        cortado.set()
+        proceso.kill()
+    temporizador = threading.Timer(limite,cortar)
+    temporizador.start()
+    try:
+        proceso.stdin.write((linea + "\n").encode() if linea else b"")
+        proceso.stdin.close()
+        _,estado,uso = os.wait4(proceso.pid,0)
+    finally:
+        temporizador.cancel()
+    segundos = time.perf_counter() - inicio
+    proceso.returncode = os.waitstatus_to_exitcode(estado)
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    memoria = uso.ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10)
+    if cortado.is_set():
+        return "tiempo agotado",segundos,memoria
+    return ("ok" if proceso.returncode == 0 else "error"),segundos,memoria
+
+
+def ciudades(aeropuertos):
+    with open(aeropuertos) as archivo:
+        return sorted({linea.split(",",1)[0] for linea in archivo})
+
+
+def mejor_corrida(aeropuertos,vuelos,linea,limite,repeticiones):
+    """Corre el comando 'repeticiones' veces (menos si falla o se corta) y
+    devuelve (estado, mejor tiempo, mayor pico de memoria)."""
+
+    mejor = float('inf')
+    pico = 0.0
+    for _ in range(repeticiones):
+        estado,segundos,memoria = correr(aeropuertos,vuelos,linea,limite)
+        mejor = min(mejor,segundos)
+        pico = max(pico,memoria)
+        if estado != "ok":
+            break
+    return estado,mejor,pico
+
+
+def medir(redes,tamanios,limite,repeticiones):
+    resultados = []
+    for red in redes:
+        for n in tamanios:
+            m = n * VUELOS_POR_AEROPUERTO
+            with tempfile.TemporaryDirectory() as directorio:
+                inicio = time.perf_counter()
+                aeropuertos,vuelos = generar_csv(directorio,n,m,generador=REDES[red])
+                print(f"{red} {n}: csv generados en {time.perf_counter() - inicio:.1f}s", file=sys.stderr)
+                rnd = random.Random(0)
+                origen,destino = rnd.sample(ciudades(aeropuertos),2)
+                datos = {"origen":origen,"destino":destino,"aerolinea":os.path.join(directorio,"aerolinea.csv")}
+                carga = None
+                for nombre,plantilla,maximo in COMANDOS:
+                    if maximo is not None and n > maximo:
+                        continue
+                    estado,segundos,memoria = mejor_corrida(aeropuertos,vuelos,plantilla.format(**datos),limite,repeticiones)
+                    if nombre == CARGA:
+                        carga = segundos
+                    resultado = {"red":red,"aeropuertos":n,"vuelos":m,"comando":nombre,"estado":estado,
+                                 "segundos":round(segundos,4),"memoria_mb":round(memoria,1)}
+                    if nombre != CARGA and carga is not None:
+                        resultado["segundos_sin_carga"] = round(max(0.0,segundos - carga),4)
+                    resultados.append(resultado)
+                    mostrar(resultado)
+    return resultados
+
+
+def mostrar(resultado,base=None):
+    texto = (f"{resultado['red']:>7} {resultado['aeropuertos']:>7} {resultado['comando']:>18} | "
+             f"{resultado['estado']:>14} {resultado['segundos']:>9.3f}s {resultado['memoria_mb']:>8.1f}MB")
+    if base is not None:
+        texto += (f" | sin carga {tiempo_comparable(resultado):>8.3f}s, "
+                  f"base {tiempo_comparable(base):>8.3f}s {base['memoria_mb']:>8.1f}MB")
+    print(texto)
+
+
+def tiempo_comparable(resultado):
+    """El tiempo del comando sin la carga de los csv, que es casi todo el
+    tiempo de los comandos rápidos y sólo agrega ruido."""
+    return resultado.get("segundos_sin_carga",resultado["segundos"])
+
+
+def comparar(resultados,base,tolerancia,margen):
+    """Devuelve los resultados que empeoraron más de 'tolerancia' respecto
+    del resultado equivalente de la base: en memoria, o en tiempo sin la
+    carga si además la diferencia supera 'margen' segundos."""
+
+    anteriores = {(r["red"],r["aeropuertos"],r["comando"]):r for r in base["resultados"]}
+    peores = []
+    print("\nComparación con la base:")
+    for resultado in resultados:
+        anterior = anteriores.get((resultado["red"],resultado["aeropuertos"],resultado["comando"]))
+        if anterior is None:
+            continue
+        mostrar(resultado,anterior)
+        if anterior["estado"] == "ok" and resultado["estado"] != "ok":
+            peores.append(resultado)
+        elif (tiempo_comparable(resultado) > max(tiempo_comparable(anterior) * (1 + tolerancia),tiempo_comparable(anterior) + margen)
+                or resultado["memoria_mb"] > anterior["memoria_mb"] * (1 + tolerancia)):
+            peores.append(resultado)
+    return peores
+
+
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Tiempo y memoria de cada comando de flycombi sobre redes sintéticas.")
+    parser.add_argument("--redes",default=",".join(REDES),
+                        help=f"redes a generar, separadas por comas (de: {', '.join(REDES)})")
+    parser.add_argument("--tamanios",default=",".join(map(str,TAMANIOS)),
+                        help="cantidades de aeropuertos, separadas por comas (por ejemplo 1000,10000,100000)")
+    parser.add_argument("--limite",type=float,default=LIMITE,metavar="SEGUNDOS",
+                        help="tiempo máximo de cada comando (por defecto %(default)s)")
+    parser.add_argument("--repeticiones",type=int,default=REPETICIONES,
+                        help="veces que se corre cada comando, quedándose con el mejor tiempo (por defecto %(default)s)")
+    parser.add_argument("--salida",metavar="RUTA",help="guardar los resultados en JSON")
+    parser.add_argument("--base",metavar="RUTA",help="comparar contra los resultados JSON de una corrida anterior")
+    parser.add_argument("--tolerancia",type=float,default=TOLERANCIA,
+                        help="empeoramiento relativo admitido respecto de la base (por defecto %(default)s)")
+    parser.add_argument("--margen",type=float,default=MARGEN,metavar="SEGUNDOS",
+                        help="empeoramiento en segundos que nunca cuenta como regresión (por defecto %(default)s)")
+    return parser.parse_args()
+
+
+def main():
+    argumentos = parsear_argumentos()
+    redes = argumentos.redes.split(",")
+    for red in redes:
+        if red not in REDES:
+            raise SystemExit(f"Red desconocida '{red}'")
+    tamanios = [int(n) for n in argumentos.tamanios.split(",")]
+
+    print(f"{'red':>7} {'V':>7} {'comando':>18} | {'estado':>14} {'tiempo':>10} {'memoria':>10}")
+    resultados = medir(redes,tamanios,argumentos.limite,argumentos.repeticiones)
+
+    if argumentos.salida:
+        with open(argumentos.salida,"w") as archivo:
+            json.dump({"python":platform.python_version(),"plataforma":platform.platform(),
+                       "fecha":time.strftime("%Y-%m-%dT%H:%M:%S"),"resultados":resultados},archivo,indent=1)
+    if argumentos.base:
+        with open(argumentos.base) as archivo:
+            peores = comparar(resultados,json.load(archivo),argumentos.tolerancia,argumentos.margen)
+        if peores:
+            print(f"\n{len(peores)} comandos empeoraron más de {argumentos.tolerancia:.0%}:")
+            for resultado in peores:
+                mostrar(resultado)
+            sys.exit(1)
+
+
+main()
@@ -0,0 +1,41 @@
+#
+#   Compara memoria y latencia del Grafo (diccionario de diccionarios)
+#   contra GrafoCSR (arreglos compactos) sobre grafos aleatorios.
+#
+
+import comun
+from comun import grafo_aleatorio, medir_tiempo, medir_memoria
+from grafo import Grafo, GrafoCSR
+from biblioteca import dijkstra, bfs, prim
+
+TAMANIOS = [(1000,5000),(10000,50000),(50000,250000)]
+
+
+def copiar_grafo(grafo):
+    copia = Grafo()
+    for v in grafo.ver_vertices():
+        copia.agregar_vertice(v)
+    for (v,w),peso in grafo.ver_aristas():
+        copia.agregar_arista(v,w,peso)
+    return copia
+
+
+def main():
+    print(f"{'V':>7} {'E':>7} | {'mem dict':>10} {'mem csr':>10} | "
+          f"{'dijkstra dict':>13} {'dijkstra csr':>12} | {'bfs dict':>9} {'bfs csr':>9} | "
+          f"{'prim dict':>9} {'prim csr':>9}")
+    for n,m in TAMANIOS:
+        base = grafo_aleatorio(n,m)
+        mem_dict,grafo = medir_memoria(copiar_grafo,base)
+        mem_csr,csr = medir_memoria(GrafoCSR.desde_grafo,base)
+        origen = grafo.ver_vertices()[0]
+        tiempos = []
+        for funcion,args in ((dijkstra,(origen,)),(bfs,(origen,)),(prim,())):
+            for g in (grafo,csr):
+                tiempos.append(medir_tiempo(funcion,g,*args)[0])
+        print(f"{n:>7} {m:>7} | {mem_dict/2**20:>8.1f}MB {mem_csr/2**20:>8.1f}MB | "
+              f"{tiempos[0]:>12.3f}s {tiempos[1]:>11.3f}s | {tiempos[2]:>8.3f}s {tiempos[3]:>8.3f}s | "
+              f"{tiempos[4]:>8.3f}s {tiempos[5]:>8.3f}s")
+
+
+main()
@@ -0,0 +1,153 @@
+#
+#   Utilidades compartidas por los scripts de benchmark. Cada script se
+#   corre desde la raíz del repositorio, por ejemplo:
+#
+#       python3 benchmarks/comparar_grafos.py
+#
+
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from grafo import Grafo
+
+
+def grafo_aleatorio(n,m,semilla=0,peso_max=1000):
+    """Devuelve un Grafo conexo de 'n' vértices y aproximadamente 'm'
+    aristas con pesos enteros aleatorios. Primero arma un árbol aleatorio
+    (para garantizar la conexidad) y luego agrega aristas al azar."""
+
+    rnd = random.Random(semilla)
+    grafo = Grafo()
+    codigos = [f"V{i}" for i in range(n)]
+    for v in codigos:
+        grafo.agregar_vertice(v)
+    for i in range(1,n):
+        grafo.agregar_arista(codigos[rnd.randrange(i)],codigos[i],rnd.randint(1,peso_max))
+    while grafo.cantidad_aristas() < m:
+        v,w = rnd.sample(codigos,2)
+        if not grafo.ver_adyacencia(v,w):
+            grafo.agregar_arista(v,w,rnd.randint(1,peso_max))
+    return grafo
+
+
+def grafo_con_hubs(n,m,semilla=0,peso_max=1000):
+    """Como grafo_aleatorio, pero cada arista nueva elige sus extremos con
+    probabilidad proporcional al grado (enlace preferencial): unos pocos
+    aeropuertos concentran la mayoría de los vuelos, como en una red real."""
+
+    rnd = random.Random(semilla)
+    grafo = Grafo()
+    codigos = [f"V{i}" for i in range(n)]
+    for v in codigos:
+        grafo.agregar_vertice(v)
+    extremos = [codigos[0]] # Cada vértice aparece una vez por arista que toca
+    for i in range(1,n):
+        v = rnd.choice(extremos)
+        grafo.agregar_arista(v,codigos[i],rnd.randint(1,peso_max))
+        extremos += [v,codigos[i]]
+    while grafo.cantidad_aristas() < m:
+        v,w = rnd.choice(codigos),rnd.choice(extremos)
+        if v != w and not grafo.ver_adyacencia(v,w):
+            grafo.agregar_arista(v,w,rnd.randint(1,peso_max))
+            extremos += [v,w]
+    return grafo
+
+
+def grafo_radial(n,m,semilla=0,peso_max=1000,proporcion_hubs=0.01):
+    """Red de hubs y rayos: una fracción 'proporcion_hubs' de los vértices
+    son hubs, unidos entre sí, y cada uno de los demás se une a un hub. Las
+    aristas que faltan para llegar a 'm' son, en su mayoría, de un vértice
+    a otro hub, y el resto vuelos regionales entre dos vértices comunes."""
+
+    rnd = random.Random(semilla)
+    grafo = Grafo()
+    codigos = [f"V{i}" for i in range(n)]
+    for v in codigos:
+        grafo.agregar_vertice(v)
+    hubs = codigos[:max(2,int(n * proporcion_hubs))]
+    for i in range(1,len(hubs)):
+        grafo.agregar_arista(hubs[rnd.randrange(i)],hubs[i],rnd.randint(1,peso_max))
+    for v in codigos[len(hubs):]:
+        grafo.agregar_arista(v,rnd.choice(hubs),rnd.randint(1,peso_max))
+    while grafo.cantidad_aristas() < m:
+        v = rnd.choice(codigos)
+        w = rnd.choice(hubs) if rnd.random() < 0.7 else rnd.choice(codigos)
+        if v != w and not grafo.ver_adyacencia(v,w):
+            grafo.agregar_arista(v,w,rnd.randint(1,peso_max))
+    return grafo
+
+
+def medir_tiempo(funcion,*args,repeticiones=1):
+    """Devuelve el mejor tiempo (en segundos) de 'repeticiones' llamadas a
+    la función, junto con el resultado de la última."""
+
+    mejor = float('inf')
+    resultado = None
+    for i in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        mejor = min(mejor,time.perf_counter() - inicio)
+    return mejor,resultado
+
+
+def medir_memoria(funcion,*args):
+    """Devuelve los bytes que quedan reservados por el resultado de la
+    función (según tracemalloc), junto con el resultado."""
+
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = funcion(*args)
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return despues - antes,resultado
+
+
+class GrafoContador:
+    """Envuelve un grafo y cuenta cuántos vértices se expanden (cada llamada
+    a ver_a_adyacentes o ver_v_adyacentes), que en las búsquedas equivale a
+    la cantidad de vértices fijados."""
+
+    def __init__(self,grafo):
+        self.grafo = grafo
+        self.expandidos = 0
+
+    def __getattr__(self,nombre):
+        return getattr(self.grafo,nombre)
+
+    def __contains__(self,x):
+        return x in self.grafo
+
+    def ver_a_adyacentes(self,x):
+        self.expandidos += 1
+        return self.grafo.ver_a_adyacentes(x)
+
+    def ver_v_adyacentes(self,x):
+        self.expandidos += 1
+        return self.grafo.ver_v_adyacentes(x)
+
+
+def generar_csv(directorio,n,m,semilla=0,generador=grafo_aleatorio):
+    """Escribe en 'directorio' un aeropuertos.csv con 'n' aeropuertos
+    (de a uno a tres por ciudad) y un vuelos.csv con los vuelos de un grafo
+    conexo de aproximadamente 'm' aristas armado con 'generador'. Devuelve
+    las rutas."""
+
+    rnd = random.Random(semilla)
+    grafo = generador(n,m,semilla)
+    aeropuertos = os.path.join(directorio,"aeropuertos.csv")
+    vuelos = os.path.join(directorio,"vuelos.csv")
+    with open(aeropuertos,"w") as archivo:
+        ciudad = 0
+        for i,codigo in enumerate(grafo.ver_vertices()):
+            if rnd.random() < 0.6:
+                ciudad += 1
+            archivo.write(f"Ciudad {ciudad},{codigo},{rnd.uniform(-90,90):.4f},{rnd.uniform(-180,180):.4f}\n")
+    with open(vuelos,"w") as archivo:
+        for (v,w),tiempo in grafo.ver_aristas():
+            archivo.write(f"{v},{w},{tiempo},{rnd.randint(50,3000)},{rnd.randint(1,50)}\n")
+    return aeropuertos,vuelos
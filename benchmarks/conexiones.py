@@ -0,0 +1,108 @@
+#
+#   Modo servidor (Servidor) con varios clientes a la vez, cada uno por su
+#   propia conexión, mandando consultas camino_mas y camino_escalas al
+#   azar. Mide cuánto tardan en responderse todas según la cantidad de
+#   clientes.
+#
+#   Antes de medir, verifica que un comando que falla (una ciudad que no
+#   existe, o un archivo que no se puede escribir desde el pool de
+#   procesos) responda con una línea de ERROR sin cortar la conexión: el
+#   comando siguiente por la misma conexión se tiene que responder igual
+#   que sin el servidor.
+#
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+import comun
+from comun import generar_csv
+from cache import CacheCaminos
+from servidor import Servidor, ejecutar_capturando, FIN_RESPUESTA, ERROR
+from flycombi import leer_archivo, Estado, ejecutar_comando, COMANDOS_PESADOS, TAM_CACHE_CAMINOS
+
+TAMANIO = (2000,10000)
+CLIENTES = [1,4,16]
+CONSULTAS = 400 # Entre todos los clientes
+
+
+async def pedir(lector,escritor,linea):
+    """Manda una línea y devuelve la respuesta, sin la línea vacía del final."""
+    escritor.write((linea + "\n").encode())
+    await escritor.drain()
+    lineas = []
+    while True:
+        recibida = (await lector.readline()).decode()
+        if not recibida:
+            raise SystemExit(f"El servidor cortó la conexión después de '{linea}'")
+        if recibida == FIN_RESPUESTA:
+            return "".join(lineas)
+        lineas.append(recibida)
+
+
+async def verificar_errores(ruta,estado,directorio):
+    """Manda comandos que fallan intercalados con comandos válidos por una
+    misma conexión. Un comando esperado en None tiene que responder ERROR."""
+
+    ciudades = sorted(estado.cities)
+    valida = f"camino_mas barato,{ciudades[0]},{ciudades[1]}"
+    pedidos = [(f"camino_mas barato,NoExiste,{ciudades[0]}",None),
+               (valida,ejecutar_capturando(ejecutar_comando,estado,valida)),
+               (f"nueva_aerolinea {os.path.join(directorio,'no','existe.csv')}",None),
+               (f"nueva_aerolinea {os.path.join(directorio,'aerolinea.csv')}","OK\n")]
+
+    lector,escritor = await asyncio.open_unix_connection(ruta)
+    for linea,esperada in pedidos:
+        respuesta = await pedir(lector,escritor,linea)
+        if esperada is None and not respuesta.startswith(ERROR):
+            raise SystemExit(f"'{linea}' debería haber respondido un error, respondió {respuesta!r}")
+        if esperada is not None and respuesta != esperada:
+            raise SystemExit(f"Después de un error, '{linea}' respondió {respuesta!r} en lugar de {esperada!r}")
+    escritor.close()
+
+
+async def cliente(ruta,lineas):
+    lector,escritor = await asyncio.open_unix_connection(ruta)
+    for linea in lineas:
+        await pedir(lector,escritor,linea)
+    escritor.close()
+
+
+async def correr(grafo,cities,flights,directorio):
+    ruta = os.path.join(directorio,"flycombi.sock")
+    servidor = Servidor(Estado(grafo,cities,flights,CacheCaminos(TAM_CACHE_CAMINOS),None),ejecutar_comando,COMANDOS_PESADOS)
+    escuchando = await asyncio.start_unix_server(servidor.atender,path=ruta)
+    try:
+        await verificar_errores(ruta,Estado(grafo,cities,flights,CacheCaminos(TAM_CACHE_CAMINOS),None),directorio)
+
+        rnd = random.Random(0)
+        ciudades = sorted(cities)
+        lineas = [rnd.choice([f"camino_mas barato,{rnd.choice(ciudades)},{rnd.choice(ciudades)}",
+                              f"camino_escalas {rnd.choice(ciudades)},{rnd.choice(ciudades)}"]) for _ in range(CONSULTAS)]
+        for clientes in CLIENTES:
+            servidor.estado.cache.limpiar()
+            inicio = time.perf_counter()
+            await asyncio.gather(*(cliente(ruta,lineas[i::clientes]) for i in range(clientes)))
+            segundos = time.perf_counter() - inicio
+            print(f"{clientes:>8} {CONSULTAS:>9} | {segundos:>8.2f}s {CONSULTAS / segundos:>9.0f}")
+    finally:
+        # Los procesos del pool heredaron los sockets de los clientes abiertos
+        # al crearlo: hasta que terminen, el servidor no ve cerrarse esas conexiones
+        if servidor.pool is not None:
+            servidor.pool.shutdown()
+        while servidor.clientes:
+            await asyncio.sleep(0.01)
+        escuchando.close()
+        await escuchando.wait_closed()
+
+
+def main():
+    n,m = TAMANIO
+    print(f"{'clientes':>8} {'consultas':>9} | {'total':>9} {'consultas/s':>9}")
+    with tempfile.TemporaryDirectory() as directorio:
+        grafo,cities,flights = leer_archivo(*generar_csv(directorio,n,m))
+        asyncio.run(correr(grafo,cities,flights,directorio))
+
+
+main()
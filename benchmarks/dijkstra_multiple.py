@@ -0,0 +1,34 @@
+#
+#   Compara, para consultas ciudad a ciudad, correr un dijkstra completo
+#   por cada aeropuerto de la ciudad de origen (como hacía camino_mas)
+#   contra un único dijkstra_multiple que se detiene al llegar a destino.
+#
+
+import random
+import comun
+from comun import grafo_aleatorio, medir_tiempo
+from biblioteca import dijkstra, dijkstra_multiple
+
+N = 20000
+M = 100000
+CONSULTAS = 20
+AEROPUERTOS_POR_CIUDAD = [1,2,4,8]
+
+
+def por_aeropuerto(grafo,origenes,destinos):
+    return [dijkstra(grafo,origen,destinos) for origen in origenes]
+
+
+def main():
+    grafo = grafo_aleatorio(N,M)
+    vertices = grafo.ver_vertices()
+    rnd = random.Random(1)
+    print(f"{'aeropuertos':>11} | {'por aeropuerto':>14} {'multiple':>9} {'mejora':>7}")
+    for k in AEROPUERTOS_POR_CIUDAD:
+        consultas = [(rnd.sample(vertices,k),rnd.sample(vertices,k)) for i in range(CONSULTAS)]
+        antes = sum(medir_tiempo(por_aeropuerto,grafo,o,d)[0] for o,d in consultas)
+        despues = sum(medir_tiempo(dijkstra_multiple,grafo,o,d)[0] for o,d in consultas)
+        print(f"{k:>11} | {antes:>13.3f}s {despues:>8.3f}s {antes/despues:>6.1f}x")
+
+
+main()
@@ -0,0 +1,104 @@
+#
+#   Reparación de búsquedas de Dijkstra ante cambios en las aristas
+#   (BusquedaDijkstra.actualizar_arista) contra volver a calcularlas desde
+#   cero. Por cada tamaño aplica una serie de cambios al azar (agregar,
+#   cancelar, abaratar y encarecer vuelos) sobre una búsqueda completa y
+#   sobre una parcial, y verifica que el resultado coincida con el de una
+#   búsqueda nueva. La reparación deja en la frontera los vértices que hay
+#   que volver a fijar, así que para la búsqueda completa se mide también
+#   el avanzar() que la vuelve a completar.
+#
+#   Antes de medir, verifica casos chicos armados a mano que alguna vez
+#   dieron un resultado equivocado.
+#
+
+import random
+import time
+import comun
+from comun import grafo_aleatorio
+from biblioteca import BusquedaDijkstra
+from grafo import Grafo
+
+TAMANIOS = [(10000,50000),(50000,250000)]
+CAMBIOS = 200
+RECALCULOS = 5
+
+
+def cambio_aleatorio(grafo,codigos,rnd):
+    """Aplica un cambio al azar y devuelve (x, y, peso_anterior, peso_nuevo).
+    La mitad de las veces toca un vuelo existente, el resto agrega uno nuevo."""
+
+    x,y = rnd.sample(codigos,2)
+    if rnd.random() < 0.5:
+        y = rnd.choice(list(grafo.ver_v_adyacentes(x)))
+    anterior = grafo.ver_peso(x,y) if grafo.ver_adyacencia(x,y) else None
+    if anterior is not None and rnd.random() < 0.25:
+        grafo.remover_arista(x,y)
+        return x,y,anterior,None
+    nuevo = rnd.randint(1,1000)
+    if anterior is None:
+        grafo.agregar_arista(x,y,nuevo)
+    else:
+        grafo.cambiar_peso(x,y,nuevo)
+    return x,y,anterior,nuevo
+
+
+def caso_radio():
+    """Una búsqueda que vació su heap (por consultar un destino inalcanzable)
+    fija, al aparecer un vuelo, un vértice más lejos que su radio. Si
+    después otro vuelo se encarece, los vértices que vuelven a la frontera
+    por debajo de esa distancia se tienen que volver a fijar."""
+
+    grafo = Grafo()
+    for v in "xyzq":
+        grafo.agregar_vertice(v)
+    grafo.agregar_arista("x","y",5)
+    busqueda = BusquedaDijkstra(grafo,["x"])
+    busqueda.avanzar(["q"])
+    grafo.agregar_arista("x","z",20)
+    busqueda.actualizar_arista("x","z",None,20)
+    grafo.cambiar_peso("x","y",10)
+    busqueda.actualizar_arista("x","y",5,10)
+    if busqueda.avanzar(["y","z"]) != "y" or busqueda.dist["y"] != 10:
+        raise SystemExit("La búsqueda reparada no vuelve a fijar los vértices por debajo de su radio")
+
+
+def main():
+    caso_radio()
+    print(f"{'V':>6} {'E':>7} {'búsqueda':>9} | {'recalcular':>10} {'reparar':>9} {'mejora':>7}")
+    for n,m in TAMANIOS:
+        grafo = grafo_aleatorio(n,m)
+        codigos = grafo.ver_vertices()
+        rnd = random.Random(1)
+        origen = codigos[0]
+        completa = BusquedaDijkstra(grafo,[origen])
+        completa.avanzar()
+        parcial = BusquedaDijkstra(grafo,[origen])
+        parcial.avanzar(rnd.sample(codigos,1))
+
+        reparar = {"completa":0.0,"parcial":0.0}
+        for _ in range(CAMBIOS):
+            cambio = cambio_aleatorio(grafo,codigos,rnd)
+            for nombre,busqueda in (("completa",completa),("parcial",parcial)):
+                inicio = time.perf_counter()
+                busqueda.actualizar_arista(*cambio)
+                if busqueda is completa:
+                    busqueda.avanzar()
+                reparar[nombre] += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for _ in range(RECALCULOS):
+            nueva = BusquedaDijkstra(grafo,[origen])
+            nueva.avanzar()
+        recalcular = (time.perf_counter() - inicio) / RECALCULOS
+
+        for nombre,busqueda in (("completa",completa),("parcial",parcial)):
+            busqueda.avanzar()
+            if busqueda.dist != nueva.dist:
+                raise SystemExit(f"La búsqueda {nombre} reparada no coincide con una nueva")
+            promedio = reparar[nombre] / CAMBIOS
+            print(f"{n:>6} {m:>7} {nombre:>9} | {recalcular * 1000:>8.1f}ms {promedio * 1000:>7.2f}ms "
+                  f"{recalcular / promedio if promedio else float('inf'):>6.0f}x")
+
+
+main()
@@ -0,0 +1,65 @@
+#
+#   Microbenchmark de colas de prioridad para dijkstra y prim: heapq con
+#   entradas repetidas (sin decrease-key, como antes) contra HeapIndexado
+#   (decrease-key, sin entradas viejas). Informa tiempo, encolados y tamaño
+#   máximo alcanzado por el heap.
+#
+
+import heapq
+import comun
+from comun import grafo_aleatorio, medir_tiempo
+from grafo import HeapIndexado
+from biblioteca import dijkstra, prim
+
+TAMANIOS = [(10000,50000),(10000,200000),(50000,250000)]
+
+
+def dijkstra_heapq(grafo,origen):
+    dist = {origen:0}
+    visitados = set()
+    heap = [(0,origen)]
+    encolados = 1
+    maximo = 1
+    while heap:
+        distancia,v = heapq.heappop(heap)
+        if v in visitados: continue
+        visitados.add(v)
+        for w,peso in grafo.ver_a_adyacentes(v):
+            if distancia + peso < dist.get(w,float('inf')):
+                dist[w] = distancia + peso
+                heapq.heappush(heap,(dist[w],w))
+                encolados += 1
+        maximo = max(maximo,len(heap))
+    return encolados,maximo
+
+
+def dijkstra_indexado(grafo,origen):
+    dist = {origen:0}
+    visitados = set()
+    heap = HeapIndexado()
+    heap.encolar(origen,0)
+    encolados = 1
+    maximo = 1
+    while not heap.esta_vacia():
+        distancia,v = heap.desencolar()
+        visitados.add(v)
+        for w,peso in grafo.ver_a_adyacentes(v):
+            if w not in visitados and heap.encolar(w,distancia + peso):
+                encolados += 1
+        maximo = max(maximo,len(heap))
+    return encolados,maximo
+
+
+def main():
+    print(f"{'V':>6} {'E':>7} {'cola':>10} | {'tiempo':>7} {'encolados':>9} {'max heap':>8}")
+    for n,m in TAMANIOS:
+        grafo = grafo_aleatorio(n,m)
+        origen = grafo.ver_vertices()[0]
+        for nombre,funcion in (("heapq",dijkstra_heapq),("indexado",dijkstra_indexado)):
+            tiempo,(encolados,maximo) = medir_tiempo(funcion,grafo,origen,repeticiones=3)
+            print(f"{n:>6} {m:>7} {nombre:>10} | {tiempo:>6.3f}s {encolados:>9} {maximo:>8}")
+        print(f"{n:>6} {m:>7} {'dijkstra':>10} | {medir_tiempo(dijkstra,grafo,origen,repeticiones=3)[0]:>6.3f}s")
+        print(f"{n:>6} {m:>7} {'prim':>10} | {medir_tiempo(prim,grafo,repeticiones=3)[0]:>6.3f}s")
+
+
+main()
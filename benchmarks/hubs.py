@@ -0,0 +1,57 @@
+#
+#   Oráculo de hubs: tiempo de precálculo y tamaño del archivo, y tiempo
+#   por consulta camino_mas entre hubs con el oráculo contra una búsqueda
+#   de Dijkstra nueva (sin cache). Verifica que los dos den la misma
+#   distancia.
+#
+
+import os
+import random
+import tempfile
+import time
+import comun
+from comun import generar_csv, medir_tiempo
+from biblioteca import BusquedaDijkstra
+from carga import leer_red
+from flycombi import COLUMNAS_VUELOS, PRECIO, TIEMPO
+import oraculo
+
+TAMANIOS = [(10000,50000)]
+HUBS = [50,100]
+CONSULTAS = 200
+
+
+def main():
+    print(f"{'V':>6} {'E':>7} {'hubs':>5} | {'precálculo':>10} {'archivo':>9} | {'dijkstra':>9} {'oráculo':>9} {'mejora':>7}")
+    for n,m in TAMANIOS:
+        with tempfile.TemporaryDirectory() as directorio:
+            aeropuertos,vuelos = generar_csv(directorio,n,m)
+            grafo,cities,flights = leer_red(aeropuertos,vuelos,COLUMNAS_VUELOS,informe=None)
+            for cantidad in HUBS:
+                ruta = os.path.join(directorio,f"hubs{cantidad}.bin")
+                t_compilar = medir_tiempo(oraculo.compilar,aeropuertos,vuelos,ruta,COLUMNAS_VUELOS,(PRECIO,TIEMPO),
+                                          cantidad,None)[0]
+                tabla = oraculo.cargar(ruta)
+                rnd = random.Random(0)
+                hubs = list(tabla.hubs)
+                pares = [(rnd.choice(hubs),rnd.choice(hubs),rnd.choice((PRECIO,TIEMPO))) for _ in range(CONSULTAS)]
+
+                inicio = time.perf_counter()
+                esperadas = []
+                for origen,destino,peso in pares:
+                    busqueda = BusquedaDijkstra(grafo,cities[origen],peso)
+                    llegada = busqueda.avanzar(cities[destino])
+                    esperadas.append(None if llegada is None else busqueda.dist[llegada])
+                t_dijkstra = (time.perf_counter() - inicio) / CONSULTAS
+
+                inicio = time.perf_counter()
+                obtenidas = [tabla.camino(peso,origen,destino)[1] for origen,destino,peso in pares]
+                t_oraculo = (time.perf_counter() - inicio) / CONSULTAS
+
+                if obtenidas != esperadas:
+                    raise SystemExit("El oráculo no da las mismas distancias que Dijkstra")
+                print(f"{n:>6} {m:>7} {cantidad:>5} | {t_compilar:>9.1f}s {os.path.getsize(ruta) / 2**20:>7.1f}MB | "
+                      f"{t_dijkstra * 1000:>7.2f}ms {t_oraculo * 1000:>7.3f}ms {t_dijkstra / t_oraculo:>6.0f}x")
+
+
+main()
@@ -0,0 +1,54 @@
+#
+#   Jerarquías de contracción: tiempo de construcción y aristas agregadas,
+#   y tiempo por consulta camino_mas con la jerarquía contra una búsqueda
+#   de Dijkstra nueva (sin cache), entre ciudades al azar. Verifica que las
+#   dos den la misma distancia.
+#
+
+import random
+import tempfile
+import time
+import comun
+from comun import generar_csv, grafo_aleatorio, grafo_con_hubs, medir_tiempo
+from biblioteca import BusquedaDijkstra
+from carga import leer_red
+from flycombi import COLUMNAS_VUELOS, PRECIO, TIEMPO
+import contraccion
+
+# La contracción aprovecha que pocos aeropuertos concentran los vuelos; en
+# un grafo aleatorio (sin hubs) quedan muchos más atajos.
+CASOS = [("hubs",grafo_con_hubs,1000,3000),("hubs",grafo_con_hubs,3000,9000),("aleatorio",grafo_aleatorio,1000,3000)]
+CONSULTAS = 300
+
+
+def main():
+    print(f"{'red':>9} {'V':>6} {'E':>7} {'peso':>6} | {'construcción':>12} {'atajos':>7} | {'dijkstra':>9} {'ch':>9} {'mejora':>7}")
+    for nombre,generador,n,m in CASOS:
+        with tempfile.TemporaryDirectory() as directorio:
+            grafo,cities,flights = leer_red(*generar_csv(directorio,n,m,generador=generador),COLUMNAS_VUELOS,informe=None)
+        for peso in (PRECIO,TIEMPO):
+            t_construir,jerarquia = medir_tiempo(contraccion.construir,grafo,peso)
+            rnd = random.Random(0)
+            ciudades = sorted(cities)
+            pares = [(rnd.choice(ciudades),rnd.choice(ciudades)) for _ in range(CONSULTAS)]
+
+            inicio = time.perf_counter()
+            esperadas = []
+            for origen,destino in pares:
+                busqueda = BusquedaDijkstra(grafo,cities[origen],peso)
+                llegada = busqueda.avanzar(cities[destino])
+                esperadas.append(None if llegada is None else busqueda.dist[llegada])
+            t_dijkstra = (time.perf_counter() - inicio) / CONSULTAS
+
+            inicio = time.perf_counter()
+            obtenidas = [jerarquia.camino(cities[origen],cities[destino])[1] for origen,destino in pares]
+            t_ch = (time.perf_counter() - inicio) / CONSULTAS
+
+            if obtenidas != esperadas:
+                raise SystemExit("La jerarquía de contracción no da las mismas distancias que Dijkstra")
+            atajos = jerarquia.cantidad_aristas() - grafo.cantidad_aristas()
+            print(f"{nombre:>9} {n:>6} {m:>7} {peso:>6} | {t_construir:>11.1f}s {atajos:>7} | "
+                  f"{t_dijkstra * 1000:>7.2f}ms {t_ch * 1000:>7.3f}ms {t_dijkstra / t_ch:>6.1f}x")
+
+
+main()
@@ -0,0 +1,69 @@
+#
+#   Modo por lotes (--lote) contra el bucle línea por línea: muchas
+#   consultas camino_mas y camino_escalas intercaladas, desde más ciudades
+#   de origen que las que entran en la cache de caminos. Verifica que las
+#   dos salidas sean idénticas.
+#
+
+import io
+import random
+import tempfile
+import time
+import comun
+from contextlib import redirect_stdout
+from comun import generar_csv
+from cache import CacheCaminos
+from flycombi import leer_archivo, Estado, ejecutar_comando, procesar_lote, TAM_CACHE_CAMINOS
+
+TAMANIOS = [(2000,10000),(5000,25000)]
+ORIGENES = 100
+CONSULTAS = 1500
+TAM_LOTE = 1000
+
+
+def consultas_aleatorias(cities,semilla=0):
+    rnd = random.Random(semilla)
+    ciudades = sorted(cities)
+    origenes = rnd.sample(ciudades,ORIGENES)
+    lineas = []
+    for _ in range(CONSULTAS):
+        origen,destino = rnd.choice(origenes),rnd.choice(ciudades)
+        lineas.append(rnd.choice([f"camino_mas barato,{origen},{destino}",f"camino_mas rapido,{origen},{destino}",
+                                  f"camino_escalas {origen},{destino}"]))
+    return lineas
+
+
+def linea_por_linea(grafo,cities,flights,lineas):
+    estado = Estado(grafo,cities,flights,CacheCaminos(TAM_CACHE_CAMINOS),None)
+    for linea in lineas:
+        ejecutar_comando(estado,linea)
+
+
+def por_lotes(grafo,cities,flights,lineas):
+    estado = Estado(grafo,cities,flights,CacheCaminos(TAM_CACHE_CAMINOS),None)
+    for i in range(0,len(lineas),TAM_LOTE):
+        procesar_lote(estado,lineas[i:i + TAM_LOTE])
+
+
+def medir(funcion,*args):
+    salida = io.StringIO()
+    inicio = time.perf_counter()
+    with redirect_stdout(salida):
+        funcion(*args)
+    return time.perf_counter() - inicio,salida.getvalue()
+
+
+def main():
+    print(f"{'V':>6} {'E':>7} {'consultas':>9} | {'línea a línea':>13} {'por lotes':>9} {'mejora':>7}")
+    for n,m in TAMANIOS:
+        with tempfile.TemporaryDirectory() as directorio:
+            grafo,cities,flights = leer_archivo(*generar_csv(directorio,n,m))
+        lineas = consultas_aleatorias(cities)
+        t_lineas,salida_lineas = medir(linea_por_linea,grafo,cities,flights,lineas)
+        t_lotes,salida_lotes = medir(por_lotes,grafo,cities,flights,lineas)
+        if salida_lineas != salida_lotes:
+            raise SystemExit("El modo por lotes no responde lo mismo que el línea por línea")
+        print(f"{n:>6} {m:>7} {len(lineas):>9} | {t_lineas:>12.2f}s {t_lotes:>8.2f}s {t_lineas / t_lotes:>6.1f}x")
+
+
+main()
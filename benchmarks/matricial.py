@@ -0,0 +1,62 @@
+#
+#   Cálculos sobre toda la red en Python puro (biblioteca.py) contra su
+#   versión vectorizada (matricial.py): bfs desde varios orígenes, grados y
+#   frecuencia total por aeropuerto, y PageRank con la frecuencia como peso.
+#   Verifica que den lo mismo (PageRank, salvo redondeo) e informa la
+#   mejora de cada uno. El armado de la matriz se mide aparte, porque se
+#   hace una sola vez y queda en la cache.
+#
+
+import random
+import tempfile
+import comun
+from comun import generar_csv, grafo_con_hubs, medir_tiempo
+from biblioteca import niveles_bfs, grados_ponderados, pagerank
+from flycombi import leer_archivo, FRECUENCIA
+import matricial
+
+TAMANIOS = [(10000,50000),(50000,250000)]
+ORIGENES = 5
+ERROR_PAGERANK = 1e-9
+
+
+def verificar(nombre,iguales):
+    if not iguales:
+        raise SystemExit(f"{nombre}: la versión vectorizada no da lo mismo que la de Python")
+
+
+def main():
+    if not matricial.DISPONIBLE:
+        raise SystemExit("Hace falta NumPy para la versión vectorizada")
+    print(f"Productos con {'scipy.sparse' if matricial.sparse is not None else 'NumPy (np.bincount)'}")
+    print(f"{'V':>6} {'E':>7} {'cálculo':>10} | {'python':>8} {'numpy':>8} {'mejora':>7}")
+    for n,m in TAMANIOS:
+        with tempfile.TemporaryDirectory() as directorio:
+            grafo = leer_archivo(*generar_csv(directorio,n,m,generador=grafo_con_hubs))[0]
+        vista = grafo.vista(FRECUENCIA)
+        origenes = random.Random(0).sample(vista.ver_vertices(),ORIGENES)
+
+        t_matriz,matriz = medir_tiempo(matricial.MatrizAdyacencia.desde_grafo,grafo,FRECUENCIA)
+        print(f"{n:>6} {m:>7} {'matriz':>10} | {'':>8} {t_matriz:>7.3f}s")
+
+        t_py,esperado = medir_tiempo(niveles_bfs,vista,origenes)
+        t_np,niveles = medir_tiempo(matricial.niveles_bfs,matriz,origenes,repeticiones=3)
+        verificar("bfs",matriz.a_diccionario(niveles,niveles != matricial.SIN_NIVEL) == esperado)
+        print(f"{n:>6} {m:>7} {'bfs':>10} | {t_py:>7.3f}s {t_np:>7.3f}s {t_py / t_np:>6.1f}x")
+
+        t_py,(grados,totales) = medir_tiempo(grados_ponderados,vista)
+        t_np,(grados_np,totales_np) = medir_tiempo(matricial.grados_ponderados,matriz,repeticiones=3)
+        verificar("grados",matriz.a_diccionario(grados_np) == grados and matriz.a_diccionario(totales_np) == totales)
+        print(f"{n:>6} {m:>7} {'grados':>10} | {t_py:>7.3f}s {t_np:>7.3f}s {t_py / t_np:>6.1f}x")
+
+        t_py,esperado = medir_tiempo(pagerank,vista)
+        t_np,rangos = medir_tiempo(matricial.pagerank,matriz,repeticiones=3)
+        rangos = matriz.a_diccionario(rangos)
+        verificar("pagerank",max(abs(rangos[v] - esperado[v]) for v in esperado) < ERROR_PAGERANK)
+        print(f"{n:>6} {m:>7} {'pagerank':>10} | {t_py:>7.3f}s {t_np:>7.3f}s {t_py / t_np:>6.1f}x")
+
+        resumen = matricial.resumen(matricial.grados_ponderados(matriz)[1])
+        print(f"{'':>14} vuelos por aeropuerto: " + ", ".join(f"{clave} {valor:.1f}" for clave,valor in resumen.items()))
+
+
+main()
@@ -0,0 +1,45 @@
+#
+#   Cantidad de vértices fijados y tiempo por consulta punto a punto para
+#   cada modo de búsqueda: dijkstra (con corte temprano), bidireccional y
+#   A* con landmarks (ALT); y bfs contra bfs bidireccional en escalas.
+#
+
+import random
+import comun
+from comun import grafo_aleatorio, medir_tiempo, GrafoContador
+from biblioteca import dijkstra, dijkstra_bidireccional, calcular_landmarks, heuristica_alt, astar
+from biblioteca import bfs, bfs_bidireccional
+
+N = 50000
+M = 150000
+CONSULTAS = 30
+CANT_LANDMARKS = 8
+
+
+def main():
+    grafo = grafo_aleatorio(N,M)
+    vertices = grafo.ver_vertices()
+    rnd = random.Random(2)
+    consultas = [(rnd.choice(vertices),rnd.choice(vertices)) for i in range(CONSULTAS)]
+    segundos,landmarks = medir_tiempo(calcular_landmarks,grafo,CANT_LANDMARKS)
+    print(f"Preproceso ALT ({CANT_LANDMARKS} landmarks): {segundos:.2f}s")
+
+    modos = {
+        "dijkstra": lambda g,o,d: dijkstra(g,o,[d]),
+        "bidireccional": lambda g,o,d: dijkstra_bidireccional(g,[o],[d]),
+        "alt": lambda g,o,d: astar(g,[o],[d],heuristica_alt(landmarks,[d])),
+        "bfs": lambda g,o,d: bfs(g,o,[d]),
+        "bfs bidireccional": lambda g,o,d: bfs_bidireccional(g,[o],[d]),
+    }
+    print(f"{'modo':>18} | {'fijados prom':>12} {'ms prom':>8}")
+    for nombre,modo in modos.items():
+        fijados = 0
+        tiempo = 0
+        for origen,destino in consultas:
+            contador = GrafoContador(grafo)
+            tiempo += medir_tiempo(modo,contador,origen,destino)[0]
+            fijados += contador.expandidos
+        print(f"{nombre:>18} | {fijados/CONSULTAS:>12.0f} {1000*tiempo/CONSULTAS:>8.1f}")
+
+
+main()
@@ -0,0 +1,46 @@
+#
+#   Selección de los n más centrales: n pasadas de max() sacando al ganador
+#   (la versión anterior de imprimir_centralidad) contra heapq.nlargest, que
+#   además no modifica la centralidad y permite guardarla en la cache.
+#   Verifica que las dos den el mismo ranking.
+#
+
+import heapq
+import operator
+import random
+import comun
+from comun import medir_tiempo
+
+VERTICES = [10000,50000]
+CANTIDADES = [10,100,1000]
+
+
+def por_maximos(centralidad,n):
+    centralidad = dict(centralidad)
+    respuestas = []
+    for i in range(n):
+        maximo = max(centralidad.items(),key=operator.itemgetter(1))
+        centralidad.pop(maximo[0])
+        respuestas.append(maximo[0])
+    return respuestas
+
+
+def por_heap(centralidad,n):
+    return [v for v,_ in heapq.nlargest(n,centralidad.items(),key=operator.itemgetter(1))]
+
+
+def main():
+    print(f"{'V':>6} {'n':>5} | {'max()':>9} {'nlargest':>9} {'mejora':>7}")
+    rnd = random.Random(0)
+    for cantidad in VERTICES:
+        # Valores enteros chicos, para que haya empates como en la centralidad real
+        centralidad = {f"V{i}":rnd.randint(0,cantidad // 10) for i in range(cantidad)}
+        for n in CANTIDADES:
+            t_maximos,esperado = medir_tiempo(por_maximos,centralidad,n)
+            t_heap,obtenido = medir_tiempo(por_heap,centralidad,n,repeticiones=3)
+            if esperado != obtenido:
+                raise SystemExit("nlargest no da el mismo ranking que max()")
+            print(f"{cantidad:>6} {n:>5} | {t_maximos * 1000:>7.1f}ms {t_heap * 1000:>7.2f}ms {t_maximos / t_heap:>6.0f}x")
+
+
+main()
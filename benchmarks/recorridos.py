@@ -0,0 +1,99 @@
+#
+#   Recorridos sobre grafos de más de 100.000 vértices:
+#   - bfs con la Cola anterior (lista con pop(0)) contra la actual (deque),
+#     sobre una estrella, donde la cola llega a tener casi todo el grafo;
+#   - dfs recursivo (como era antes) contra el iterativo, sobre una
+#     cadena, que supera el límite de recursión de Python.
+#
+
+import sys
+import comun
+from comun import grafo_aleatorio, medir_tiempo
+import biblioteca
+from grafo import Grafo, Cola
+from biblioteca import bfs, dfs
+
+N = 200000
+
+
+class ColaLista:
+    """La Cola anterior: desencolar con pop(0) es O(n)."""
+
+    def __init__(self):
+        self.items = []
+
+    def encolar(self,x):
+        self.items.append(x)
+
+    def desencolar(self):
+        return self.items.pop(0)
+
+    def esta_vacia(self):
+        return len(self.items) == 0
+
+
+def dfs_recursivo(grafo,origen):
+    padres = {origen:None}
+    orden = {origen:0}
+    visitados = set()
+
+    def _dfs(v):
+        visitados.add(v)
+        for w in grafo.ver_v_adyacentes(v):
+            if w not in visitados:
+                padres[w] = v
+                orden[w] = orden[v] + 1
+                _dfs(w)
+
+    _dfs(origen)
+    return padres,orden
+
+
+def estrella(n):
+    grafo = Grafo()
+    for i in range(n):
+        grafo.agregar_vertice(i)
+    for i in range(1,n):
+        grafo.agregar_arista(0,i,1)
+    return grafo
+
+
+def cadena(n):
+    grafo = Grafo()
+    for i in range(n):
+        grafo.agregar_vertice(i)
+    for i in range(1,n):
+        grafo.agregar_arista(i - 1,i,1)
+    return grafo
+
+
+def main():
+    grafo = estrella(N)
+    t_deque = medir_tiempo(bfs,grafo,0)[0]
+    biblioteca.Cola = ColaLista
+    t_lista = medir_tiempo(bfs,grafo,0)[0]
+    biblioteca.Cola = Cola
+    print(f"bfs estrella de {N} vértices: lista {t_lista:.2f}s, deque {t_deque:.2f}s")
+
+    grafo = grafo_aleatorio(N,3 * N)
+    t_deque = medir_tiempo(bfs,grafo,"V0")[0]
+    biblioteca.Cola = ColaLista
+    t_lista = medir_tiempo(bfs,grafo,"V0")[0]
+    biblioteca.Cola = Cola
+    print(f"bfs aleatorio de {N} vértices: lista {t_lista:.2f}s, deque {t_deque:.2f}s")
+
+    grafo = cadena(N)
+    t_iterativo,(padres,orden) = medir_tiempo(dfs,grafo,0)
+    try:
+        t_recursivo = f"{medir_tiempo(dfs_recursivo,grafo,0)[0]:.2f}s"
+    except RecursionError:
+        t_recursivo = f"RecursionError (límite {sys.getrecursionlimit()})"
+    print(f"dfs cadena de {N} vértices: recursivo {t_recursivo}, iterativo {t_iterativo:.2f}s (profundidad {max(orden.values())})")
+
+    grafo = grafo_aleatorio(20000,60000)
+    sys.setrecursionlimit(100000)
+    iguales = dfs(grafo,"V0") == dfs_recursivo(grafo,"V0")
+    print(f"dfs iterativo y recursivo coinciden: {iguales}")
+
+
+main()
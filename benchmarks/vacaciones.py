@@ -0,0 +1,74 @@
+#
+#   Búsqueda de ciclos de vacaciones con poda por distancia al origen
+#   (_vacaciones) contra un backtracking sin poda. Los ciclos se piden
+#   desde aeropuertos al azar de un grafo con hubs y pocas aristas por
+#   vértice, donde muchas ramas no pueden volver al origen. Verifica que
+#   las dos búsquedas coincidan en si hay ciclo y que el ciclo encontrado
+#   sea válido.
+#
+
+import random
+import time
+import comun
+from comun import grafo_con_hubs
+from biblioteca import _vacaciones, bfs
+
+N = 3000
+M = 3600
+CONSULTAS = 40
+LARGOS = [6,10,12]
+
+
+def sin_poda(grafo,n,origen):
+    """Backtracking que sólo descarta vértices ya visitados."""
+
+    camino = []
+    visitados = {origen}
+    pila = [iter(grafo.ver_v_adyacentes(origen))]
+    while pila:
+        for w in pila[-1]:
+            if w in visitados: continue
+            if len(camino) + 1 == n:
+                if grafo.ver_adyacencia(w,origen):
+                    return camino + [w]
+                continue
+            visitados.add(w)
+            camino.append(w)
+            pila.append(iter(grafo.ver_v_adyacentes(w)))
+            break
+        else:
+            pila.pop()
+            if camino:
+                visitados.remove(camino.pop())
+    return []
+
+
+def es_ciclo(grafo,origen,ciclo,n):
+    recorrido = [origen] + ciclo + [origen]
+    return len(set(recorrido)) == n + 1 and all(grafo.ver_adyacencia(v,w) for v,w in zip(recorrido,recorrido[1:]))
+
+
+def main():
+    grafo = grafo_con_hubs(N,M)
+    rnd = random.Random(0)
+    vertices = grafo.ver_vertices()
+    print(f"{'largo':>5} {'consultas':>9} {'con ciclo':>9} | {'sin poda':>9} {'con poda':>9} {'mejora':>7}")
+    for largo in LARGOS:
+        origenes = [rnd.choice(vertices) for _ in range(CONSULTAS)]
+        inicio = time.perf_counter()
+        esperados = [sin_poda(grafo,largo - 1,origen) for origen in origenes]
+        t_sin_poda = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        obtenidos = [_vacaciones(grafo,largo - 1,origen,bfs(grafo,origen)[2])[0] for origen in origenes]
+        t_con_poda = time.perf_counter() - inicio
+
+        for origen,esperado,obtenido in zip(origenes,esperados,obtenidos):
+            if bool(esperado) != bool(obtenido) or (obtenido and not es_ciclo(grafo,origen,obtenido,largo - 1)):
+                raise SystemExit(f"La búsqueda con poda no coincide desde {origen} con largo {largo}")
+        encontrados = sum(1 for ciclo in obtenidos if ciclo)
+        print(f"{largo:>5} {CONSULTAS:>9} {encontrados:>9} | {t_sin_poda:>8.2f}s {t_con_poda:>8.2f}s "
+              f"{t_sin_poda / t_con_poda:>6.1f}x")
+
+
+main()
@@ -0,0 +1,46 @@
+#
+#   Carga con la frecuencia inversa como atributo derivado (se arma recién
+#   cuando la pide centralidad) contra armarla durante la carga, como antes.
+#   Mide tiempo y memoria de leer_archivo y de leer_red en los dos casos:
+#   una sesión corta (camino_escalas, camino_mas) nunca paga la diferencia.
+#
+
+import tempfile
+import comun
+from comun import generar_csv, medir_tiempo, medir_memoria
+from flycombi import leer_archivo, COLUMNAS_VUELOS, DERIVADOS, FRECUENCIA_INV
+from carga import leer_red, TAM_BLOQUE
+
+TAMANIOS = [(10000,50000),(50000,250000)]
+
+
+def con_inversa(leer):
+    """Carga y arma en el momento la frecuencia inversa."""
+    def cargar(*args):
+        grafo,cities,flights = leer(*args)
+        grafo.vista(FRECUENCIA_INV)
+        return grafo,cities,flights
+    return cargar
+
+
+def por_bloques(aeropuertos,vuelos):
+    return leer_red(aeropuertos,vuelos,COLUMNAS_VUELOS,TAM_BLOQUE,None,DERIVADOS)
+
+
+def main():
+    print(f"{'V':>6} {'E':>7} {'lector':>12} | {'perezosa':>9} {'memoria':>9} | {'al cargar':>9} {'memoria':>9}")
+    for n,m in TAMANIOS:
+        with tempfile.TemporaryDirectory() as directorio:
+            aeropuertos,vuelos = generar_csv(directorio,n,m)
+            for nombre,leer in (("leer_archivo",leer_archivo),("leer_red",por_bloques)):
+                t_perezosa,(grafo,_,_) = medir_tiempo(leer,aeropuertos,vuelos,repeticiones=3)
+                if grafo.materializados:
+                    raise SystemExit(f"{nombre} armó {grafo.materializados} sin que se lo pidieran")
+                m_perezosa = medir_memoria(leer,aeropuertos,vuelos)[0]
+                t_cargar = medir_tiempo(con_inversa(leer),aeropuertos,vuelos,repeticiones=3)[0]
+                m_cargar = medir_memoria(con_inversa(leer),aeropuertos,vuelos)[0]
+                print(f"{n:>6} {m:>7} {nombre:>12} | {t_perezosa:>8.3f}s {m_perezosa / 2**20:>7.1f}MB | "
+                      f"{t_cargar:>8.3f}s {m_cargar / 2**20:>7.1f}MB")
+
+
+main()
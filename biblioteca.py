@@ -1,7 +1,17 @@
+import math
+import time
 import random
-import heapq
+from heapq import heappush, heappop, heapify
 import operator
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+try:
+    import numpy as np
+except ImportError: # NumPy es opcional: sólo acelera centralidad_aproximada_lotes
+    np = None
 from grafo import Cola
+from grafo import HeapIndexado
+from grafo import ConjuntosDisjuntos
 from grafo import Grafo
 
                     ########################
@@ -11,6 +21,13 @@ from grafo import Grafo
                     ########################
 
 
+TAM_BLOQUE_CENTRALIDAD = 64 # Fuentes por tarea al calcular centralidad en paralelo
+AMORTIGUACION_PAGERANK = 0.85
+TOLERANCIA_PAGERANK = 1e-10
+ITERACIONES_PAGERANK = 100
+_grafo_trabajador = None # Grafo sobre el que trabaja cada proceso del pool
+
+
 def quick_sort(lista):
     """Ordena la lista de forma recursiva.
         Pre: los elementos de la lista deben ser comparables.
@@ -54,12 +71,23 @@ def _swap(lista, i, j):
     """Intercambia los elementos i y j de lista."""
     lista[j], lista[i] = lista[i], lista[j]
 
-def dijkstra(grafo,origen,destino=[]):
+def _seleccionar(grafo,peso):
+    """Selector de peso: si se indica un atributo, devuelve la vista del
+    grafo multipeso para ese atributo; si no, el grafo tal cual."""
+
+    if peso is None:
+        return grafo
+    return grafo.vista(peso)
+
+def dijkstra(grafo,origen,destino=[],peso=None):
     """Este algorítmo devuelve un diccionario de padres y distancias
     correspondientes al resultado del algorítmo de Dijkstra.
-    Pre: recibe un grafo válido y un vértice de origen válido.
+    Pre: recibe un grafo válido y un vértice de origen válido. Si el
+    grafo es multipeso, 'peso' indica el atributo a usar. Si se indican
+    destinos, la búsqueda termina en cuanto quedan todos fijados.
     Opera en O(|E|*log(|E|))."""
 
+    grafo = _seleccionar(grafo,peso)
     dist = {}
     padre = {}
     dist_llegada = {}
@@ -67,73 +95,404 @@ def dijkstra(grafo,origen,destino=[]):
         dist[v] = float('inf') # Infinito, siempre es mayor que cualquier otro número
         if v in destino:
             dist_llegada[v] = float('inf')
+    pendientes = len(dist_llegada)
     dist[origen] = 0
     padre[origen] = None
-    heap = []
-    heapq.heappush(heap,(0,origen))
-    while heap:
-        arista = heapq.heappop(heap) #(peso_hasta_a,'v')
-        v = arista[1]
-        for w in grafo.ver_a_adyacentes(v):
-            w = w[0]
-            if dist[v] + grafo.ver_peso(w,v) < dist[w]:
-                dist[w] = dist[v] + grafo.ver_peso(w,v)
-                if w in destino: dist_llegada[w] = dist[w]
+    heap = HeapIndexado()
+    heap.encolar(origen,0)
+    while not heap.esta_vacia():
+        distancia,v = heap.desencolar() #(peso_hasta_v,'v')
+        if v in dist_llegada:
+            dist_llegada[v] = distancia
+            pendientes -= 1
+            if pendientes == 0: break
+        for w,peso in grafo.ver_a_adyacentes(v):
+            if distancia + peso < dist[w]:
+                dist[w] = distancia + peso
                 padre[w] = v
-                heapq.heappush(heap,(dist[w],w))
+                heap.encolar(w,dist[w])
 
 
     return padre,dist,dist_llegada
 
 
-def prim(grafo):
+class BusquedaDijkstra:
+    """Búsqueda de Dijkstra desde varios orígenes a la vez (todos a distancia
+    0), que avanza sólo lo necesario para responder cada consulta y puede
+    retomarse más tarde. Los vértices fijados tienen su distancia y su padre
+    definitivos; el resto queda en el heap hasta la próxima consulta. Si el
+    grafo cambia, actualizar_arista la repara en lugar de recalcularla."""
+
+    def __init__(self,grafo,origenes,peso=None):
+
+        self.grafo = _seleccionar(grafo,peso)
+        self.dist = {}
+        self.padre = {}
+        self.visitados = set()
+        self.heap = HeapIndexado()
+        self.radio = 0 # La mayor distancia fijada (o una cota superior)
+        for origen in origenes:
+            self.dist[origen] = 0
+            self.padre[origen] = None
+            self.heap.encolar(origen,0)
+
+    def completa(self):
+        """Devuelve True si ya se fijaron todos los vértices alcanzables."""
+
+        return self.heap.esta_vacia()
+
+    def avanzar(self,destinos=()):
+        """Avanza la búsqueda hasta fijar el destino más cercano a los orígenes
+        y lo devuelve. Si alguno de los destinos ya estaba fijado, responde sin
+        avanzar. Devuelve None si ningún destino es alcanzable; sin destinos,
+        recorre todo el grafo."""
+
+        destinos = set(destinos)
+        fijados = destinos & self.visitados
+        if fijados:
+            return min(fijados,key=lambda destino: (self.dist[destino],destino))
+
+        while not self.heap.esta_vacia():
+            v = self._fijar_siguiente()
+            if v in destinos:
+                return v
+
+        return None
+
+    def _fijar_siguiente(self):
+        """Fija el vértice de la frontera más cercano a los orígenes, relaja
+        sus aristas y lo devuelve."""
+
+        dist,padre,visitados,heap = self.dist,self.padre,self.visitados,self.heap
+        distancia,v = heap.desencolar()
+        visitados.add(v)
+        if distancia > self.radio:
+            self.radio = distancia
+        for w,peso in self.grafo.ver_a_adyacentes(v):
+            if w not in visitados and distancia + peso < dist.get(w,float('inf')):
+                dist[w] = distancia + peso
+                padre[w] = v
+                heap.encolar(w,dist[w])
+        return v
+
+    def actualizar_arista(self,x,y,anterior,nuevo):
+        """Repara la búsqueda después de que la arista x-y pasó de pesar
+        'anterior' a pesar 'nuevo' (None si la arista no existía o dejó de
+        existir), sin recalcularla desde los orígenes. El grafo ya debe
+        tener el cambio aplicado. Sólo se tocan los vértices cuya distancia
+        puede cambiar, como en el algoritmo de Ramalingam y Reps."""
+
+        if anterior is not None and (nuevo is None or nuevo > anterior):
+            self._desfijar(x,y)
+        if nuevo is not None and (anterior is None or nuevo < anterior):
+            self._propagar(x,y,nuevo)
+
+    def _desfijar(self,x,y):
+        """La arista x-y se encareció o desapareció: si era parte del árbol,
+        todo el subárbol que colgaba de ella vuelve a la frontera, con la
+        mejor distancia que le ofrecen los vértices fijados que no dependían
+        de la arista, y se vuelven a fijar los que no superan el radio de la
+        búsqueda. Opera en O(|V|) más O(grado*log |V|) por vértice afectado."""
+
+        raices = [v for u,v in ((x,y),(y,x)) if v in self.padre and self.padre[v] == u]
+        if not raices:
+            return
+
+        hijos = {}
+        for v,p in self.padre.items():
+            if p is not None:
+                hijos.setdefault(p,[]).append(v)
+        afectados = set()
+        pila = raices
+        while pila:
+            v = pila.pop()
+            afectados.add(v)
+            pila.extend(hijos.get(v,()))
+
+        dist,padre,visitados,heap = self.dist,self.padre,self.visitados,self.heap
+        for v in afectados:
+            visitados.discard(v)
+            heap.remover(v)
+            del dist[v]
+            del padre[v]
+        for v in afectados:
+            for u,peso in self.grafo.ver_a_adyacentes(v):
+                if u in visitados and dist[u] + peso < dist.get(v,float('inf')):
+                    dist[v] = dist[u] + peso
+                    padre[v] = u
+            if v in dist:
+                heap.encolar(v,dist[v])
+
+        # Se vuelven a fijar los que quedaron más cerca que algún fijado, para
+        # que ningún vértice de la frontera esté antes que uno fijado.
+        while not heap.esta_vacia() and heap.ver_primero()[0] < self.radio:
+            self._fijar_siguiente()
+
+    def _propagar(self,x,y,peso):
+        """La arista x-y se abarató o apareció: propaga la mejora con un
+        Dijkstra local que arranca en la arista y sólo avanza por vértices
+        que mejoran. Los que quedan por debajo de la frontera actual se fijan
+        (su distancia ya es definitiva); el resto sólo baja su prioridad en
+        la frontera, para que los fije la próxima consulta."""
+
+        dist,padre,visitados,heap = self.dist,self.padre,self.visitados,self.heap
+        frontera = float('inf') if heap.esta_vacia() else heap.ver_primero()[0]
+        local = HeapIndexado()
+        candidatos = {}
+        for u,v in ((x,y),(y,x)):
+            if u in visitados and dist[u] + peso < dist.get(v,float('inf')) and local.encolar(v,dist[u] + peso):
+                candidatos[v] = u
+
+        while not local.esta_vacia():
+            distancia,v = local.desencolar()
+            dist[v] = distancia
+            padre[v] = candidatos[v]
+            if distancia >= frontera:
+                heap.encolar(v,distancia)
+                continue
+            visitados.add(v)
+            heap.remover(v)
+            if distancia > self.radio:
+                self.radio = distancia
+            for w,peso in self.grafo.ver_a_adyacentes(v):
+                if distancia + peso < dist.get(w,float('inf')) and local.encolar(w,distancia + peso):
+                    candidatos[w] = v
+
+
+def dijkstra_multiple(grafo,origenes,destinos=(),peso=None):
+    """Dijkstra con todos los orígenes a distancia 0, que termina en cuanto
+    se fija el primer vértice de 'destinos'. Devuelve ese destino (o None si
+    no es alcanzable) y los diccionarios de padres y distancias de los
+    vértices alcanzados. Opera en O(|E|*log(|E|)) en el peor caso."""
+
+    busqueda = BusquedaDijkstra(grafo,origenes,peso)
+    llegada = busqueda.avanzar(destinos)
+    return llegada,busqueda.padre,busqueda.dist
+
+
+def _unir_caminos(padre_ida,x,padre_vuelta,y):
+    """Arma el camino raíz_ida -> ... -> x -> y -> ... -> raíz_vuelta a
+    partir de los árboles de padres de una búsqueda bidireccional. Si x e y
+    son el mismo vértice, aparece una sola vez."""
+
+    camino = []
+    while x is not None:
+        camino.append(x)
+        x = padre_ida[x]
+    camino.reverse()
+    if camino[-1] == y:
+        y = padre_vuelta[y]
+    while y is not None:
+        camino.append(y)
+        y = padre_vuelta[y]
+    return camino
+
+
+def dijkstra_bidireccional(grafo,origenes,destinos,peso=None):
+    """Dijkstra bidireccional entre un conjunto de orígenes y uno de destinos:
+    avanza alternadamente desde ambos lados (siempre el de menor radio) y se
+    detiene cuando la suma de los radios supera al mejor camino encontrado.
+    Devuelve el camino (lista de vértices) y su distancia, o (None, inf) si no
+    hay camino. Pre: el grafo es no dirigido."""
+
+    grafo = _seleccionar(grafo,peso)
+    dist = ({},{})
+    padre = ({},{})
+    visitados = (set(),set())
+    heaps = ([],[])
+    for lado,fuentes in enumerate((origenes,destinos)):
+        for v in fuentes:
+            dist[lado][v] = 0
+            padre[lado][v] = None
+            heaps[lado].append((0,v))
+
+    mejor = float('inf')
+    encuentro = None
+    for v in origenes:
+        if v in dist[1]:
+            mejor,encuentro = 0,v
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= mejor:
+            break
+        lado = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        otro = 1 - lado
+        distancia,v = heappop(heaps[lado])
+        if v in visitados[lado]: continue
+        visitados[lado].add(v)
+        for w,peso in grafo.ver_a_adyacentes(v):
+            if distancia + peso < dist[lado].get(w,float('inf')):
+                dist[lado][w] = distancia + peso
+                padre[lado][w] = v
+                heappush(heaps[lado],(dist[lado][w],w))
+            if w in dist[otro] and dist[lado][w] + dist[otro][w] < mejor:
+                mejor = dist[lado][w] + dist[otro][w]
+                encuentro = w
+
+    if encuentro is None:
+        return None,mejor
+    return _unir_caminos(padre[0],encuentro,padre[1],encuentro),mejor
+
+
+def calcular_landmarks(grafo,cantidad,peso=None):
+    """Elige 'cantidad' landmarks (el vértice de mayor grado y luego, uno a
+    uno, el más lejano a los ya elegidos) y devuelve la lista de diccionarios
+    de distancias desde cada uno, para usar con heuristica_alt."""
+
+    grafo = _seleccionar(grafo,peso)
+    vertices = grafo.ver_vertices()
+    if not vertices:
+        return []
+
+    landmarks = []
+    cercania = {} # Distancia de cada vértice al landmark más cercano
+    actual = max(vertices,key=lambda v: len(list(grafo.ver_v_adyacentes(v))))
+    for i in range(cantidad):
+        distancias = dijkstra_multiple(grafo,[actual])[2]
+        landmarks.append(distancias)
+        for v,distancia in distancias.items():
+            if distancia < cercania.get(v,float('inf')):
+                cercania[v] = distancia
+        # Primero se cubren las componentes sin landmark, luego el más lejano
+        sin_cubrir = [v for v in vertices if v not in cercania]
+        actual = sin_cubrir[0] if sin_cubrir else max(cercania,key=cercania.get)
+        if cercania.get(actual) == 0: # Ya todos los vértices son landmarks
+            break
+
+    return landmarks
+
+
+def heuristica_alt(landmarks,destinos):
+    """Devuelve la heurística ALT (A*, landmarks y desigualdad triangular)
+    hacia el conjunto de destinos: h(v) = max_L min_t |d(L,t) - d(L,v)|.
+    Es admisible y consistente en grafos no dirigidos."""
+
+    tablas = [(distancias,[distancias[t] for t in destinos if t in distancias]) for distancias in landmarks]
+    calculadas = {}
+
+    def heuristica(v):
+        if v in calculadas:
+            return calculadas[v]
+        cota = 0
+        for distancias,hacia_destinos in tablas:
+            if v not in distancias:
+                continue
+            x = distancias[v]
+            for y in hacia_destinos:
+                if x - y < cota and y - x < cota: break # No mejora la cota
+            else:
+                if hacia_destinos:
+                    cota = min(abs(x - y) for y in hacia_destinos)
+        calculadas[v] = cota
+        return cota
+
+    return heuristica
+
+
+def astar(grafo,origenes,destinos,heuristica,peso=None):
+    """A* desde varios orígenes hasta el destino más cercano, guiado por una
+    heurística consistente (por ejemplo heuristica_alt). Devuelve el destino
+    alcanzado (o None), y los diccionarios de padres y distancias."""
+
+    grafo = _seleccionar(grafo,peso)
+    destinos = set(destinos)
+    dist = {}
+    padre = {}
+    heap = []
+    for origen in origenes:
+        dist[origen] = 0
+        padre[origen] = None
+        heap.append((heuristica(origen),origen))
+    heapify(heap)
+    visitados = set()
+
+    while heap:
+        estimado,v = heappop(heap)
+        if v in visitados: continue
+        visitados.add(v)
+        if v in destinos:
+            return v,padre,dist
+        for w,peso in grafo.ver_a_adyacentes(v):
+            if w not in visitados and dist[v] + peso < dist.get(w,float('inf')):
+                dist[w] = dist[v] + peso
+                padre[w] = v
+                heappush(heap,(dist[w] + heuristica(w),w))
+
+    return None,padre,dist
+
+
+def prim(grafo,peso=None):
     """Algoritmo de prim para obtener el arbol de tendido minimo de un grafo."""
 
+    grafo = _seleccionar(grafo,peso)
+
     vertice = grafo.vertice_aleatorio()
     vert = grafo.ver_vertices()
     visitados = set()
-    visitados.add(vertice)
-    heap = []
     arbol = Grafo()
     for v in vert:
         arbol.agregar_vertice(v)
-    for w in grafo.ver_v_adyacentes(vertice):
-        heapq.heappush(heap,(grafo.ver_peso(vertice,w),(vertice,w)))
-    while len(heap)>0:
-        (peso,(v,w)) = heapq.heappop(heap)
-        if w in visitados:
-            continue
-        arbol.agregar_arista(v,w,peso)
+    conexion = {vertice:None} # Vértice del árbol por el que conviene llegar a cada candidato
+    heap = HeapIndexado()
+    heap.encolar(vertice,0)
+    while not heap.esta_vacia():
+        peso,w = heap.desencolar()
         visitados.add(w)
-        for u in grafo.ver_v_adyacentes(w):
-            if u not in visitados:
-                heapq.heappush(heap,(grafo.ver_peso(w,u),(w,u)))
+        if conexion[w] is not None:
+            arbol.agregar_arista(conexion[w],w,peso)
+        for u,peso_arista in grafo.ver_a_adyacentes(w):
+            if u not in visitados and heap.encolar(u,peso_arista):
+                conexion[u] = w
     return arbol
 
-
-def _dfs(grafo,v,visitados,padre,orden): #SIN TESTEAR
-
-    visitados.add(v)
-    ady = grafo.ver_a_adyacentes(v)
-    for tupla in ady:
-        w = tupla[0]
-        if w not in visitados:
-            padre[w] = v
-            orden[w] = orden[v] + 1
-            _dfs(grafo,w,visitados,padre,orden)
-
-
-def dfs(grafo,origen): #SIN TESTEAR
+def kruskal(grafo,peso=None):
+    """Algoritmo de Kruskal: recorre las aristas ordenadas de menor a mayor
+    peso y se queda con las que unen dos componentes distintas. Si el grafo
+    no es conexo devuelve el bosque de tendido mínimo (un árbol por
+    componente). Devuelve la lista de aristas ((v,w),peso) del bosque, en el
+    orden en que se eligieron. A igual peso gana la arista que aparece antes
+    en ver_aristas, así que el resultado no depende del azar. Opera en
+    O(|E|*log(|E|))."""
+
+    grafo = _seleccionar(grafo,peso)
+    indices = {v:i for i,v in enumerate(grafo.ver_vertices())}
+    aristas = grafo.ver_aristas()
+    aristas.sort(key=operator.itemgetter(1))
+    conjuntos = ConjuntosDisjuntos(len(indices))
+    unir = conjuntos.unir
+    bosque = []
+    for arista in aristas:
+        (v,w),_ = arista
+        if unir(indices[v],indices[w]):
+            bosque.append(arista)
+            if len(conjuntos) == 1:
+                break
+    return bosque
+
+
+def dfs(grafo,origen):
     """Recorrido dfs (profundidad) sobre un grafo. Devuelve el diccionario de padres y orden. Opera en
-    O(E+V)"""
+    O(E+V). Es iterativo: la pila guarda, para cada vértice del camino actual, el iterador de los
+    vecinos que le quedan por ver, así que no depende del límite de recursión."""
 
-    visitados = set()
+    visitados = set([origen])
     padres = {}
     orden = {}
-    padre[origen] = None
+    padres[origen] = None
     orden[origen] = 0
-    _dfs(grafo,origen,visitados,padre,orden)
-    return padre, orden
+    pila = [(origen,iter(grafo.ver_v_adyacentes(origen)))]
+    while pila:
+        v,vecinos = pila[-1]
+        for w in vecinos:
+            if w not in visitados:
+                visitados.add(w)
+                padres[w] = v
+                orden[w] = orden[v] + 1
+                pila.append((w,iter(grafo.ver_v_adyacentes(w))))
+                break
+        else:
+            pila.pop()
+    return padres, orden
 
 def bfs(grafo,origen,destino=[]): #SIN TESTEAR
     """Recorrido bfs sobre un grafo(ancho). Devuelve el diccionario de padres y orden. Opera en
@@ -150,8 +509,7 @@ def bfs(grafo,origen,destino=[]): #SIN TESTEAR
 
     while not cola.esta_vacia():
         v = cola.desencolar()
-        for tupla in grafo.ver_a_adyacentes(v):
-            w = tupla[0]
+        for w in grafo.ver_v_adyacentes(v):
             if w not in visitados:
                 visitados.add(w)
                 padres[w] = v
@@ -162,6 +520,68 @@ def bfs(grafo,origen,destino=[]): #SIN TESTEAR
 
     return None,padres,orden
 
+def niveles_bfs(grafo,origenes):
+    """Bfs desde varios orígenes a la vez, de a un nivel por paso. Devuelve
+    el diccionario vértice -> nivel (cantidad de aristas hasta el origen
+    más cercano) de los vértices alcanzables. Opera en O(V+E)"""
+
+    nivel = {}
+    frontera = []
+    for v in origenes:
+        if v in grafo and v not in nivel:
+            nivel[v] = 0
+            frontera.append(v)
+    while frontera:
+        nueva = []
+        for v in frontera:
+            for w in grafo.ver_v_adyacentes(v):
+                if w not in nivel:
+                    nivel[w] = nivel[v] + 1
+                    nueva.append(w)
+        frontera = nueva
+    return nivel
+
+def bfs_bidireccional(grafo,origenes,destinos):
+    """Bfs bidireccional entre un conjunto de orígenes y uno de destinos: en
+    cada paso expande un nivel completo del lado con la frontera más chica.
+    Devuelve el camino con menos aristas (lista de vértices) o None si no hay."""
+
+    padre = ({},{})
+    orden = ({},{})
+    fronteras = [[],[]]
+    for lado,fuentes in enumerate((origenes,destinos)):
+        for v in fuentes:
+            padre[lado][v] = None
+            orden[lado][v] = 0
+            fronteras[lado].append(v)
+    for v in origenes:
+        if v in orden[1]:
+            return [v]
+
+    while fronteras[0] and fronteras[1]:
+        lado = 0 if len(fronteras[0]) <= len(fronteras[1]) else 1
+        otro = 1 - lado
+        nueva = []
+        mejor = None
+        for v in fronteras[lado]:
+            for w in grafo.ver_v_adyacentes(v):
+                if w in orden[otro]:
+                    largo = orden[lado][v] + 1 + orden[otro][w]
+                    if mejor is None or largo < mejor[0]:
+                        mejor = (largo,v,w)
+                if w not in orden[lado]:
+                    orden[lado][w] = orden[lado][v] + 1
+                    padre[lado][w] = v
+                    nueva.append(w)
+        if mejor is not None:
+            largo,v,w = mejor
+            if lado == 0:
+                return _unir_caminos(padre[0],v,padre[1],w)
+            return _unir_caminos(padre[0],w,padre[1],v)
+        fronteras[lado] = nueva
+
+    return None
+
 def pesos_ady(grafo,vertice):
     """Dado un grafo y un vertice devuelve un diccionario con los vertices adyacentes
     como clave y el peso de la arista como valor"""
@@ -184,61 +604,383 @@ def vertice_aleatorio(pesos):
         acum +=  peso_arista
 
 
-def centralidad_aproximada(grafo,cant_caminos,largo_camino):
+class TablasAlias:
+    """Tablas de alias (método de Vose) para elegir, en O(1), un vecino al
+    azar de cada vértice con probabilidad proporcional al peso de la arista.
+    Se arman una sola vez en O(|V| + |E|) y se reutilizan entre consultas
+    mientras el grafo no cambie."""
+
+    def __init__(self,grafo,peso=None):
+
+        grafo = _seleccionar(grafo,peso)
+        self.vertices = grafo.ver_vertices()
+        self.tablas = {}
+        for v in self.vertices:
+            vecinos = []
+            pesos = []
+            for w,peso_arista in grafo.ver_a_adyacentes(v):
+                vecinos.append(w)
+                pesos.append(peso_arista)
+            self.tablas[v] = (vecinos,) + _alias(pesos)
+        self._arreglos = None
+
+    def siguiente(self,v,rnd=random):
+        """Devuelve un vecino de 'v' al azar, según el peso de las aristas. Si
+        'v' no tiene vecinos, salta a un vértice cualquiera. Opera en O(1)."""
+
+        vecinos,probabilidad,alias = self.tablas[v]
+        if not vecinos:
+            return rnd.choice(self.vertices)
+        i = int(rnd.random() * len(vecinos))
+        if rnd.random() < probabilidad[i]:
+            return vecinos[i]
+        return vecinos[alias[i]]
+
+    def arreglos(self):
+        """Devuelve las tablas aplanadas en arreglos de NumPy (inicios, vecinos,
+        probabilidad, alias), con los vértices como índices de self.vertices.
+        Se arman la primera vez que se piden."""
+
+        if self._arreglos is None:
+            indices = {v:i for i,v in enumerate(self.vertices)}
+            inicios = [0]
+            vecinos = []
+            probabilidad = []
+            alias = []
+            for v in self.vertices:
+                fila,prob,ali = self.tablas[v]
+                vecinos.extend(indices[w] for w in fila)
+                probabilidad.extend(prob)
+                alias.extend(ali)
+                inicios.append(len(vecinos))
+            self._arreglos = (np.array(inicios,dtype=np.int64),np.array(vecinos,dtype=np.int64),
+                              np.array(probabilidad,dtype=np.float64),np.array(alias,dtype=np.int64))
+        return self._arreglos
+
+def _alias(pesos):
+    """Método de Vose: dadas las probabilidades (no normalizadas) de k
+    opciones, devuelve las listas de probabilidad y alias de cada casilla."""
+
+    k = len(pesos)
+    total = sum(pesos)
+    if k == 0:
+        return [],[]
+    if total <= 0:
+        return [1] * k,list(range(k))
+    escalados = [peso * k / total for peso in pesos]
+    probabilidad = [1] * k
+    alias = list(range(k))
+    chicos = [i for i,x in enumerate(escalados) if x < 1]
+    grandes = [i for i,x in enumerate(escalados) if x >= 1]
+    while chicos and grandes:
+        chico = chicos.pop()
+        grande = grandes[-1]
+        probabilidad[chico] = escalados[chico]
+        alias[chico] = grande
+        escalados[grande] += escalados[chico] - 1
+        if escalados[grande] < 1:
+            chicos.append(grandes.pop())
+    return probabilidad,alias
+
+def centralidad_aproximada(grafo,cant_caminos,largo_camino,peso=None,tablas=None):
     """Nos muestra los n aeropuertos más centrales/importantes del mundo,
-    de mayor importancia a menor importancia."""
+    de mayor importancia a menor importancia. Cada paso del recorrido
+    aleatorio opera en O(1) usando tablas de alias; si no se pasan ya
+    armadas (TablasAlias), se arman en O(|V| + |E|)."""
+    grafo = _seleccionar(grafo,peso)
+    if tablas is None:
+        tablas = TablasAlias(grafo)
     centralidad = {}
     vertices = grafo.ver_vertices()
     for v in vertices:
         centralidad[v] = 0
     vertice = grafo.vertice_aleatorio()
+    siguiente = tablas.siguiente
     for i in range (cant_caminos):
         for j in range (largo_camino):
-            vertice = vertice_aleatorio(pesos_ady(grafo,vertice))
+            vertice = siguiente(vertice)
             centralidad[vertice]+= 1
     return centralidad
 
-def centralidad_betweeness(grafo):
-    """Nos muestra los n aeropuertos más centrales/importantes del mundo,
-    de forma aproximada, de mayor importancia a menor importancia."""
-    cent = {}
+def centralidad_aproximada_lotes(grafo,cant_caminos,largo_camino,peso=None,tablas=None,semilla=None):
+    """Como centralidad_aproximada, pero con 'cant_caminos' recorridos
+    independientes (cada uno desde un vértice al azar) que avanzan todos a
+    la vez como vectores de NumPy. Sin NumPy instalado, hace los mismos
+    recorridos de a uno."""
+    grafo = _seleccionar(grafo,peso)
+    if tablas is None:
+        tablas = TablasAlias(grafo)
+    vertices = tablas.vertices
+    if not vertices:
+        return {}
+
+    if np is None:
+        rnd = random.Random(semilla)
+        centralidad = dict.fromkeys(vertices,0)
+        for i in range(cant_caminos):
+            vertice = rnd.choice(vertices)
+            for j in range(largo_camino):
+                vertice = tablas.siguiente(vertice,rnd)
+                centralidad[vertice] += 1
+        return centralidad
+
+    inicios,vecinos,probabilidad,alias = tablas.arreglos()
+    grados = inicios[1:] - inicios[:-1]
+    rnd = np.random.default_rng(semilla)
+    actuales = rnd.integers(0,len(vertices),cant_caminos)
+    visitas = np.zeros(len(vertices),dtype=np.int64)
+    for j in range(largo_camino):
+        grado = grados[actuales]
+        aislados = grado == 0
+        if len(vecinos):
+            casilla = inicios[actuales] + (rnd.random(cant_caminos) * grado).astype(np.int64)
+            casilla[aislados] = 0 # Cualquier casilla válida: el resultado se descarta
+            usar_alias = rnd.random(cant_caminos) >= probabilidad[casilla]
+            casilla = np.where(usar_alias,inicios[actuales] + alias[casilla],casilla)
+            casilla[aislados] = 0
+            actuales = np.where(aislados,rnd.integers(0,len(vertices),cant_caminos),vecinos[casilla])
+        else:
+            actuales = rnd.integers(0,len(vertices),cant_caminos)
+        visitas += np.bincount(actuales,minlength=len(vertices))
+    return {v:int(visitas[i]) for i,v in enumerate(vertices)}
+
+def grados_ponderados(grafo,peso=None):
+    """Devuelve dos diccionarios: vértice -> cantidad de aristas y vértice ->
+    suma de los pesos de sus aristas (con la frecuencia como peso, los
+    vuelos totales de cada aeropuerto). Opera en O(|V| + |E|)."""
+    grafo = _seleccionar(grafo,peso)
+    grados = {}
+    totales = {}
+    for v in grafo.ver_vertices():
+        grado = total = 0
+        for _,peso_arista in grafo.ver_a_adyacentes(v):
+            grado += 1
+            total += peso_arista
+        grados[v] = grado
+        totales[v] = total
+    return grados,totales
+
+def pagerank(grafo,peso=None,amortiguacion=AMORTIGUACION_PAGERANK,tolerancia=TOLERANCIA_PAGERANK,max_iteraciones=ITERACIONES_PAGERANK):
+    """Importancia de cada vértice según PageRank: la probabilidad de estar
+    en él tras muchos pasos de un recorrido aleatorio que sigue una arista
+    con probabilidad proporcional a su peso (como centralidad_aproximada) y
+    con probabilidad 1 - 'amortiguacion' salta a un vértice cualquiera. Los
+    vértices sin aristas reparten lo suyo entre todos. Itera hasta que la
+    suma de los cambios es menor que 'tolerancia'. Cada iteración opera en
+    O(|V| + |E|)."""
+    grafo = _seleccionar(grafo,peso)
     vertices = grafo.ver_vertices()
-    for v in vertices:
-        cent[v] = 0
-    for v in vertices:
-        # hacia todos los demas vertices
-        padre,distancia,x = dijkstra(grafo, v)
-        cent_aux = {}
-        for w in vertices:
-            cent_aux[w] = 0
-        # Aca filtramos (de ser necesario) los vertices a distancia infinita,
-        # y ordenamos de mayor a menor
-        distancias=list(distancia.items())
-        quick_sort(distancias)
-        for i in range (len(distancias)-1,-1,-1):
-            if padre[distancias[i][0]]!=None:
-                cent_aux[padre[distancias[i][0]]] +=  1 + cent_aux[distancias[i][0]]
+    n = len(vertices)
+    if n == 0:
+        return {}
+    totales = grados_ponderados(grafo)[1]
+    rango = dict.fromkeys(vertices,1 / n)
+    for i in range(max_iteraciones):
+        colgantes = sum(rango[v] for v in vertices if totales[v] <= 0)
+        nuevo = dict.fromkeys(vertices,(1 - amortiguacion + amortiguacion * colgantes) / n)
+        for v in vertices:
+            if totales[v] <= 0: continue
+            aporte = amortiguacion * rango[v] / totales[v]
+            for w,peso_arista in grafo.ver_a_adyacentes(v):
+                nuevo[w] += aporte * peso_arista
+        cambio = sum(abs(nuevo[v] - rango[v]) for v in vertices)
+        rango = nuevo
+        if cambio < tolerancia:
+            break
+    return rango
+
+def _centralidad_desde(grafo,v):
+    """Algoritmo de Brandes para una fuente: corre Dijkstra desde 'v'
+    contando la cantidad de caminos mínimos (sigma) y los predecesores de
+    cada vértice, y luego acumula las dependencias recorriendo los vértices
+    en orden inverso al que se fijaron (sin ordenar nada aparte). Tiene en
+    cuenta todos los caminos mínimos cuando hay empates. Devuelve un
+    diccionario vértice -> aporte, para los vértices alcanzables desde 'v'."""
+
+    dist = {v:0}
+    sigma = {v:1}
+    predecesores = {v:[]}
+    orden = [] # Vértices en el orden en que quedan fijados
+    visitados = set()
+    heap = [(0,v)]
+    while heap:
+        distancia,w = heappop(heap)
+        if w in visitados: continue
+        visitados.add(w)
+        orden.append(w)
+        for u,peso in grafo.ver_a_adyacentes(w):
+            if u in visitados: continue
+            if u not in dist or distancia + peso < dist[u]:
+                dist[u] = distancia + peso
+                sigma[u] = sigma[w]
+                predecesores[u] = [w]
+                heappush(heap,(dist[u],u))
+            elif distancia + peso == dist[u]:
+                sigma[u] += sigma[w]
+                predecesores[u].append(w)
+
+    dependencia = dict.fromkeys(orden,0)
+    for w in reversed(orden):
+        coeficiente = (1 + dependencia[w]) / sigma[w]
+        for u in predecesores[w]:
+            dependencia[u] += sigma[u] * coeficiente
+    return dependencia
+
+def _iniciar_trabajador(grafo):
+    """Deja el grafo disponible para _centralidad_bloque en un proceso trabajador."""
+    global _grafo_trabajador
+    _grafo_trabajador = grafo
+
+def _centralidad_bloque(fuentes,grafo=None):
+    """Suma los aportes a la centralidad de los caminos que salen desde cada
+    vértice de 'fuentes'. En los procesos trabajadores el grafo no se recibe
+    por parámetro sino que ya está cargado (heredado o por el inicializador)."""
+
+    if grafo is None:
+        grafo = _grafo_trabajador
+    parcial = {}
+    for v in fuentes:
+        cent_aux = _centralidad_desde(grafo,v)
         # le sumamos 1 a la centralidad de todos los vertices que se encuentren en
         # el medio del camino
-        for w in vertices:
-            if w ==  v: continue
-            cent[w] +=  cent_aux[w]
+        for w,aporte in cent_aux.items():
+            if w == v or not aporte: continue
+            parcial[w] = parcial.get(w,0) + aporte
+    return parcial
+
+def _pool_trabajadores(grafo,trabajadores):
+    """Crea el pool de procesos para calcular centralidad. Donde se puede usar
+    fork, los trabajadores heredan el grafo sin copiarlo ni serializarlo; si
+    no, se les envía una sola vez al iniciar."""
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        _iniciar_trabajador(grafo)
+        return ProcessPoolExecutor(trabajadores,mp_context=multiprocessing.get_context("fork"))
+    return ProcessPoolExecutor(trabajadores,initializer=_iniciar_trabajador,initargs=(grafo,))
+
+def centralidad_betweeness(grafo,peso=None,trabajadores=1,normalizar=False):
+    """Nos muestra los n aeropuertos más centrales/importantes del mundo,
+    de mayor importancia a menor importancia. Calcula la centralidad de
+    intermediación (betweenness) exacta con el algoritmo de Brandes, en
+    O(|V|*|E|*log(|V|)). Con 'normalizar', divide por (|V|-1)*(|V|-2), la
+    cantidad de pares ordenados que no incluyen al vértice.
+    Las fuentes se reparten en bloques de TAM_BLOQUE_CENTRALIDAD vértices; con
+    más de un trabajador, cada bloque se calcula en un proceso del pool. Los
+    resultados parciales se combinan siempre en el mismo orden, por lo que
+    el resultado no depende de la cantidad de trabajadores."""
+    grafo = _seleccionar(grafo,peso)
+    vertices = grafo.ver_vertices()
+    cent = _acumular_centralidad(grafo,vertices,trabajadores)
+    if normalizar and len(vertices) > 2:
+        escala = (len(vertices) - 1) * (len(vertices) - 2)
+        for v in cent:
+            cent[v] /= escala
+    return cent
+
+def _acumular_centralidad(grafo,fuentes,trabajadores):
+    """Suma, para cada vértice, su dependencia respecto de cada una de las
+    fuentes, repartiendo el trabajo en bloques (ver centralidad_betweeness)."""
+
+    cent = {}
+    for v in grafo.ver_vertices():
+        cent[v] = 0
+    bloques = [fuentes[i:i + TAM_BLOQUE_CENTRALIDAD] for i in range(0,len(fuentes),TAM_BLOQUE_CENTRALIDAD)]
+
+    if trabajadores <= 1:
+        parciales = [_centralidad_bloque(bloque,grafo) for bloque in bloques]
+    else:
+        try:
+            with _pool_trabajadores(grafo,trabajadores) as pool:
+                parciales = list(pool.map(_centralidad_bloque,bloques))
+        finally:
+            _iniciar_trabajador(None)
+
+    for parcial in parciales:
+        for w,aporte in parcial.items():
+            cent[w] +=  aporte
     return cent
 
-def _vacaciones(grafo,n,v,solucion,origen,visitados):
-    """Obtiene un ciclo de largo n desde un origen que se pasa por
-    parametro."""
-    visitados.add(v)
-    if (len(solucion) == n):
-        if origen in grafo.ver_v_adyacentes(v):
-            return solucion
+def cantidad_pivotes(n,epsilon,confianza):
+    """Cantidad de pivotes necesaria para que, con probabilidad 'confianza',
+    la centralidad normalizada estimada de todos los vértices a la vez
+    difiera en menos de 'epsilon' de la exacta. Por la desigualdad de
+    Hoeffding y la cota de la unión sobre los n vértices:
+    k >= ln(2n / (1 - confianza)) / (2 * epsilon^2)."""
+
+    if n == 0:
+        return 0
+    k = math.ceil(math.log(2 * n / (1 - confianza)) / (2 * epsilon ** 2))
+    return min(n,k)
+
+def centralidad_muestreada(grafo,epsilon,confianza,semilla=None,peso=None,trabajadores=1,normalizar=False):
+    """Centralidad de intermediación aproximada por muestreo de pivotes
+    (Brandes y Pich): corre el paso de Brandes sólo desde k fuentes elegidas
+    al azar (ver cantidad_pivotes) y escala el resultado por |V|/k, que es
+    un estimador insesgado de centralidad_betweeness. Con la misma semilla
+    el resultado es siempre el mismo."""
+
+    grafo = _seleccionar(grafo,peso)
+    vertices = grafo.ver_vertices()
+    k = cantidad_pivotes(len(vertices),epsilon,confianza)
+    pivotes = random.Random(semilla).sample(vertices,k)
+    cent = _acumular_centralidad(grafo,pivotes,trabajadores)
+    escala = len(vertices) / k if k else 1
+    if normalizar and len(vertices) > 2:
+        escala /= (len(vertices) - 1) * (len(vertices) - 2)
+    for v in cent:
+        cent[v] *= escala
+    return cent
+
+def _vacaciones(grafo,n,origen,saltos,vencimiento=None):
+    """Busca un ciclo que sale de 'origen', pasa por otros n vértices
+    distintos y vuelve. 'saltos' es la distancia en aristas de cada vértice
+    al origen (el orden de un bfs desde él): una rama se poda en cuanto el
+    vértice al que llega no puede volver al origen con las aristas que le
+    quedan. Backtracking iterativo: el camino se extiende y recorta en el
+    lugar, y la pila guarda los vecinos pendientes de cada vértice, que se
+    recorren de mayor a menor grado (los más conectados cierran el ciclo
+    más seguido). Si se pasa 'vencimiento' (un instante de
+    time.perf_counter) la búsqueda se abandona al llegar a él.
+    Devuelve (ciclo, parcial): los n vértices del ciclo sin el origen, o
+    [] si no se encontró, y el camino más largo que se llegó a armar."""
+
+    grados = {}
+    ordenados = {} # Memo de los vecinos de cada vértice, ordenados por grado
+    def grado(v):
+        if v not in grados:
+            grados[v] = sum(1 for _ in grafo.ver_v_adyacentes(v))
+        return grados[v]
+    def vecinos(v):
+        if v not in ordenados:
+            ordenados[v] = sorted(grafo.ver_v_adyacentes(v),key=lambda w: (-grado(w),w))
+        return ordenados[v]
+
+    camino = []
+    visitados = {origen}
+    mejor = []
+    pila = [iter(vecinos(origen))]
+    expansiones = 0
+    while pila:
+        for w in pila[-1]:
+            # Desde 'w' quedan n - len(camino) aristas para volver al origen.
+            if w in visitados or saltos.get(w,n + 1) > n - len(camino):
+                continue
+            if len(camino) + 1 == n:
+                if saltos[w] == 1:
+                    camino.append(w)
+                    return camino,camino
+                continue
+            visitados.add(w)
+            camino.append(w)
+            if len(camino) > len(mejor):
+                mejor = list(camino)
+            pila.append(iter(vecinos(w)))
+            expansiones += 1
+            if vencimiento is not None and expansiones % 1024 == 0 and time.perf_counter() > vencimiento:
+                return [],mejor
+            break
         else:
-            visitados.remove(v)
-            return []
-    for w in grafo.ver_v_adyacentes(v): #FALTA PODAR CON VISITADOS
-        if w in visitados: continue
-        sol = _vacaciones(grafo,n,w,solucion+[w],origen,visitados)
-        if (len(sol) == n):
-            return sol
-    visitados.remove(v)
-    return []
+            pila.pop()
+            if camino:
+                visitados.remove(camino.pop())
+    return [],mejor
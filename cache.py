@@ -0,0 +1,154 @@
+#
+#   Cache de resultados de búsquedas de una sola fuente (árboles de padres
+#   y distancias), con política de desalojo LRU (least recently used).
+#
+#   Cada entrada se identifica con la tupla (tipo, fuente), donde 'tipo'
+#   es el peso usado en la búsqueda (por ejemplo 'precio' o 'tiempo') y
+#   'fuente' el origen: un aeropuerto para los árboles bfs de
+#   camino_escalas, y la tupla de aeropuertos de la ciudad de origen para
+#   las búsquedas de camino_mas, que salen de todos a la vez (ver
+#   BusquedaDijkstra). Dos ciudades con aeropuertos en común no comparten
+#   esas búsquedas. Junto con el resultado se guarda la
+#   versión del grafo sobre la que se calculó: si el grafo cambió desde
+#   entonces (agregar_arista, remover_arista, cambiar_peso), la entrada se
+#   descarta y se vuelve a calcular, salvo que después del cambio se la
+#   haya reparado con reparar().
+#
+#   Los resultados sobre toda la red (centralidades, tablas de alias,
+#   landmarks, matrices), que cuestan mucho más que un árbol, se guardan
+#   aparte con obtener_global(): no cuentan para la capacidad ni se
+#   desalojan, así que una ráfaga de consultas de camino_mas no los saca.
+#   Son pocos (uno por comando y modo), y se descartan igual que los
+#   árboles cuando el grafo cambia.
+#
+
+from collections import OrderedDict
+
+                    ########################
+                    #                      #
+                    #        CLASES        #
+                    #                      #
+                    ########################
+
+class CacheCaminos:
+
+    def __init__(self,capacidad):
+        """Crea una cache vacía que guarda a lo sumo 'capacidad' árboles.
+        Con capacidad 0 no guarda nada (toda consulta es un fallo)."""
+
+        self.capacidad = capacidad
+        self.arboles = OrderedDict()
+        self.globales = {}
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+        self.desalojos = 0
+        self.reparaciones = 0
+
+    def __len__(self):
+        return len(self.arboles)
+
+    def __contains__(self,clave):
+        return clave in self.arboles
+
+    def obtener(self,grafo,tipo,fuente,calcular):
+        """Devuelve el resultado guardado para (tipo, fuente) si sigue siendo
+        válido para la versión actual del grafo. En caso contrario llama a
+        'calcular()', guarda su resultado y lo devuelve. Opera en O(1) más
+        el costo de 'calcular' en caso de fallo."""
+
+        clave = (tipo,fuente)
+        resultado = self._vigente(self.arboles,grafo,clave)
+        if resultado is not None:
+            self.arboles.move_to_end(clave)
+            return resultado
+
+        resultado = calcular()
+        self.guardar(grafo,tipo,fuente,resultado)
+        return resultado
+
+    def obtener_global(self,grafo,tipo,nombre,calcular):
+        """Como obtener(), pero para un resultado sobre toda la red: se guarda
+        fuera de la LRU, sin desalojarlo nunca. Opera en O(1) más el costo de
+        'calcular' en caso de fallo."""
+
+        clave = (tipo,nombre)
+        resultado = self._vigente(self.globales,grafo,clave)
+        if resultado is None:
+            resultado = calcular()
+            if self.capacidad > 0:
+                self.globales[clave] = (grafo.version,resultado)
+        return resultado
+
+    def _vigente(self,entradas,grafo,clave):
+        """Devuelve el resultado guardado en 'entradas' para 'clave' si es de
+        la versión actual del grafo (y descarta el de una versión anterior),
+        o None. Cuenta el acierto o el fallo."""
+
+        entrada = entradas.get(clave)
+        if entrada is not None:
+            version,resultado = entrada
+            if version == grafo.version:
+                self.aciertos += 1
+                return resultado
+            del entradas[clave]
+            self.invalidaciones += 1
+        self.fallos += 1
+        return None
+
+    def guardar(self,grafo,tipo,fuente,resultado):
+        """Guarda un resultado para (tipo, fuente), desalojando el menos
+        usado recientemente si se supera la capacidad."""
+
+        if self.capacidad <= 0:
+            return
+        clave = (tipo,fuente)
+        self.arboles[clave] = (grafo.version,resultado)
+        self.arboles.move_to_end(clave)
+        while len(self.arboles) > self.capacidad:
+            self.arboles.popitem(last=False)
+            self.desalojos += 1
+
+    def reparar(self,grafo,version,reparar):
+        """Después de un cambio en el grafo, lleva a la versión actual las
+        entradas calculadas sobre 'version' (la anterior al cambio) en lugar
+        de descartarlas. 'reparar(tipo, fuente, resultado)' devuelve el
+        resultado ya corregido, o None si no se puede reparar y hay que
+        descartarlo. Opera en O(cantidad de entradas) más el costo de las
+        reparaciones."""
+
+        for entradas in (self.arboles,self.globales):
+            for clave,(vieja,resultado) in list(entradas.items()):
+                if vieja == version:
+                    resultado = reparar(*clave,resultado)
+                else:
+                    resultado = None
+                if resultado is None:
+                    del entradas[clave]
+                    self.invalidaciones += 1
+                else:
+                    entradas[clave] = (grafo.version,resultado)
+                    self.reparaciones += 1
+
+    def limpiar(self):
+        """Descarta todos los resultados guardados (las estadísticas se mantienen)."""
+
+        self.invalidaciones += len(self.arboles) + len(self.globales)
+        self.arboles.clear()
+        self.globales.clear()
+
+    def estadisticas(self):
+        """Devuelve un diccionario con las estadísticas de uso de la cache."""
+
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0,
+            "invalidaciones": self.invalidaciones,
+            "desalojos": self.desalojos,
+            "reparaciones": self.reparaciones,
+            "tamanio": len(self.arboles),
+            "globales": len(self.globales),
+            "capacidad": self.capacidad,
+        }
@@ -0,0 +1,161 @@
+#
+#   Carga de la red de vuelos por bloques: el archivo de vuelos se lee de a
+#   TAM_BLOQUE caracteres y cada bloque (de líneas completas) se parte de
+#   una sola vez en una lista plana de campos, de la que cada columna sale
+#   como una rebanada que se convierte directamente a un arreglo tipado. No
+#   se arma ninguna lista ni tupla por fila. El grafo (GrafoCSR) se arma al
+#   final sobre esas columnas, también sólo con arreglos.
+#
+#   Además de los arreglos de la red, la memoria extra es la de un bloque
+#   de texto partido en campos, no la del archivo entero.
+#
+#   Mientras dura la carga se apaga el recolector de ciclos: cada bloque crea
+#   cientos de miles de cadenas de vida corta que no forman ciclos, y
+#   recorrerlas una y otra vez alarga la lectura.
+#
+
+import csv
+import gc
+import sys
+import time
+from array import array
+from itertools import repeat
+from grafo import GrafoCSR
+
+TAM_BLOQUE = 1 << 20 # 1 Mi caracteres de texto por bloque
+TIPOS = {'l':'q','q':'q','i':'q','d':'d'} # Tipos de ancho fijo para cada atributo
+
+
+def leer_aeropuertos(ruta):
+    """Lee el archivo de aeropuertos. Devuelve la lista de códigos, el
+    índice código -> posición, y los diccionarios cities (ciudad ->
+    aeropuertos) y flights (aeropuerto -> ciudad)."""
+
+    codigos = []
+    indices = {}
+    cities = {}
+    flights = {}
+    with open(ruta,newline='') as archivo:
+        for fila in csv.reader(archivo):
+            if len(fila) < 2:
+                continue
+            ciudad,codigo = fila[0],sys.intern(fila[1])
+            if codigo not in indices:
+                indices[codigo] = len(codigos)
+                codigos.append(codigo)
+            cities.setdefault(ciudad,[]).append(codigo)
+            flights[codigo] = ciudad
+    return codigos,indices,cities,flights
+
+
+def _campos(texto):
+    """Separa un bloque de líneas completas en una lista plana de campos.
+    Devuelve (campos, ancho), con 'ancho' campos por fila, o None si no
+    todas las filas tienen la misma cantidad de campos."""
+
+    if "\n\n" in texto or texto.startswith("\n") or texto.endswith("\n"):
+        texto = "\n".join(filter(None,texto.split("\n")))
+    if not texto:
+        return [],1
+    comas = set(map(str.count,texto.split("\n"),repeat(",")))
+    if len(comas) != 1:
+        return None
+    return texto.replace("\n",",").split(","),comas.pop() + 1
+
+
+def _campos_por_fila(texto,ancho):
+    """Como _campos, pero fila por fila: descarta las filas con menos de
+    'ancho' campos y corta las que tienen más. Sólo se usa si el bloque
+    tiene filas de distinto largo."""
+
+    campos = []
+    for linea in texto.split("\n"):
+        fila = linea.split(",")
+        if len(fila) >= ancho:
+            campos.extend(fila[:ancho])
+    return campos,ancho
+
+
+def leer_vuelos_por_bloques(ruta,indices,columnas,tam_bloque=TAM_BLOQUE):
+    """Itera el archivo de vuelos de a bloques. Por cada bloque devuelve los
+    arreglos de índices de origen y destino y un diccionario {atributo:
+    arreglo}, según 'columnas' = {atributo: (tipo, columna, conversion)}.
+    Se descartan los vuelos entre aeropuertos desconocidos."""
+
+    necesarias = max([1] + [columna for tipo,columna,conversion in columnas.values()]) + 1
+    resto = ""
+    with open(ruta) as archivo:
+        while True:
+            leido = archivo.read(tam_bloque)
+            texto = resto + leido
+            if leido:
+                corte = texto.rfind("\n")
+                if corte < 0:
+                    resto = texto
+                    continue
+                texto,resto = texto[:corte],texto[corte + 1:]
+            elif not texto:
+                return
+            else:
+                resto = ""
+            separado = _campos(texto)
+            if separado is None or separado[1] < necesarias:
+                separado = _campos_por_fila(texto,necesarias)
+            campos,ancho = separado
+            del texto
+            if not campos:
+                if not leido:
+                    return
+                continue
+
+            filas = len(campos) // ancho
+            origenes = array('q',map(indices.get,campos[0::ancho],repeat(-1,filas)))
+            destinos = array('q',map(indices.get,campos[1::ancho],repeat(-1,filas)))
+            valores = {atributo:array(TIPOS[tipo],map(conversion,campos[columna::ancho]))
+                       for atributo,(tipo,columna,conversion) in columnas.items()}
+            del campos
+            if -1 in origenes or -1 in destinos:
+                validas = [i for i,(x,y) in enumerate(zip(origenes,destinos)) if x >= 0 and y >= 0]
+                origenes = array('q',[origenes[i] for i in validas])
+                destinos = array('q',[destinos[i] for i in validas])
+                valores = {atributo:array(arreglo.typecode,[arreglo[i] for i in validas]) for atributo,arreglo in valores.items()}
+            yield origenes,destinos,valores
+            if not leido:
+                return
+
+
+def leer_red(aeropuertos,vuelos,columnas,tam_bloque=TAM_BLOQUE,informe=sys.stderr,derivados=None):
+    """Carga la red completa por bloques. Devuelve (grafo, cities, flights),
+    con el grafo como GrafoCSR con un atributo por cada entrada de
+    'columnas' y con los 'derivados' para armar al pedirlos (ver GrafoCSR).
+    Si 'informe' no es None, escribe ahí las filas por segundo."""
+
+    inicio = time.perf_counter()
+    recolector = gc.isenabled()
+    gc.disable()
+    try:
+        codigos,indices,cities,flights = leer_aeropuertos(aeropuertos)
+
+        origenes = array('q')
+        destinos = array('q')
+        valores = {atributo:array(TIPOS[tipo]) for atributo,(tipo,columna,conversion) in columnas.items()}
+        for bloque_origenes,bloque_destinos,bloque_valores in leer_vuelos_por_bloques(vuelos,indices,columnas,tam_bloque):
+            origenes.extend(bloque_origenes)
+            destinos.extend(bloque_destinos)
+            for atributo,arreglo in bloque_valores.items():
+                valores[atributo].extend(arreglo)
+        lectura = time.perf_counter() - inicio
+
+        grafo = GrafoCSR.desde_columnas(codigos,origenes,destinos,
+                                        {atributo:(arreglo.typecode,arreglo) for atributo,arreglo in valores.items()},
+                                        derivados)
+        total = time.perf_counter() - inicio
+    finally:
+        if recolector:
+            gc.enable()
+
+    if informe is not None:
+        filas = len(origenes)
+        print(f"{vuelos}: {filas} vuelos leídos en {lectura:.2f}s ({filas / lectura if lectura else 0:,.0f} filas/s), "
+              f"grafo armado en {total - lectura:.2f}s", file=informe)
+    return grafo,cities,flights
@@ -0,0 +1,327 @@
+#
+#   Contraction Hierarchies (jerarquías de contracción) para camino_mas.
+#
+#   Preprocesamiento: los vértices se contraen de a uno, en orden de
+#   importancia creciente. Al contraer 'v', para cada par de vecinos (u, w)
+#   todavía no contraídos se agrega el atajo u-w (de peso u-v + v-w) salvo
+#   que una búsqueda local que evita a 'v' (búsqueda de testigos) encuentre
+#   un camino igual de corto. La importancia de un vértice es su diferencia
+#   de aristas (atajos que agregaría menos aristas que quita) más la cantidad
+#   de vecinos ya contraídos, y se recalcula perezosamente al sacarlo del heap.
+#
+#   Cada vértice se queda con sus aristas "hacia arriba": las que lo unen con
+#   vecinos contraídos después que él (aristas originales o atajos). Como el
+#   grafo es no dirigido, la consulta es un Dijkstra bidireccional en el que
+#   ambos lados sólo suben: desde los orígenes y desde los destinos. Los
+#   atajos guardan el vértice del medio, con el que se desarman
+#   recursivamente para devolver el camino original.
+#
+#   Los arreglos del grafo hacia arriba se guardan, para precio y tiempo, en
+#   un archivo con el formato de snapshot.py al lado de los csv, y se
+#   regeneran si los csv cambiaron.
+#
+
+from heapq import heappush, heappop, heapify
+import random
+import sys
+from array import array
+from bisect import bisect_left
+from biblioteca import BusquedaDijkstra
+from carga import leer_red
+from snapshot import firmas, esta_actualizado, leer_encabezado, guardar_arreglos, mapear_arreglos
+
+MAGIA = b"FLYCOMCH"
+FORMATO = 1
+EXTENSION = ".ch"
+LIMITE_TESTIGOS = 500 # Vértices que fija, como mucho, cada búsqueda de testigos al contraer
+LIMITE_PRIORIDAD = 20 # Ídem al estimar la prioridad, que sólo necesita contar atajos
+SIN_MEDIO = -1 # Medio de una arista original
+
+
+def _buscar_testigos(ady,origen,excluido,objetivos,limite,fijables):
+    """Dijkstra local desde 'origen' sobre el grafo que queda, sin pasar por
+    'excluido' ni más allá de la distancia 'limite', que se corta al fijar
+    todos los 'objetivos' o al fijar 'fijables' vértices. Devuelve las
+    distancias encontradas (las que faltan se consideran infinitas)."""
+
+    dist = {origen:0}
+    heap = [(0,origen)]
+    pendientes = len(objetivos)
+    while heap and pendientes and fijables:
+        distancia,v = heappop(heap)
+        if distancia > dist[v]: continue
+        fijables -= 1
+        if v in objetivos:
+            pendientes -= 1
+            if not pendientes:
+                break
+        for w,peso in ady[v].items():
+            nueva = distancia + peso
+            if nueva <= limite and w != excluido and (w not in dist or nueva < dist[w]):
+                dist[w] = nueva
+                heappush(heap,(nueva,w))
+    return dist
+
+
+def _atajos(ady,v,fijables):
+    """Devuelve la lista de atajos (u, w, peso) que hacen falta al contraer
+    'v', buscando testigos que fijen como mucho 'fijables' vértices. Si la
+    búsqueda se corta antes de encontrar un testigo se agrega el atajo de
+    más, lo que nunca cambia las distancias."""
+
+    # Las búsquedas salen de los vecinos de menor grado: el de mayor grado
+    # (típicamente un hub, caro de expandir) sólo es objetivo.
+    vecinos = sorted(ady[v].items(),key=lambda vecino: len(ady[vecino[0]]))
+    atajos = []
+    for i,(u,peso_u) in enumerate(vecinos):
+        restantes = vecinos[i + 1:]
+        if not restantes:
+            continue
+        limite = peso_u + max(peso_w for _,peso_w in restantes)
+        dist = _buscar_testigos(ady,u,v,{w for w,_ in restantes},limite,fijables)
+        for w,peso_w in restantes:
+            if dist.get(w,float('inf')) > peso_u + peso_w:
+                atajos.append((u,w,peso_u + peso_w))
+    return atajos
+
+
+def construir(grafo,peso=None,informe=None):
+    """Contrae todos los vértices del grafo (según 'peso' si es multipeso) y
+    devuelve la JerarquiaContraccion resultante. Opera en O(|V| * d^2 * T),
+    con 'd' el grado (que crece con los atajos) y T el costo de una búsqueda
+    de testigos."""
+
+    if peso is not None:
+        grafo = grafo.vista(peso)
+    codigos = grafo.ver_vertices()
+    indices = {codigo:i for i,codigo in enumerate(codigos)}
+    n = len(codigos)
+
+    ady = [{} for _ in range(n)] # ady[v][w] = peso, entre los que faltan contraer
+    medio_de = {} # (v, w) con v < w -> vértice del medio, sólo para los atajos
+    for v,codigo in enumerate(codigos):
+        for vecino,p in grafo.ver_a_adyacentes(codigo):
+            w = indices[vecino]
+            if w != v and p < ady[v].get(w,float('inf')):
+                ady[v][w] = ady[w][v] = p
+
+    contraidos = [0] * n # Vecinos ya contraídos de cada vértice
+    niveles = [0] * n # Cota de la profundidad de cada vértice en la jerarquía
+    def prioridad(v):
+        return len(_atajos(ady,v,LIMITE_PRIORIDAD)) - len(ady[v]) + contraidos[v] + niveles[v]
+
+    heap = [(prioridad(v),v) for v in range(n)]
+    heapify(heap)
+    arriba = [None] * n
+    atajos_totales = 0
+    while heap:
+        _,v = heappop(heap)
+        actual = prioridad(v)
+        if heap and actual > heap[0][0]:
+            heappush(heap,(actual,v))
+            continue
+
+        for u,w,p in _atajos(ady,v,LIMITE_TESTIGOS):
+            if p < ady[u].get(w,float('inf')):
+                ady[u][w] = ady[w][u] = p
+                medio_de[min(u,w),max(u,w)] = v
+                atajos_totales += 1
+        arriba[v] = sorted((w,p,medio_de.get((min(v,w),max(v,w)),SIN_MEDIO)) for w,p in ady[v].items())
+        for w in ady[v]:
+            del ady[w][v]
+            contraidos[w] += 1
+            niveles[w] = max(niveles[w],niveles[v] + 1)
+        ady[v] = {}
+
+    inicios = array('q',[0])
+    vecinos = array('q')
+    pesos = array('d')
+    medios = array('q')
+    for v in range(n):
+        for w,p,medio in arriba[v]:
+            vecinos.append(w)
+            pesos.append(p)
+            medios.append(medio)
+        inicios.append(len(vecinos))
+    if informe is not None:
+        print(f"jerarquía de contracción: {n} vértices, {atajos_totales} atajos, {len(vecinos)} aristas hacia arriba",
+              file=informe)
+    return JerarquiaContraccion(codigos,inicios,vecinos,pesos,medios)
+
+
+def ruta_jerarquias(vuelos):
+    """Ruta del archivo de jerarquías, al lado del csv de vuelos."""
+    return vuelos + EXTENSION
+
+
+def compilar(aeropuertos,vuelos,ruta,columnas,pesos,informe=sys.stderr):
+    """Construye las jerarquías de cada peso a partir de los csv y las guarda en 'ruta'."""
+
+    grafo,cities,flights = leer_red(aeropuertos,vuelos,columnas,informe=None)
+    arreglos = []
+    for peso in pesos:
+        jerarquia = construir(grafo,peso,informe)
+        for nombre in ("inicios","vecinos","pesos","medios"):
+            arreglos.append((f"{peso}_{nombre}",getattr(jerarquia,nombre)))
+    guardar_arreglos(ruta,MAGIA,FORMATO,{
+        "fuentes": firmas(aeropuertos,vuelos),
+        "codigos": grafo.ver_vertices(),
+        "pesos": list(pesos),
+    },arreglos)
+
+
+def cargar(ruta):
+    """Mapea el archivo de jerarquías y devuelve {peso: JerarquiaContraccion}."""
+
+    metadatos,arreglos = mapear_arreglos(ruta,MAGIA,FORMATO)
+    codigos = [sys.intern(codigo) for codigo in metadatos["codigos"]]
+    return {peso:JerarquiaContraccion(codigos,*(arreglos[f"{peso}_{nombre}"] for nombre in ("inicios","vecinos","pesos","medios")))
+            for peso in metadatos["pesos"]}
+
+
+def cargar_o_compilar(aeropuertos,vuelos,ruta,columnas,pesos):
+    """Carga las jerarquías de 'ruta', generándolas antes si no existen, si los
+    csv cambiaron o si faltan pesos."""
+
+    if not esta_actualizado(ruta,aeropuertos,vuelos,MAGIA,FORMATO) or leer_encabezado(ruta,MAGIA,FORMATO)["pesos"] != list(pesos):
+        compilar(aeropuertos,vuelos,ruta,columnas,pesos)
+    return cargar(ruta)
+
+
+def validar(grafo,cities,jerarquias,cantidad,semilla=0):
+    """Compara, en 'cantidad' pares de ciudades al azar y para cada peso, la
+    distancia de la jerarquía con la de la búsqueda de camino_mas, y que el
+    camino devuelto exista y sume esa distancia. Devuelve {peso: (pares, errores)}."""
+
+    rnd = random.Random(semilla)
+    ciudades = sorted(cities)
+    resultado = {}
+    for peso,jerarquia in jerarquias.items():
+        vista = grafo.vista(peso)
+        errores = 0
+        for _ in range(cantidad):
+            origen,destino = rnd.choice(ciudades),rnd.choice(ciudades)
+            busqueda = BusquedaDijkstra(grafo,cities[origen],peso)
+            llegada = busqueda.avanzar(cities[destino])
+            esperada = None if llegada is None else busqueda.dist[llegada]
+            camino,distancia = jerarquia.camino(cities[origen],cities[destino])
+            if camino is not None:
+                if camino[0] not in cities[origen] or camino[-1] not in cities[destino]:
+                    distancia = None
+                elif any(not vista.ver_adyacencia(v,w) for v,w in zip(camino,camino[1:])):
+                    distancia = None
+                elif sum(vista.ver_peso(v,w) for v,w in zip(camino,camino[1:])) != distancia:
+                    distancia = None
+            if distancia != esperada:
+                errores += 1
+        resultado[peso] = (cantidad,errores)
+    return resultado
+
+
+                    ########################
+                    #                      #
+                    #        CLASES        #
+                    #                      #
+                    ########################
+
+class JerarquiaContraccion:
+
+    #
+    #   Grafo hacia arriba en formato CSR: las aristas de 'v' (hacia vecinos
+    #   contraídos después) ocupan vecinos[inicios[v]:inicios[v+1]], ordenadas
+    #   por vecino, con su peso y su vértice del medio (SIN_MEDIO si es una
+    #   arista original) en la misma posición de 'pesos' y 'medios'.
+    #
+
+    def __init__(self,codigos,inicios,vecinos,pesos,medios):
+
+        self.codigos = codigos
+        self.indices = {c:i for i,c in enumerate(codigos)}
+        self.inicios = inicios
+        self.vecinos = vecinos
+        self.pesos = pesos
+        self.medios = medios
+
+    def cantidad_aristas(self):
+        """Devuelve la cantidad de aristas hacia arriba (originales y atajos)."""
+        return len(self.vecinos)
+
+    def _medio(self,u,w):
+        """Devuelve el vértice del medio de la arista u-w del grafo hacia arriba."""
+
+        for a,b in ((u,w),(w,u)):
+            desde,hasta = self.inicios[a],self.inicios[a + 1]
+            pos = bisect_left(self.vecinos,b,desde,hasta)
+            if pos < hasta and self.vecinos[pos] == b:
+                return self.medios[pos]
+        raise ValueError(f"No hay arista entre {self.codigos[u]} y {self.codigos[w]}.")
+
+    def _desarmar(self,u,w,camino):
+        """Agrega a 'camino' los vértices de la arista u-w sin atajos, sin incluir a 'u'."""
+
+        pila = [(u,w)]
+        while pila:
+            a,b = pila.pop()
+            medio = self._medio(a,b)
+            if medio == SIN_MEDIO:
+                camino.append(b)
+            else:
+                pila.append((medio,b))
+                pila.append((a,medio))
+
+    def camino(self,origenes,destinos):
+        """Camino mínimo entre un conjunto de aeropuertos de origen y uno de
+        destino. Devuelve (camino, distancia), con el camino como lista de
+        aeropuertos, o (None, None) si no hay camino."""
+
+        inicios,vecinos,pesos = self.inicios,self.vecinos,self.pesos
+        dist = ({},{})
+        padre = ({},{})
+        heaps = ([],[])
+        for lado,fuentes in enumerate((origenes,destinos)):
+            for codigo in fuentes:
+                v = self.indices[codigo]
+                dist[lado][v] = 0
+                padre[lado][v] = None
+                heaps[lado].append((0,v))
+
+        mejor = float('inf')
+        encuentro = None
+        infinito = float('inf')
+        while True:
+            # Se avanza por el lado de menor radio; cuando ninguno de los dos
+            # puede mejorar el encuentro, el camino es el mínimo.
+            radio_ida = heaps[0][0][0] if heaps[0] else infinito
+            radio_vuelta = heaps[1][0][0] if heaps[1] else infinito
+            if min(radio_ida,radio_vuelta) >= mejor:
+                break
+            lado = 0 if radio_ida <= radio_vuelta else 1
+            distancia,v = heappop(heaps[lado])
+            if distancia > dist[lado][v]: continue
+            if v in dist[1 - lado] and distancia + dist[1 - lado][v] < mejor:
+                mejor = distancia + dist[1 - lado][v]
+                encuentro = v
+            for j in range(inicios[v],inicios[v + 1]):
+                w = vecinos[j]
+                if distancia + pesos[j] < dist[lado].get(w,float('inf')):
+                    dist[lado][w] = distancia + pesos[j]
+                    padre[lado][w] = v
+                    heappush(heaps[lado],(dist[lado][w],w))
+
+        if encuentro is None:
+            return None,None
+
+        subida = [encuentro]
+        while padre[0][subida[-1]] is not None:
+            subida.append(padre[0][subida[-1]])
+        subida.reverse()
+        bajada = [encuentro]
+        while padre[1][bajada[-1]] is not None:
+            bajada.append(padre[1][bajada[-1]])
+
+        camino = [subida[0]]
+        for u,w in zip(subida,subida[1:]):
+            self._desarmar(u,w,camino)
+        for u,w in zip(bajada,bajada[1:]):
+            self._desarmar(u,w,camino)
+        return [self.codigos[v] for v in camino],mejor
@@ -1,15 +1,36 @@
 #!/usr/bin/python3
-from grafo import Grafo
+from grafo import GrafoMultipeso
+from cache import CacheCaminos
+from snapshot import cargar_o_compilar
+from carga import leer_red
+from servidor import Servidor
+import instrumentacion
+import oraculo as oraculo_hubs
+import contraccion
+import matricial
 from biblioteca import _vacaciones
 from biblioteca import centralidad_aproximada
+from biblioteca import centralidad_aproximada_lotes
+from biblioteca import TablasAlias
 from biblioteca import centralidad_betweeness
-from biblioteca import prim
+from biblioteca import centralidad_muestreada
+from biblioteca import pagerank
+from biblioteca import kruskal
 from biblioteca import bfs
-from biblioteca import dijkstra
+from biblioteca import BusquedaDijkstra
+from biblioteca import dijkstra_bidireccional
+from biblioteca import bfs_bidireccional
+from biblioteca import calcular_landmarks
+from biblioteca import heuristica_alt
+from biblioteca import astar
 from random import choice
-from sys import stdin
-from sys import argv
+from itertools import islice
+from sys import stdin, stderr
+import argparse
+import asyncio
+import heapq
 import operator
+import time
 
                     ########################
                     #                      #
@@ -19,6 +40,11 @@ import operator
 
 
 CANT_CAMINOS_CENT_APROX = 100
+TAM_CACHE_CAMINOS = 64
+CANT_LANDMARKS = 8
+EPSILON_CENT_APROX = 0.05
+CONFIANZA_CENT_APROX = 0.9
+SEMILLA_CENT_APROX = 0
 LARGO_CAMINOS_CENT_APROX = 100
 LISTAR_OPS = "listar_operaciones"
 CAMINO = "camino_mas"
@@ -27,7 +53,14 @@ VACACIONES = "vacaciones"
 NUEVA_AEROLINEA = "nueva_aerolinea"
 CENT_TOTAL = "centralidad"
 CENT_APROX = "centralidad_aprox"
+ESTADISTICAS_CACHE = "estadisticas_cache"
+AGREGAR_VUELO = "agregar_vuelo"
+CANCELAR_VUELO = "cancelar_vuelo"
+CAMBIAR_PRECIO = "cambiar_precio"
 COMANDOS = [CAMINO,ESCALAS,CENT_TOTAL,CENT_APROX,NUEVA_AEROLINEA,VACACIONES]
+COMANDOS_VUELOS = [AGREGAR_VUELO,CANCELAR_VUELO,CAMBIAR_PRECIO] # Como estadisticas_cache, no salen en listar_operaciones
+COMANDOS_PESADOS = [CENT_TOTAL,CENT_APROX,NUEVA_AEROLINEA,VACACIONES] # En modo servidor van al pool de procesos
+PROCESOS_SERVIDOR = 2
 ESPACIO = ' '
 COMA = ','
 OP1 = "barato"
@@ -37,62 +70,122 @@ MODO_ESCRITURA = "w"
 FLECHA = " -> "
 ERROR_VACACIONES = "No se encontro recorrido"
 COMA2 = ", "
+TIEMPO = "tiempo"
+PRECIO = "precio"
+FRECUENCIA = "frecuencia"
+FRECUENCIA_INV = "frecuencia_inv"
+SALTOS = "saltos"
+CENTRALIDAD = "centralidad" # Tipo de las centralidades guardadas en la cache, por comando y modo
+LANDMARKS = "landmarks"
+ALIAS = "alias"
+MATRIZ = "matriz"
+MODO_DIJKSTRA = "dijkstra"
+MODO_BFS = "bfs"
+MODO_BIDIRECCIONAL = "bidireccional"
+MODO_ALT = "alt"
+MODO_CH = "ch"
+MODO_CAMINOS = "caminos"
+MODO_PIVOTES = "pivotes"
+MODO_LOTES = "lotes"
+MODO_PAGERANK = "pagerank"
+LOTE = "lote" # Nombre con el que la instrumentación registra cada grupo de consultas del modo por lotes
+LECTOR_LINEAS = "lineas"
+LECTOR_BLOQUES = "bloques"
+ATRIBUTOS = {TIEMPO:'l',PRECIO:'l',FRECUENCIA:'l'}
+
+def _inversa(valor):
+    return 1/valor
+
+# Sólo centralidad usa la frecuencia inversa: se arma recién cuando la pide (ver GrafoMultipeso)
+DERIVADOS = {FRECUENCIA_INV:('d',FRECUENCIA,_inversa)}
+COLUMNAS_VUELOS = {TIEMPO:('l',2,int),PRECIO:('l',3,int),FRECUENCIA:('l',4,int)}
 
 def listar_op():
     """Imprime en O(1) la lista de operaciones disponibles."""
     for i in range(len(COMANDOS)):
         print(COMANDOS[i])
 
-def imprimir_centralidad(centralidad,n):
-    respuestas = []
-    for i in range(n):
-        maximo = max(centralidad.items(),key=operator.itemgetter(1))
-        centralidad.pop(maximo[0])
-        respuestas.append(maximo[0])
-    print((COMA2).join(respuestas))
-
-def centrality_aprox(grafo,n):
-    centralidad = centralidad_aproximada(grafo,CANT_CAMINOS_CENT_APROX,LARGO_CAMINOS_CENT_APROX)
-    imprimir_centralidad(centralidad,n)
-
-def centrality_total(grafo,n):
-    centralidad = centralidad_betweeness(grafo)
-    imprimir_centralidad(centralidad,n)
-
-def new_aerolinea(grafo1,grafo2,grafo3,ruta_archivo):
-   mst = prim(grafo2)
-   escribir_archivo(grafo1,grafo2,grafo3,mst,ruta_archivo)
+def imprimir_centralidad(centralidad,n,ruta_ranking=None):
+    """Imprime los n vértices más centrales sin modificar 'centralidad' (que
+    puede estar en la cache). A igual centralidad sale primero el que aparece
+    antes en el diccionario. Si se indica 'ruta_ranking', escribe además el
+    ranking completo en ese archivo. Opera en O(|V|*log(n))."""
+    mayores = heapq.nlargest(n,centralidad.items(),key=operator.itemgetter(1))
+    print((COMA2).join(v for v,_ in mayores))
+    if ruta_ranking is not None:
+        escribir_ranking(centralidad,ruta_ranking)
+
+def escribir_ranking(centralidad,ruta_archivo):
+    """Escribe todos los vértices, de mayor a menor centralidad, como líneas 'codigo,centralidad'."""
+    ranking = sorted(centralidad.items(),key=operator.itemgetter(1),reverse=True)
+    with open(ruta_archivo,MODO_ESCRITURA) as f:
+        f.write("".join(f"{v},{valor}\n" for v,valor in ranking))
+
+def calcular_centralidad_aprox(grafo,cache,modo,argumentos):
+    if modo == MODO_PIVOTES:
+        return centralidad_muestreada(grafo,argumentos.epsilon,argumentos.confianza,argumentos.semilla,
+                                      FRECUENCIA_INV,argumentos.workers)
+    if modo == MODO_PAGERANK:
+        return calcular_pagerank(grafo,cache)
+    tablas = cache.obtener_global(grafo,FRECUENCIA,ALIAS,lambda: TablasAlias(grafo,FRECUENCIA))
+    if modo == MODO_CAMINOS:
+        return centralidad_aproximada(grafo,CANT_CAMINOS_CENT_APROX,LARGO_CAMINOS_CENT_APROX,FRECUENCIA,tablas)
+    return centralidad_aproximada_lotes(grafo,CANT_CAMINOS_CENT_APROX,LARGO_CAMINOS_CENT_APROX,FRECUENCIA,tablas)
+
+def calcular_pagerank(grafo,cache):
+    """PageRank con la frecuencia como peso: el límite de los recorridos
+    aleatorios de centralidad_aprox. Con NumPy se calcula sobre la matriz
+    de adyacencia (guardada en la cache); si no, con la versión de biblioteca."""
+    if not matricial.DISPONIBLE:
+        return pagerank(grafo,FRECUENCIA)
+    matriz = cache.obtener_global(grafo,FRECUENCIA,MATRIZ,lambda: matricial.MatrizAdyacencia.desde_grafo(grafo,FRECUENCIA))
+    return matriz.a_diccionario(matricial.pagerank(matriz))
+
+def centrality_aprox(grafo,n,cache,modo=MODO_CAMINOS,argumentos=None):
+    if modo not in (MODO_CAMINOS,MODO_LOTES,MODO_PIVOTES,MODO_PAGERANK):
+        return
+    centralidad = cache.obtener_global(grafo,CENTRALIDAD,modo,lambda: calcular_centralidad_aprox(grafo,cache,modo,argumentos))
+    imprimir_centralidad(centralidad,n,None if argumentos is None else argumentos.ranking)
+
+def centrality_total(grafo,n,cache,trabajadores=1,ruta_ranking=None):
+    centralidad = cache.obtener_global(grafo,CENTRALIDAD,CENT_TOTAL,lambda: centralidad_betweeness(grafo,FRECUENCIA_INV,trabajadores))
+    imprimir_centralidad(centralidad,n,ruta_ranking)
+
+def new_aerolinea(grafo,ruta_archivo):
+   bosque = kruskal(grafo,PRECIO)
+   escribir_archivo(grafo,bosque,ruta_archivo)
    print("OK")
 
-def escribir_archivo(grafo1,grafo2,grafo3,mst,ruta_archivo):
+def escribir_archivo(grafo,aristas,ruta_archivo):
     """Exporta un archivo con todas las rutas necesarias para crear una nueva aerolinea
-    que se pueda comunicar con todos los aeropuertos."""
-    aristas = mst.ver_aristas()
+    que se pueda comunicar con todos los aeropuertos. Las líneas se arman en
+    memoria y se escriben de una sola vez."""
+    lineas = []
+    for (v,w),_ in aristas:
+        pesos = grafo.ver_pesos(v,w)
+        lineas.append(f"{v},{w},{pesos[TIEMPO]},{pesos[PRECIO]},{pesos[FRECUENCIA]}\n")
     with open(ruta_archivo,MODO_ESCRITURA) as f:
-        for i in range(len(aristas)):
-            linea = f"{aristas[i][0][0]},{aristas[i][0][1]},{grafo1.ver_peso(aristas[i][0][0],aristas[i][0][1])},{grafo2.ver_peso(aristas[i][0][0],aristas[i][0][1])},{grafo3.ver_peso(aristas[i][0][0],aristas[i][0][1])}"
-            f.write(linea+"\n")
+        f.write("".join(lineas))
+
+def pesos_vuelo(tiempo,precio,frecuencia):
+    """Devuelve el diccionario de pesos de un vuelo. Los atributos derivados (DERIVADOS) los calcula el grafo."""
+    return {TIEMPO:tiempo,PRECIO:precio,FRECUENCIA:frecuencia}
 
 def leer_archivo(aeropuertos,vuelos):
-    """Lee el archivo de aeropuertos y vuelos, y crea los grafos y estructuras necesarias para que funcione el programa."""
-    data = []
+    """Lee el archivo de aeropuertos y vuelos, y crea el grafo y estructuras necesarias para que funcione el programa.
+    Un único grafo multipeso guarda tiempo, precio y frecuencia de cada vuelo; la frecuencia inversa
+    se calcula la primera vez que se usa."""
     cities = {} #Diccionario donde me guardo como clave una ciudad y como valor una lista con los aeropuertos
     flights = {} #Diccionario donde me guardo como clave un aeropuerto y com valor la ciudad a la que pertenece
 
-    grafo_tiempo = Grafo()
-    grafo_precio = Grafo()
-    grafo_freq = Grafo()
-    grafo_freq2 = Grafo()
+    grafo = GrafoMultipeso(ATRIBUTOS,DERIVADOS)
 
     with open(aeropuertos,MODO_LECTURA) as file1:
         for linea in file1:
 
             linea = (linea.rstrip()).split(COMA)
 
-            grafo_tiempo.agregar_vertice(linea[1])
-            grafo_precio.agregar_vertice(linea[1])
-            grafo_freq.agregar_vertice(linea[1])
-            grafo_freq2.agregar_vertice(linea[1])
+            grafo.agregar_vertice(linea[1])
 
             if linea[0] not in cities:
                 cities[linea[0]] = [linea[1]]
@@ -106,141 +199,452 @@ def leer_archivo(aeropuertos,vuelos):
 
             linea = (linea.rstrip()).split(COMA)
 
-            grafo_tiempo.agregar_arista(linea[0],linea[1],int(linea[2]))
-            grafo_precio.agregar_arista(linea[0],linea[1],int(linea[3]))
-            grafo_freq.agregar_arista(linea[0],linea[1],int(linea[4]))
-            grafo_freq2.agregar_arista(linea[0],linea[1],1/int(linea[4]))
+            grafo.agregar_arista(linea[0],linea[1],pesos_vuelo(int(linea[2]),int(linea[3]),int(linea[4])))
 
 
-    return grafo_tiempo, grafo_precio, grafo_freq, grafo_freq2, cities, flights
+    return grafo, cities, flights
 
-def vacaciones(grafo,cities,origen,n):
+def vacaciones(grafo,cities,origen,n,cache,limite=None):
     if n < 1 or (origen not in cities):
         print(ERROR_VACACIONES)
         return
 
+    vencimiento = None if limite is None else time.perf_counter() + limite
+    mejor = []
     for aerop in cities[origen]:
-        visitados = set()
-        rta = _vacaciones(grafo,n - 1,aerop,[],aerop,visitados)
-        if len(rta) == 0:
-            continue
-        else:
+        saltos = arbol_escalas(grafo,aerop,cache)[1]
+        rta,parcial = _vacaciones(grafo,n - 1,aerop,saltos,vencimiento)
+        if len(rta) != 0:
+            print(FLECHA.join([aerop]+rta+[aerop]))
+            return
+        if len(parcial) + 1 > len(mejor):
+            mejor = [aerop]+parcial
+        if vencimiento is not None and time.perf_counter() > vencimiento:
             break
 
-    if len(rta) == 0:
-        print(ERROR_VACACIONES)
-    else:
-        print(FLECHA.join([aerop]+rta+[aerop]))
+    print(ERROR_VACACIONES)
+    if vencimiento is not None and time.perf_counter() > vencimiento:
+        print(f"Tiempo agotado, mejor recorrido parcial: {FLECHA.join(mejor)}", file=stderr)
     return
 
-def imprimir_camino(padres,min_indice,min_ciudad,distancias):
-    """Imprime, dado el diccionario de padres y distancias, la respuesta al camino deseado."""
-    padre = padres[min_indice]
-    distancia = distancias[min_indice]
-
-    rta = [min_ciudad]
+def formatear_camino(padre,llegada):
+    """Devuelve, dado el diccionario de padres, el camino desde la raíz del árbol hasta 'llegada'."""
+    rta = [llegada]
 
-    prox = min_ciudad
-    while prox != None:
-        rta.append(padre[prox])
+    prox = llegada
+    while padre[prox] != None:
         prox = padre[prox]
-    if rta[-1] == None: rta.pop()
+        rta.append(prox)
 
-    print(FLECHA.join(rta[::-1]))
+    return FLECHA.join(rta[::-1])
 
-def camino_escalas(grafo,ciudad_origen,ciudad_destino,cities,flights):
-    padres = []
-    ordenes = []
-    primer_interceptado = []
+def imprimir_camino(padre,llegada):
+    """Imprime, dado el diccionario de padres, el camino desde la raíz del árbol hasta 'llegada'."""
+    print(formatear_camino(padre,llegada))
 
-    for aeropuerto in cities[ciudad_origen]:
+def arbol_escalas(grafo,aeropuerto,cache):
+    """Devuelve el árbol bfs (padres, orden) desde el aeropuerto, usando la cache."""
+    return cache.obtener(grafo,SALTOS,aeropuerto,lambda: bfs(grafo,aeropuerto)[1:])
 
-        w,padre,orden = bfs(grafo,aeropuerto,cities[ciudad_destino])
+def busqueda_mas(grafo,origenes,peso,cache):
+    """Devuelve la búsqueda de Dijkstra (retomable) desde el conjunto de aeropuertos de origen
+    según el peso indicado, usando la cache. La entrada se guarda con la tupla 'origenes'
+    como fuente: una búsqueda por ciudad, no un árbol por aeropuerto."""
+    return cache.obtener(grafo,peso,origenes,lambda: BusquedaDijkstra(grafo,origenes,peso))
 
-        primer_interceptado.append(w)
-        padres.append(padre)
-        ordenes.append(orden)
+def camino_escalas(grafo,ciudad_origen,ciudad_destino,cities,flights,cache,modo=MODO_BFS):
+    if modo == MODO_BIDIRECCIONAL:
+        camino = bfs_bidireccional(grafo,cities[ciudad_origen],cities[ciudad_destino])
+        if camino is not None:
+            print(FLECHA.join(camino))
+        return
 
-    contador = 0
-    min_indice = 0
-    min = float('inf')
-    for interceptado in primer_interceptado:
-        if int(ordenes[contador][interceptado]) < min:
-            min = int(ordenes[contador][interceptado])
-            min_indice = contador
-        contador += 1
+    mejor = mejor_escalas([arbol_escalas(grafo,aeropuerto,cache) for aeropuerto in cities[ciudad_origen]],
+                          cities[ciudad_destino])
+    if mejor is not None:
+        imprimir_camino(*mejor)
+
+def mejor_escalas(arboles,llegadas):
+    """Devuelve (padre, llegada) para el aeropuerto de 'llegadas' con menos escalas
+    según alguno de los árboles bfs (padres, orden), o None si ninguno lo alcanza."""
+    mejor = None
+
+    for padre,orden in arboles:
+        for llegada in llegadas:
+            if llegada in orden and (mejor is None or orden[llegada] < mejor[0]):
+                mejor = (orden[llegada],padre,llegada)
+
+    return None if mejor is None else mejor[1:]
+
+def camino_oraculo(oraculo,salida,llegada,peso):
+    """Si el oráculo de hubs tiene el camino entre las dos ciudades, devuelve
+    (True, camino formateado o None si no hay camino); si no, (False, None)."""
+    if oraculo is None or not oraculo.cubre(peso,salida,llegada):
+        return False,None
+    camino,distancia = oraculo.camino(peso,salida,llegada)
+    return True,(None if camino is None else FLECHA.join(camino))
+
+def camino_mas(cities,grafo,salida,llegada,peso,cache,modo=MODO_DIJKSTRA,oraculo=None,jerarquias=None):
+    if modo == MODO_CH and jerarquias is not None and peso in jerarquias:
+        camino,distancia = jerarquias[peso].camino(cities[salida],cities[llegada])
+        if camino is not None:
+            print(FLECHA.join(camino))
+        return
 
-    llegada = primer_interceptado[min_indice]
+    if modo == MODO_BIDIRECCIONAL:
+        camino,distancia = dijkstra_bidireccional(grafo,cities[salida],cities[llegada],peso)
+        if camino is not None:
+            print(FLECHA.join(camino))
+        return
 
-    imprimir_camino(padres,min_indice,llegada,ordenes)
+    if modo == MODO_ALT:
+        landmarks = cache.obtener_global(grafo,peso,LANDMARKS,lambda: calcular_landmarks(grafo,CANT_LANDMARKS,peso))
+        destino,padre,distancia = astar(grafo,cities[salida],cities[llegada],heuristica_alt(landmarks,cities[llegada]),peso)
+        if destino is not None:
+            imprimir_camino(padre,destino)
+        return
 
-def camino_mas(cities,grafo,salida,llegada):
-    padres = []
-    distancias = []
+    cubierto,camino = camino_oraculo(oraculo,salida,llegada,peso)
+    if cubierto:
+        if camino is not None:
+            print(camino)
+        return
 
-    for aeropuerto in cities[salida]:
-        padre,distancia,distancia_a_ciudad = dijkstra(grafo,aeropuerto,cities[llegada])
-        padres.append(padre)
-        distancias.append(distancia)
+    busqueda = busqueda_mas(grafo,tuple(cities[salida]),peso,cache)
+    destino = busqueda.avanzar(cities[llegada])
+
+    if destino is not None:
+        imprimir_camino(busqueda.padre,destino)
+
+def grafo_modificable(grafo,cache):
+    """Devuelve un grafo que admite cambios: si el cargado es compacto (GrafoCSR),
+    lo convierte a GrafoMultipeso y vacía la cache, que apuntaba al anterior."""
+    if isinstance(grafo,GrafoMultipeso):
+        return grafo
+    cache.limpiar()
+    return GrafoMultipeso.desde_csr(grafo)
+
+def _peso(pesos,atributo):
+    return None if pesos is None else pesos[atributo]
+
+def reparar_entrada(tipo,fuente,resultado,x,y,anteriores,nuevos):
+    """Lleva una entrada de la cache al grafo con la arista x-y cambiada de 'anteriores'
+    a 'nuevos' (diccionarios de pesos, None si la arista no existe). Devuelve None si
+    hay que descartarla."""
+    if tipo == SALTOS:
+        if (anteriores is None) == (nuevos is None):
+            return resultado
+        padre,orden = resultado
+        if nuevos is None:
+            return None if padre.get(y) == x or padre.get(x) == y else resultado
+        if (x in orden) != (y in orden) or (x in orden and abs(orden[x] - orden[y]) > 1):
+            return None
+        return resultado
+
+    if tipo == CENTRALIDAD:
+        return None
+
+    anterior,nuevo = _peso(anteriores,tipo),_peso(nuevos,tipo)
+    if anterior == nuevo:
+        return resultado
+    if fuente in (LANDMARKS,ALIAS,MATRIZ):
+        return None
+    resultado.actualizar_arista(x,y,anterior,nuevo)
+    return resultado
+
+def modificar_vuelo(grafo,cache,origen,destino,cambiar):
+    """Aplica 'cambiar()' (que modifica la arista origen-destino y devuelve si pudo) y
+    repara las búsquedas guardadas en la cache en lugar de descartarlas. Devuelve
+    True si el grafo cambió."""
+    version = grafo.version
+    anteriores = grafo.ver_pesos(origen,destino)
+    if not cambiar():
+        return False
+    nuevos = grafo.ver_pesos(origen,destino)
+    cache.reparar(grafo,version,lambda tipo,fuente,resultado: reparar_entrada(tipo,fuente,resultado,origen,destino,anteriores,nuevos))
+    print("OK")
+    return True
+
+def estadisticas_cache(cache):
+    """Imprime las estadísticas de uso de la cache de caminos."""
+    print(COMA2.join(f"{clave}: {valor}" for clave,valor in cache.estadisticas().items()))
+
+def informe_vistas(grafo):
+    """Imprime por stderr qué atributos derivados se llegaron a armar en la
+    sesión (y cuánto tardó cada uno) y cuáles no hizo falta armar."""
+    armados = [f"{atributo} ({segundos:.3f}s)" for atributo,segundos in grafo.materializados]
+    pendientes = [atributo for atributo in grafo.derivados if atributo not in grafo.atributos]
+    print(f"Vistas materializadas: {COMA2.join(armados) or 'ninguna'}; "
+          f"sin materializar: {COMA2.join(pendientes) or 'ninguna'}", file=stderr)
+
+def validar_jerarquias(estado,cantidad,semilla):
+    """Compara las jerarquías de contracción con la búsqueda de camino_mas e
+    imprime, por peso, los pares probados y los que no coinciden."""
+    for peso,(pares,errores) in contraccion.validar(estado.grafo,estado.cities,estado.jerarquias,cantidad,semilla).items():
+        print(f"{peso}: {pares} pares, {errores} errores")
+
+def parsear_argumentos():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Consultas sobre la red de vuelos. Los comandos se leen por entrada estándar.")
+    parser.add_argument("aeropuertos",help="archivo csv de aeropuertos (ciudad,codigo,latitud,longitud)")
+    parser.add_argument("vuelos",help="archivo csv de vuelos (origen,destino,tiempo,precio,cant_vuelos)")
+    parser.add_argument("--workers",type=int,default=1,metavar="N",
+                        help="cantidad de procesos para calcular centralidad (por defecto 1)")
+    parser.add_argument("--epsilon",type=float,default=EPSILON_CENT_APROX,
+                        help="error máximo de centralidad_aprox con pivotes, sobre la centralidad normalizada")
+    parser.add_argument("--confianza",type=float,default=CONFIANZA_CENT_APROX,
+                        help="probabilidad con la que centralidad_aprox con pivotes respeta el error")
+    parser.add_argument("--semilla",type=int,default=SEMILLA_CENT_APROX,
+                        help="semilla para elegir los pivotes de centralidad_aprox")
+    parser.add_argument("--ranking",metavar="RUTA",
+                        help="escribir en RUTA el ranking completo de cada comando de centralidad")
+    parser.add_argument("--lector",choices=[LECTOR_LINEAS,LECTOR_BLOQUES],default=LECTOR_LINEAS,
+                        help="cómo leer los csv: línea por línea en un grafo modificable, o por bloques en un grafo compacto")
+    parser.add_argument("--lote",type=int,default=0,metavar="N",
+                        help="leer los comandos de a N líneas y responder juntas las consultas con la misma ciudad de origen")
+    parser.add_argument("--servidor",metavar="HOST:PUERTO",
+                        help="en lugar de leer la entrada estándar, atender clientes por TCP con el mismo protocolo")
+    parser.add_argument("--unix",metavar="RUTA",
+                        help="en lugar de leer la entrada estándar, atender clientes por un socket Unix")
+    parser.add_argument("--procesos",type=int,default=PROCESOS_SERVIDOR,metavar="N",
+                        help="procesos para los comandos pesados en modo servidor (por defecto %(default)s)")
+    parser.add_argument("--oraculo",metavar="RUTA",
+                        help="tabla precalculada de caminos entre hubs para camino_mas; se genera si no existe o si los csv cambiaron")
+    parser.add_argument("--hubs",type=int,default=oraculo_hubs.CANTIDAD_HUBS,metavar="N",
+                        help="cantidad de ciudades hub del oráculo (por defecto %(default)s)")
+    parser.add_argument("--snapshot",metavar="RUTA",
+                        help="snapshot binario de los csv: se carga mapeado en memoria y se regenera si los csv cambiaron")
+    parser.add_argument("--limite-vacaciones",type=float,metavar="SEGUNDOS",
+                        help="tiempo máximo de búsqueda de vacaciones; al agotarse se informa el mejor recorrido parcial por stderr")
+    parser.add_argument("--instrumentar",metavar="RUTA",
+                        help="registrar tiempo, vértices expandidos, aristas, operaciones de heap y cache de cada comando, "
+                             f"como líneas JSON en RUTA o por stderr si es '{instrumentacion.SALIDA_ERROR}' "
+                             f"(también con la variable {instrumentacion.VARIABLE_ENTORNO})")
+    parser.add_argument("--perfil",choices=instrumentacion.PERFILES,
+                        help=f"correr cada comando instrumentado bajo cProfile o tracemalloc (también con {instrumentacion.VARIABLE_PERFIL})")
+    parser.add_argument("--perfilar",metavar="COMANDO",action="append",
+                        help="aplicar --perfil sólo a este comando (se puede repetir)")
+    parser.add_argument("--informe-vistas",action="store_true",
+                        help="al terminar, informar por stderr qué pesos derivados (frecuencia inversa) se llegaron a calcular")
+    parser.add_argument("--ch",action="store_true",
+                        help="cargar (o generar, al lado del csv de vuelos) las jerarquías de contracción para camino_mas con modo ch")
+    parser.add_argument("--validar-ch",type=int,default=0,metavar="N",
+                        help="comparar las jerarquías de contracción con camino_mas en N pares de ciudades al azar y salir")
+    return parser.parse_args()
+
+class Estado:
+    """Lo que comparten todos los comandos: la red cargada, la cache de caminos
+    y los argumentos del programa. El grafo puede cambiar de objeto (ver
+    grafo_modificable), por eso los comandos lo toman siempre de acá."""
+
+    def __init__(self,grafo,cities,flights,cache,argumentos,oraculo=None,jerarquias=None,instrumentacion=None):
+        self.grafo = grafo
+        self.cities = cities
+        self.flights = flights
+        self.cache = cache
+        self.argumentos = argumentos
+        self.oraculo = oraculo # Deja de valer (None) en cuanto cambia algún vuelo
+        self.jerarquias = jerarquias # {peso: JerarquiaContraccion}, también None al cambiar un vuelo
+        self.instrumentacion = instrumentacion # None si está apagada
+
+def ejecutar_comando(estado,line):
+    """Ejecuta una línea de comando e imprime su respuesta. Con la
+    instrumentación activa, registra además lo que costó."""
+    if estado.instrumentacion is None:
+        _ejecutar_comando(estado,line)
+    else:
+        estado.instrumentacion.medir(line,lambda: _ejecutar_comando(estado,line),estado.cache)
 
-    contador = 0
-    min_ciudad = 0
-    min = float('inf')
-    for ciudad in distancia_a_ciudad:
-        if int(distancia_a_ciudad[ciudad]) < min:
-            min = int(distancia_a_ciudad[ciudad])
-            min_ciudad = ciudad
+def _ejecutar_comando(estado,line):
+    grafo,cities,flights,cache,argumentos = estado.grafo,estado.cities,estado.flights,estado.cache,estado.argumentos
+    line = (line.rstrip()).split(ESPACIO)
+    determinante = line[0]
 
-    min_indice = 0
+    if determinante == LISTAR_OPS:
+        listar_op()
+        return
 
-    for diccionario in distancias:
-        if int(diccionario[min_ciudad]) == min:
-            min_indice = contador
-            break
-        contador += 1
+    if determinante == ESTADISTICAS_CACHE:
+        estadisticas_cache(cache)
+        return
 
-    imprimir_camino(padres,min_indice,min_ciudad,distancias)
+    if determinante == NUEVA_AEROLINEA:
+        new_aerolinea(grafo,line[1])
+        return
 
-def main():
-    """Funcion principal del programa. Recibe los grafos. Es el esqueleto del resto de funciones que son llamadas dentro de esta."""
-    aeropuertos = argv[1]
-    vuelos = argv[2]
-    grafo_tiempo, grafo_precio, grafo_freq, grafo_freq2,cities, flights = leer_archivo(aeropuertos,vuelos)
-    for line in stdin:
-        line = (line.rstrip()).split(ESPACIO)
-        determinante = line[0]
-
-        if determinante == LISTAR_OPS:
-            listar_op()
-            continue
+    info = (ESPACIO.join(line[1::])).split(COMA)
+
+    if determinante in COMANDOS_VUELOS:
+        if len(info) < 2 or info[0] not in flights or info[1] not in flights: return
+        if not all(dato.isdigit() for dato in info[2:]): return
+        origen,destino = info[0],info[1]
+        cambiado = False
+        if determinante == AGREGAR_VUELO and len(info) == 5 and int(info[4]) > 0:
+            grafo = estado.grafo = grafo_modificable(grafo,cache)
+            pesos = pesos_vuelo(int(info[2]),int(info[3]),int(info[4]))
+            cambiado = modificar_vuelo(grafo,cache,origen,destino,lambda: grafo.agregar_arista(origen,destino,pesos))
+        elif determinante == CANCELAR_VUELO and len(info) == 2:
+            grafo = estado.grafo = grafo_modificable(grafo,cache)
+            cambiado = modificar_vuelo(grafo,cache,origen,destino,lambda: grafo.remover_arista(origen,destino))
+        elif determinante == CAMBIAR_PRECIO and len(info) == 3:
+            grafo = estado.grafo = grafo_modificable(grafo,cache)
+            cambiado = modificar_vuelo(grafo,cache,origen,destino,lambda: grafo.cambiar_peso(origen,destino,int(info[2]),PRECIO))
+        if cambiado: # El oráculo y las jerarquías se armaron con la red anterior
+            estado.oraculo = estado.jerarquias = None
+        return
 
-        if determinante == NUEVA_AEROLINEA:
-            new_aerolinea(grafo_tiempo,grafo_precio,grafo_freq,line[1])
-            continue
+    if determinante == CAMINO:
+        if (len(info) not in (3,4)): return
+        modo = info[3] if len(info) == 4 else MODO_DIJKSTRA
+        if info[0] == OP1: camino_mas(cities,grafo,info[1],info[2],PRECIO,cache,modo,estado.oraculo,estado.jerarquias)
+        elif info[0] == OP2: camino_mas(cities,grafo,info[1],info[2],TIEMPO,cache,modo,estado.oraculo,estado.jerarquias)
+        return
 
-        info = (ESPACIO.join(line[1::])).split(COMA)
+    elif determinante == ESCALAS:
+        if len(info) not in (2,3): return
+        modo = info[2] if len(info) == 3 else MODO_BFS
+        camino_escalas(grafo,info[0],info[1],cities,flights,cache,modo)
 
-        if determinante == CAMINO:
-            if (len(info) != 3): continue
-            if info[0] == OP1: camino_mas(cities,grafo_precio,info[1],info[2])
-            elif info[0] == OP2: camino_mas(cities,grafo_tiempo,info[1],info[2])
-            continue
+    elif determinante == VACACIONES:
+        if (len(info) != 2 or not info[-1].isdigit()): return
+        vacaciones(grafo,cities,info[0],int(info[1]),cache,argumentos.limite_vacaciones)
 
-        elif determinante == ESCALAS:
-            if len(info) != 2: continue
-            camino_escalas(grafo_tiempo,info[0],info[1],cities,flights)
+    if determinante == CENT_APROX:
+        if (len(info) not in (1,2) or not info[0].isdigit()): return
+        modo = info[1] if len(info) == 2 else MODO_CAMINOS
+        centrality_aprox(grafo,int(info[0]),cache,modo,argumentos)
+        return
+
+    if (len(info) != 1 or not info[0].isdigit()): return
 
-        elif determinante == VACACIONES:
-            if (len(info) != 2 or not info[-1].isdigit()): continue
-            vacaciones(grafo_tiempo,cities,info[0],int(info[1]))
+    if determinante == CENT_TOTAL:
+        centrality_total(grafo,int(info[0]),cache,argumentos.workers,argumentos.ranking)
+        return
+
+def consulta_agrupable(estado,line):
+    """Si la línea es una consulta que se puede responder desde un árbol de una
+    sola fuente (camino_mas con dijkstra o camino_escalas con bfs), devuelve
+    ((comando, peso, ciudad_origen), ciudad_destino). Si no, devuelve None."""
+    line = (line.rstrip()).split(ESPACIO)
+    info = (ESPACIO.join(line[1::])).split(COMA)
+
+    if line[0] == CAMINO and len(info) in (3,4):
+        if len(info) == 4 and info[3] != MODO_DIJKSTRA: return None
+        peso = {OP1:PRECIO,OP2:TIEMPO}.get(info[0])
+        origen,destino = info[1],info[2]
+    elif line[0] == ESCALAS and len(info) in (2,3):
+        if len(info) == 3 and info[2] != MODO_BFS: return None
+        peso = SALTOS
+        origen,destino = info[0],info[1]
+    else:
+        return None
 
-        if (len(info) != 1 or not info[0].isdigit()): continue
+    if peso is None or origen not in estado.cities or destino not in estado.cities:
+        return None
+    return (line[0],peso,origen),destino
 
-        if determinante == CENT_TOTAL:
-            centrality_total(grafo_freq2,int(info[0]))
+def responder_grupo(estado,clave,destinos):
+    """Responde todas las consultas de un grupo con un único árbol desde la
+    ciudad de origen. Devuelve una respuesta por destino (None si no hay camino)."""
+    comando,peso,origen = clave
+    grafo,cities,cache = estado.grafo,estado.cities,estado.cache
+    respuestas = []
+
+    if comando == CAMINO:
+        busqueda = None
+        for destino in destinos:
+            cubierto,camino = camino_oraculo(estado.oraculo,origen,destino,peso)
+            if not cubierto:
+                if busqueda is None:
+                    busqueda = busqueda_mas(grafo,tuple(cities[origen]),peso,cache)
+                llegada = busqueda.avanzar(cities[destino])
+                camino = None if llegada is None else formatear_camino(busqueda.padre,llegada)
+            respuestas.append(camino)
+    else:
+        arboles = [arbol_escalas(grafo,aeropuerto,cache) for aeropuerto in cities[origen]]
+        for destino in destinos:
+            mejor = mejor_escalas(arboles,cities[destino])
+            respuestas.append(None if mejor is None else formatear_camino(*mejor))
+
+    return respuestas
+
+def procesar_lote(estado,lineas):
+    """Ejecuta un bloque de comandos agrupando las consultas por (comando, peso,
+    ciudad de origen): cada grupo se responde con una sola búsqueda. Las
+    respuestas salen en el mismo orden que las líneas; cualquier otro comando
+    corta el bloque, porque puede imprimir o cambiar el grafo."""
+    grupos = {} # (comando, peso, origen) -> [(posicion, destino), ...]
+    cantidad = 0
+
+    def responder_grupos():
+        respuestas = [None] * cantidad
+        for clave,consultas in grupos.items():
+            for (posicion,_),respuesta in zip(consultas,responder_grupo(estado,clave,[d for _,d in consultas])):
+                respuestas[posicion] = respuesta
+        grupos.clear()
+        for respuesta in respuestas:
+            if respuesta is not None:
+                print(respuesta)
+
+    def responder():
+        if cantidad and estado.instrumentacion is not None:
+            estado.instrumentacion.medir(f"{LOTE} {cantidad}",responder_grupos,estado.cache)
+        else:
+            responder_grupos()
+
+    for line in lineas:
+        consulta = consulta_agrupable(estado,line)
+        if consulta is None:
+            responder()
+            cantidad = 0
+            ejecutar_comando(estado,line)
             continue
+        clave,destino = consulta
+        grupos.setdefault(clave,[]).append((cantidad,destino))
+        cantidad += 1
+    responder()
+
+def main():
+    """Funcion principal del programa. Recibe los grafos. Es el esqueleto del resto de funciones que son llamadas dentro de esta."""
+    argumentos = parsear_argumentos()
+    if argumentos.snapshot:
+        grafo,cities,flights = cargar_o_compilar(argumentos.aeropuertos,argumentos.vuelos,argumentos.snapshot,COLUMNAS_VUELOS,DERIVADOS)
+    elif argumentos.lector == LECTOR_BLOQUES:
+        grafo,cities,flights = leer_red(argumentos.aeropuertos,argumentos.vuelos,COLUMNAS_VUELOS,derivados=DERIVADOS)
+    else:
+        grafo,cities, flights = leer_archivo(argumentos.aeropuertos,argumentos.vuelos)
+    estado = Estado(grafo,cities,flights,CacheCaminos(TAM_CACHE_CAMINOS),argumentos)
+    estado.instrumentacion = instrumentacion.desde_entorno(argumentos.instrumentar,argumentos.perfil,argumentos.perfilar)
+    if argumentos.oraculo:
+        estado.oraculo = oraculo_hubs.cargar_o_compilar(argumentos.aeropuertos,argumentos.vuelos,argumentos.oraculo,
+                                                        COLUMNAS_VUELOS,(PRECIO,TIEMPO),argumentos.hubs)
+    if argumentos.ch or argumentos.validar_ch:
+        estado.jerarquias = contraccion.cargar_o_compilar(argumentos.aeropuertos,argumentos.vuelos,
+                                                          contraccion.ruta_jerarquias(argumentos.vuelos),
+                                                          COLUMNAS_VUELOS,(PRECIO,TIEMPO))
+    if argumentos.validar_ch:
+        validar_jerarquias(estado,argumentos.validar_ch,argumentos.semilla)
+        return
 
-        elif determinante == CENT_APROX:
-            centrality_aprox(grafo_freq,int(info[0]))
+    if argumentos.servidor or argumentos.unix:
+        host,_,puerto = (argumentos.servidor or "").rpartition(":")
+        servidor = Servidor(estado,ejecutar_comando,COMANDOS_PESADOS,argumentos.procesos)
+        print(f"Escuchando en {argumentos.unix or argumentos.servidor}", file=stderr)
+        try:
+            asyncio.run(servidor.servir(host or None,int(puerto) if puerto else None,argumentos.unix))
+        except KeyboardInterrupt:
+            pass
+    elif argumentos.lote:
+        while True:
+            lineas = list(islice(stdin,argumentos.lote))
+            if not lineas:
+                break
+            procesar_lote(estado,lineas)
+    else:
+        for line in stdin:
+            ejecutar_comando(estado,line)
+    if argumentos.informe_vistas:
+        informe_vistas(estado.grafo)
 
-main()
+if __name__ == "__main__":
+    main()
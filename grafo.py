@@ -11,7 +11,23 @@
 #   adyacencias[x] = {... , {y:10} , ...}
 #
 
+import copy
+import time
 import random
+from collections import deque, Counter
+from array import array
+from bisect import bisect_left
+try:
+    import numpy as np
+except ImportError: # NumPy es opcional: sólo acelera GrafoCSR.desde_columnas
+    np = None
+
+
+def _arreglo(tipo,valores):
+    """Copia un arreglo de NumPy a un 'array' del tipo indicado."""
+    arreglo = array(tipo)
+    arreglo.frombytes(np.asarray(valores,dtype=np.dtype(tipo)).tobytes())
+    return arreglo
 
                     ########################
                     #                      #
@@ -22,7 +38,7 @@ import random
 class Cola:
 
     def __init__(self):
-        self.items = []
+        self.items = deque()
 
     def encolar(self,x):
         """Mete un elemento en la estructura. Opera en O(1)."""
@@ -35,7 +51,7 @@ class Cola:
 
         if self.esta_vacia():
             raise ValueError("La cola no tiene elementos.")
-        return self.items.pop(0)
+        return self.items.popleft()
 
     def esta_vacia(self):
         """Devuelve True si está vacía la cola, False en caso contrario;
@@ -49,6 +65,168 @@ class Cola:
     		raise ValueError("La cola no tiene elementos.")
     	return self.items[0]
 
+class HeapIndexado:
+
+    #
+    #   Heap binario de mínimos indexado por elemento: además del arreglo
+    #   del heap guarda la posición de cada elemento, lo que permite bajar
+    #   su prioridad (decrease-key) en O(log n) en lugar de encolarlo de
+    #   nuevo. Cada elemento aparece a lo sumo una vez, por lo que nunca
+    #   hay entradas viejas y el tamaño está acotado por |V|.
+    #
+    #   A igual prioridad, sale primero el menor elemento.
+    #
+
+    def __init__(self):
+        self.items = [] # Tuplas (prioridad, elemento)
+        self.posiciones = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self,x):
+        return x in self.posiciones
+
+    def esta_vacia(self):
+        """Devuelve True si está vacío el heap, False en caso contrario, en O(1)."""
+
+        return len(self.items) == 0
+
+    def ver_prioridad(self,x):
+        """Devuelve la prioridad con la que está encolado 'x', o None si no está."""
+
+        if x not in self.posiciones:
+            return None
+        return self.items[self.posiciones[x]][0]
+
+    def encolar(self,x,prioridad):
+        """Encola 'x' con la prioridad dada o, si ya estaba, le baja la
+        prioridad (si la nueva es menor). Devuelve True si encoló o actualizó,
+        False si 'x' ya estaba con una prioridad menor o igual. Opera en
+        O(log n)."""
+
+        if x in self.posiciones:
+            pos = self.posiciones[x]
+            if self.items[pos] <= (prioridad,x):
+                return False
+            self.items[pos] = (prioridad,x)
+        else:
+            pos = len(self.items)
+            self.items.append((prioridad,x))
+        self._subir(pos)
+        return True
+
+    def desencolar(self):
+        """Saca el elemento de menor prioridad y devuelve la tupla
+        (prioridad, elemento). Opera en O(log n)."""
+
+        if self.esta_vacia():
+            raise ValueError("El heap no tiene elementos.")
+        items = self.items
+        minimo = items[0]
+        ultimo = items.pop()
+        del self.posiciones[minimo[1]]
+        if items:
+            items[0] = ultimo
+            self._bajar(0)
+        return minimo
+
+    def remover(self,x):
+        """Saca 'x' del heap (esté donde esté) y devuelve su prioridad, o None
+        si no estaba. Opera en O(log n)."""
+
+        if x not in self.posiciones:
+            return None
+        items = self.items
+        pos = self.posiciones.pop(x)
+        prioridad = items[pos][0]
+        ultimo = items.pop()
+        if pos < len(items):
+            items[pos] = ultimo
+            self._subir(pos)
+            self._bajar(self.posiciones[ultimo[1]])
+        return prioridad
+
+    def ver_primero(self):
+        """Devuelve la tupla (prioridad, elemento) de menor prioridad, si existe."""
+
+        if self.esta_vacia():
+            raise ValueError("El heap no tiene elementos.")
+        return self.items[0]
+
+    def _subir(self,pos):
+        items,posiciones = self.items,self.posiciones
+        item = items[pos]
+        while pos > 0:
+            padre = (pos - 1) >> 1
+            if item < items[padre]:
+                items[pos] = items[padre]
+                posiciones[items[pos][1]] = pos
+                pos = padre
+            else:
+                break
+        items[pos] = item
+        posiciones[item[1]] = pos
+
+    def _bajar(self,pos):
+        items,posiciones = self.items,self.posiciones
+        n = len(items)
+        item = items[pos]
+        hijo = 2 * pos + 1
+        while hijo < n:
+            if hijo + 1 < n and items[hijo + 1] < items[hijo]:
+                hijo += 1
+            if items[hijo] < item:
+                items[pos] = items[hijo]
+                posiciones[items[pos][1]] = pos
+                pos = hijo
+                hijo = 2 * pos + 1
+            else:
+                break
+        items[pos] = item
+        posiciones[item[1]] = pos
+
+class ConjuntosDisjuntos:
+
+    #
+    #   Union-find sobre los enteros 0..n-1, con compresión de caminos (por
+    #   división a la mitad, sin recursión) y unión por rango. Cualquier
+    #   secuencia de operaciones opera en tiempo casi lineal.
+    #
+
+    def __init__(self,n):
+        self.padres = list(range(n))
+        self.rangos = [0] * n
+        self.conjuntos = n
+
+    def __len__(self):
+        """Devuelve la cantidad de conjuntos en O(1)."""
+        return self.conjuntos
+
+    def buscar(self,x):
+        """Devuelve el representante del conjunto de 'x'."""
+
+        padres = self.padres
+        while padres[x] != x:
+            padres[x] = padres[padres[x]]
+            x = padres[x]
+        return x
+
+    def unir(self,x,y):
+        """Une los conjuntos de 'x' e 'y'. Devuelve False si ya estaban
+        en el mismo conjunto, True en caso contrario."""
+
+        x,y = self.buscar(x),self.buscar(y)
+        if x == y:
+            return False
+        if self.rangos[x] < self.rangos[y]:
+            x,y = y,x
+        self.padres[y] = x
+        if self.rangos[x] == self.rangos[y]:
+            self.rangos[x] += 1
+        self.conjuntos -= 1
+        return True
+
 class Grafo:
 
     def __init__(self):
@@ -56,6 +234,7 @@ class Grafo:
         self.vertices = 0
         self.aristas = 0
         self.adyacencias = {}
+        self.version = 0 # Aumenta con cada cambio en las aristas
 
     def __str__(self):
         return str(self.adyacencias)
@@ -122,6 +301,7 @@ class Grafo:
 
         self.aristas -=  len(muertos)
         self.vertices -=  1
+        self.version +=  1
         return list(muertos.items())
 
     def agregar_arista(self,x,y,peso):
@@ -134,6 +314,7 @@ class Grafo:
             self.adyacencias[x][y] = peso
             self.adyacencias[y][x] = peso
             self.aristas +=  1
+            self.version +=  1
             return True
 
         return False
@@ -148,6 +329,7 @@ class Grafo:
         if (x in self.adyacencias) and (y in self.adyacencias):
             resultado = self.adyacencias[x].pop(y)
             self.aristas -=  1
+            self.version +=  1
             if (y !=  x):
                 self.adyacencias[y].pop(x)
 
@@ -173,6 +355,7 @@ class Grafo:
         if (x in self.adyacencias) and (y in self.adyacencias[x]):
             self.adyacencias[x][y] = peso
             self.adyacencias[y][x] = peso
+            self.version +=  1
             return True
 
         return False
@@ -223,3 +406,676 @@ class Grafo:
     def cantidad_vertices(self):
         """Devuelve la cantidad de vértices en O(1)."""
         return self.vertices
+
+
+class GrafoCSR:
+
+    #
+    #   Variante congelada del TDA Grafo, almacenada en formato CSR
+    #   (compressed sparse row). Cada código de aeropuerto se interna a un
+    #   entero 'i' y las adyacencias de 'i' ocupan el tramo
+    #   vecinos[inicios[i]:inicios[i+1]] (ordenado de menor a mayor), con
+    #   sus pesos en la misma posición del arreglo 'pesos'.
+    #
+    #   No admite modificaciones: se construye a partir de un Grafo ya
+    #   cargado o directamente desde los archivos de aeropuertos y vuelos.
+    #
+    #   Puede tener varios pesos por arista ('atributos', un arreglo por
+    #   atributo alineado con 'vecinos'); vista(atributo) devuelve otro
+    #   GrafoCSR que comparte todos los arreglos y usa ese atributo como
+    #   peso. Los arreglos pueden ser 'array' o 'memoryview' (por ejemplo
+    #   sobre un archivo mapeado en memoria, ver snapshot.py).
+    #
+    #   Los atributos derivados ('derivados' = {atributo: (tipo, origen,
+    #   funcion)}) no se guardan: su arreglo se arma aplicando 'funcion' al
+    #   atributo 'origen' la primera vez que se pide su vista, y queda
+    #   registrado en 'materializados'.
+    #
+
+    def __init__(self,codigos,inicios,vecinos,pesos=None,atributos=None,aristas=None,derivados=None):
+
+        self.codigos = codigos
+        self.indices = {c:i for i,c in enumerate(codigos)}
+        self.inicios = inicios
+        self.vecinos = vecinos
+        self.atributos = atributos if atributos is not None else {}
+        if pesos is None and self.atributos:
+            pesos = next(iter(self.atributos.values()))
+        self.pesos = pesos
+        self.vertices = len(codigos)
+        self.version = 0 # Nunca cambia: el grafo está congelado
+        self.derivados = derivados if derivados is not None else {}
+        self.materializados = [] # (atributo, segundos) de cada derivado ya armado
+        self._vistas = {}
+        if aristas is None:
+            aristas = 0
+            for i in range(self.vertices):
+                for j in range(inicios[i],inicios[i+1]):
+                    if vecinos[j] >= i:
+                        aristas += 1
+        self.aristas = aristas
+
+    @classmethod
+    def desde_grafo(cls,grafo,tipo='d'):
+        """Construye la versión compacta de un Grafo (o de cualquier grafo
+        con la misma interfaz de consulta). Opera en O(|V| + |E|*log(|V|))."""
+
+        codigos = grafo.ver_vertices()
+        indices = {c:i for i,c in enumerate(codigos)}
+        inicios = array('l',[0])
+        vecinos = array('l')
+        pesos = array(tipo)
+        for v in codigos:
+            fila = sorted((indices[w],peso) for w,peso in grafo.ver_a_adyacentes(v))
+            for w,peso in fila:
+                vecinos.append(w)
+                pesos.append(peso)
+            inicios.append(len(vecinos))
+
+        return cls(codigos,inicios,vecinos,pesos)
+
+    @classmethod
+    def desde_archivo(cls,aeropuertos,vuelos,columna,conversion=int,tipo='l'):
+        """Construye el grafo directamente desde los archivos de aeropuertos
+        y vuelos, tomando como peso la columna indicada del archivo de vuelos
+        (convertida con 'conversion'). Si un vuelo aparece repetido, se queda
+        con el último, igual que Grafo.agregar_arista."""
+
+        codigos = []
+        indices = {}
+        with open(aeropuertos) as archivo:
+            for linea in archivo:
+                codigo = linea.rstrip().split(',')[1]
+                if codigo not in indices:
+                    indices[codigo] = len(codigos)
+                    codigos.append(codigo)
+
+        aristas = {}
+        with open(vuelos) as archivo:
+            for linea in archivo:
+                linea = linea.rstrip().split(',')
+                if linea[0] not in indices or linea[1] not in indices:
+                    continue
+                x,y = indices[linea[0]],indices[linea[1]]
+                aristas[min(x,y),max(x,y)] = conversion(linea[columna])
+
+        return cls.desde_aristas(codigos,aristas,tipo)
+
+    @classmethod
+    def desde_columnas(cls,codigos,origenes,destinos,columnas,derivados=None):
+        """Arma el grafo en una sola pasada a partir de columnas de aristas:
+        'origenes' y 'destinos' son secuencias de índices de 'codigos' y
+        'columnas' un diccionario {atributo: (tipo, valores)} con un valor por
+        arista. Si una arista aparece repetida, se queda con la última.
+        'derivados' son los atributos que se arman recién al pedirlos. Sólo
+        usa arreglos de tamaño |E| (ninguna lista ni diccionario por arista).
+        Opera en O(|V| + |E|*log(grado máximo))."""
+
+        if np is not None:
+            return cls._desde_columnas_numpy(codigos,origenes,destinos,columnas,derivados)
+
+        # Primero se reparten las filas por vértice como en un counting sort:
+        # cada arista no dirigida aporta sus dos sentidos (un bucle aporta
+        # dos veces el mismo, que se descarta como repetido), guardados en
+        # 'entradas' como el entero vecino*m + fila.
+        n = len(codigos)
+        m = max(1,len(origenes))
+        grados = Counter(origenes)
+        grados.update(destinos)
+        posicion = array('q',[0]) * (n + 1)
+        for i in range(n):
+            posicion[i + 1] = posicion[i] + grados[i]
+        del grados
+        tramos = array('q',posicion)
+        entradas = array('q',[0]) * posicion[n]
+        for fila,(x,y) in enumerate(zip(origenes,destinos)):
+            entradas[posicion[x]] = y * m + fila
+            posicion[x] += 1
+            entradas[posicion[y]] = x * m + fila
+            posicion[y] += 1
+        del posicion
+
+        # Después se ordena el tramo de cada vértice (vecino y, a igual
+        # vecino, fila) y de cada vecino repetido se queda la última fila.
+        inicios = array('l',[0])
+        vecinos = array('l')
+        filas = array('q')
+        bucles = 0
+        for i in range(n):
+            tramo = sorted(entradas[tramos[i]:tramos[i + 1]])
+            adyacentes = [entrada // m for entrada in tramo]
+            if len(set(adyacentes)) != len(adyacentes):
+                ultimas = dict(zip(adyacentes,tramo))
+                adyacentes = list(ultimas)
+                tramo = list(ultimas.values())
+            vecinos.extend(adyacentes)
+            filas.extend([entrada % m for entrada in tramo])
+            bucles += adyacentes.count(i)
+            inicios.append(len(vecinos))
+        del entradas,tramos
+
+        atributos = {nombre:array(tipo,map(valores.__getitem__,filas)) for nombre,(tipo,valores) in columnas.items()}
+        return cls(codigos,inicios,vecinos,atributos=atributos,aristas=(len(vecinos) + bucles) // 2,derivados=derivados)
+
+    @classmethod
+    def _desde_columnas_numpy(cls,codigos,origenes,destinos,columnas,derivados):
+        """desde_columnas con NumPy: ordena los dos sentidos de cada arista
+        por (origen, destino, fila) y se queda con la última fila de cada
+        par. Opera en O(|V| + |E|*log(|E|)), todo en arreglos."""
+
+        m = len(origenes)
+        origenes = np.asarray(origenes,dtype=np.int64)
+        destinos = np.asarray(destinos,dtype=np.int64)
+        desde = np.concatenate((origenes,destinos))
+        hasta = np.concatenate((destinos,origenes))
+        filas = np.tile(np.arange(m,dtype=np.int64),2)
+        orden = np.lexsort((filas,hasta,desde))
+        desde,hasta,filas = desde[orden],hasta[orden],filas[orden]
+        del orden
+        ultimas = np.ones(len(desde),dtype=bool) # Última fila de cada par (desde, hasta); un bucle aparece dos veces
+        ultimas[:-1] = (desde[1:] != desde[:-1]) | (hasta[1:] != hasta[:-1])
+        desde,hasta,filas = desde[ultimas],hasta[ultimas],filas[ultimas]
+
+        inicios = _arreglo('l',np.searchsorted(desde,np.arange(len(codigos) + 1)))
+        aristas = (len(hasta) + int(np.count_nonzero(desde == hasta))) // 2
+        vecinos = _arreglo('l',hasta)
+        atributos = {nombre:_arreglo(tipo,np.asarray(valores)[filas]) for nombre,(tipo,valores) in columnas.items()}
+        return cls(codigos,inicios,vecinos,atributos=atributos,aristas=aristas,derivados=derivados)
+
+    @classmethod
+    def desde_aristas(cls,codigos,aristas,tipo='d'):
+        """Arma los arreglos CSR a partir de la lista de códigos y de un
+        diccionario {(i,j): peso} con las aristas ya internadas a enteros.
+        Opera en O(|V| + |E|*log(|E|))."""
+
+        n = len(codigos)
+        grados = array('l',[0]) * (n + 1)
+        for x,y in aristas:
+            grados[x + 1] += 1
+            if x != y:
+                grados[y + 1] += 1
+        for i in range(n):
+            grados[i + 1] += grados[i]
+
+        inicios = grados
+        posicion = array('l',inicios)
+        vecinos = array('l',[0]) * inicios[n]
+        pesos = array(tipo,[0]) * inicios[n]
+        for (x,y),peso in aristas.items():
+            vecinos[posicion[x]] = y
+            pesos[posicion[x]] = peso
+            posicion[x] += 1
+            if x != y:
+                vecinos[posicion[y]] = x
+                pesos[posicion[y]] = peso
+                posicion[y] += 1
+
+        for i in range(n):
+            a,b = inicios[i],inicios[i + 1]
+            fila = sorted(zip(vecinos[a:b],pesos[a:b]))
+            for j,(w,peso) in enumerate(fila,a):
+                vecinos[j] = w
+                pesos[j] = peso
+
+        return cls(codigos,inicios,vecinos,pesos)
+
+    def __str__(self):
+        return str({v:dict(self.ver_a_adyacentes(v)) for v in self.codigos})
+
+    def __contains__(self,x):
+        """ Verifica que el vértice 'x' esté en el grafo. Opera en O(1). """
+
+        return x in self.indices
+
+    def vista(self,atributo):
+        """Devuelve el grafo con el atributo indicado como peso. La vista
+        comparte todos los arreglos con el original. Opera en O(1)."""
+
+        if atributo not in self.atributos and atributo not in self.derivados:
+            raise ValueError(f"El grafo no tiene el atributo '{atributo}'.")
+        if atributo not in self._vistas:
+            vista = copy.copy(self)
+            vista.pesos = self._columna(atributo)
+            self._vistas[atributo] = vista
+        return self._vistas[atributo]
+
+    def _columna(self,atributo):
+        """Devuelve el arreglo del atributo. Si es un derivado que todavía no
+        se pidió, lo arma: O(|E|) la primera vez, O(1) las siguientes."""
+
+        if atributo not in self.atributos:
+            inicio = time.perf_counter()
+            tipo,origen,funcion = self.derivados[atributo]
+            self.atributos[atributo] = array(tipo,map(funcion,self.atributos[origen]))
+            self.materializados.append((atributo,time.perf_counter() - inicio))
+        return self.atributos[atributo]
+
+    def _posicion(self,x,y):
+        """Devuelve la posición de la arista (x,y) dentro de los arreglos
+        'vecinos' y 'pesos', o None si no existe. Opera en O(log(grado(x)))."""
+
+        if x not in self.indices or y not in self.indices:
+            return None
+        i,j = self.indices[x],self.indices[y]
+        a,b = self.inicios[i],self.inicios[i + 1]
+        pos = bisect_left(self.vecinos,j,a,b)
+        if pos < b and self.vecinos[pos] == j:
+            return pos
+        return None
+
+    def ver_adyacencia(self,x,y):
+        """ Devuelve true 2 vertices son adyacentes, false en
+        caso contrario. Opera en O(log(grado(x))). """
+
+        return self._posicion(x,y) is not None
+
+    def ver_a_adyacentes(self,x):
+        """ Itera las tuplas vértice-peso asociadas al vértice 'x', sin
+        copiar la fila. Si 'x' no está en el grafo no itera nada. """
+
+        if x not in self.indices:
+            return
+        i = self.indices[x]
+        codigos,vecinos,pesos = self.codigos,self.vecinos,self.pesos
+        for j in range(self.inicios[i],self.inicios[i + 1]):
+            yield codigos[vecinos[j]],pesos[j]
+
+    def ver_v_adyacentes(self,x):
+        """Itera los vértices adyacentes al pasado por parámetro, sin copiar
+        la fila."""
+
+        if x not in self.indices:
+            return
+        i = self.indices[x]
+        codigos,vecinos = self.codigos,self.vecinos
+        for j in range(self.inicios[i],self.inicios[i + 1]):
+            yield codigos[vecinos[j]]
+
+    def ver_peso(self,x,y):
+        """ Devuelve el peso de la arista que conecta a los vértices pasados
+        por parámetro, o None si no existe. Opera en O(log(grado(x))). """
+
+        pos = self._posicion(x,y)
+        if pos is None:
+            return None
+        return self.pesos[pos]
+
+    def ver_pesos(self,x,y):
+        """ Devuelve un diccionario {atributo: valor} con todos los pesos de
+        la arista x-y, o None si la arista no existe. """
+
+        pos = self._posicion(x,y)
+        if pos is None:
+            return None
+        pesos = {atributo:columna[pos] for atributo,columna in self.atributos.items()}
+        for atributo,(tipo,origen,funcion) in self.derivados.items():
+            if atributo not in pesos:
+                pesos[atributo] = funcion(pesos[origen])
+        return pesos
+
+    def esta_vacio(self):
+        """ Devuelve True si está vacío, False en caso contrario, en O(1). """
+
+        return self.vertices ==  0
+
+    def ver_vertices(self):
+        """Devuelve una lista con todos los vértices."""
+
+        return list(self.codigos)
+
+    def vertice_aleatorio(self):
+        """En caso de no estar vacío el grafo, devuelve un vértice random.
+        De lo contrario devuelve 'None'."""
+
+        if self.vertices > 0:
+            return random.choice(self.codigos)
+        return None
+
+    def ver_aristas(self):
+        """Devuelve una lista de tuplas ((v,w),peso), una por arista."""
+
+        resultado = []
+        for i in range(self.vertices):
+            for j in range(self.inicios[i],self.inicios[i + 1]):
+                if self.vecinos[j] >= i:
+                    resultado.append(((self.codigos[i],self.codigos[self.vecinos[j]]),self.pesos[j]))
+
+        return resultado
+
+    def cantidad_aristas(self):
+        """Devuelve la cantidad de aristas en O(1)."""
+        return self.aristas
+
+    def cantidad_vertices(self):
+        """Devuelve la cantidad de vértices en O(1)."""
+        return self.vertices
+
+
+class GrafoMultipeso:
+
+    #
+    #   Grafo con varios pesos por arista (tiempo, precio, frecuencia, ...)
+    #   que comparten una única topología. Las adyacencias guardan, para
+    #   cada vecino, el índice de la arista; los pesos se almacenan como
+    #   struct-of-arrays: un arreglo por atributo, indexado por arista.
+    #
+    #   adyacencias[x] = {... , y: indice , ...}
+    #   atributos['precio'][indice] = precio de la arista x-y
+    #
+    #   Los algoritmos trabajan sobre una VistaPeso, que expone la misma
+    #   interfaz de consulta que Grafo para un atributo en particular.
+    #
+    #   Un atributo derivado (por ejemplo la inversa de la frecuencia) se
+    #   calcula a partir de otro: su arreglo se arma recién la primera vez
+    #   que se usa y desde entonces se mantiene como los demás.
+    #
+
+    def __init__(self,atributos,derivados=None):
+        """Recibe un diccionario {nombre_atributo: tipo}, donde el tipo es
+        el typecode del arreglo que lo almacena ('l' enteros, 'd' reales),
+        y opcionalmente los atributos derivados {nombre: (tipo, origen,
+        funcion)}, cuyo valor es funcion(valor del atributo 'origen')."""
+
+        self.vertices = 0
+        self.aristas = 0
+        self.adyacencias = {}
+        self.atributos = {nombre:array(tipo) for nombre,tipo in atributos.items()}
+        self.derivados = derivados if derivados is not None else {}
+        self.materializados = [] # (atributo, segundos) de cada derivado ya armado
+        self.extremos = []
+        self.libres = []
+        self.version = 0 # Aumenta con cada cambio en las aristas
+
+    @classmethod
+    def desde_csr(cls,csr):
+        """Arma un grafo multipeso modificable con los mismos vértices,
+        aristas y atributos que un GrafoCSR (que no admite cambios).
+        Opera en O(|V| + |E|)."""
+
+        grafo = cls({nombre:getattr(columna,'typecode',None) or columna.format
+                     for nombre,columna in csr.atributos.items()},csr.derivados)
+        grafo.materializados = list(csr.materializados)
+        for codigo in csr.codigos:
+            grafo.agregar_vertice(codigo)
+        columnas = list(csr.atributos.items())
+        for i,x in enumerate(csr.codigos):
+            for j in range(csr.inicios[i],csr.inicios[i + 1]):
+                k = csr.vecinos[j]
+                if k >= i:
+                    grafo.agregar_arista(x,csr.codigos[k],{nombre:columna[j] for nombre,columna in columnas})
+        return grafo
+
+    def __str__(self):
+        return str({v:{w:self.ver_pesos(v,w) for w in ady} for v,ady in self.adyacencias.items()})
+
+    def __contains__(self,x):
+        """ Verifica que el vértice 'x' esté en el grafo. Opera en O(1). """
+
+        return x in self.adyacencias
+
+    def vista(self,atributo):
+        """Devuelve una vista de solo lectura del grafo, con la interfaz de
+        Grafo, en la que el peso de cada arista es el atributo indicado."""
+
+        if atributo not in self.atributos and atributo not in self.derivados:
+            raise ValueError(f"El grafo no tiene el atributo '{atributo}'.")
+        self._columna(atributo)
+        return VistaPeso(self,atributo)
+
+    def _columna(self,atributo):
+        """Devuelve el arreglo del atributo. Si es un derivado que todavía no
+        se usó, lo arma: O(|E|) la primera vez, O(1) las siguientes."""
+
+        if atributo not in self.atributos:
+            inicio = time.perf_counter()
+            tipo,origen,funcion = self.derivados[atributo]
+            self.atributos[atributo] = array(tipo,map(funcion,self.atributos[origen]))
+            self.materializados.append((atributo,time.perf_counter() - inicio))
+        return self.atributos[atributo]
+
+    def _valor(self,pesos,atributo):
+        """Valor del atributo en el diccionario 'pesos' de una arista,
+        calculándolo si es un derivado que no está."""
+
+        if atributo in pesos:
+            return pesos[atributo]
+        tipo,origen,funcion = self.derivados[atributo]
+        return funcion(pesos[origen])
+
+    def ver_adyacencia(self,x,y):
+        """ Devuelve true 2 vertices son adyacentes, false en
+        caso contrario. Opera en O(1). """
+
+        return (x in self.adyacencias) and (y in self.adyacencias[x])
+
+    def ver_a_adyacentes(self,x,atributo):
+        """ Itera las tuplas vértice-peso asociadas al vértice 'x', tomando
+        como peso el atributo indicado. """
+
+        if x not in self.adyacencias:
+            return
+        columna = self._columna(atributo)
+        for w,indice in self.adyacencias[x].items():
+            yield w,columna[indice]
+
+    def ver_v_adyacentes(self,x):
+        """Devuelve una lista con los vertices adyacentes al pasado por
+        parametro"""
+
+        if x in self.adyacencias:
+            return list(self.adyacencias[x])
+        return []
+
+    def agregar_vertice(self,x):
+        """ Añade el vértice 'x', desconectado del resto. Si el vértice ya
+        estaba en el grafo devuelve False. Opera en O(1). """
+
+        if x not in self.adyacencias:
+            self.adyacencias[x] = {}
+            self.vertices += 1
+            return True
+
+        return False
+
+    def sacar_vertice(self,x):
+        """ Quita el vértice del grafo junto con sus aristas. Devuelve una
+        lista de tuplas (vecino, pesos) con las aristas eliminadas.
+        Opera en O(grado(x)). """
+
+        if x not in self.adyacencias:
+            return []
+
+        muertos = [(w,self.ver_pesos(x,w)) for w in self.adyacencias[x]]
+        for w,pesos in muertos:
+            self.remover_arista(x,w)
+        self.adyacencias.pop(x)
+        self.vertices -= 1
+        return muertos
+
+    def agregar_arista(self,x,y,pesos):
+        """ Agrega la arista x-y con los pesos indicados en el diccionario
+        'pesos' {atributo: valor}, que debe tener todos los atributos del
+        grafo (los derivados, si faltan, se calculan). Si la arista ya
+        existía, reemplaza sus pesos. Devuelve False
+        si alguno de los vértices no está en el grafo. Opera en O(1)
+        amortizado. """
+
+        if (x not in self.adyacencias) or (y not in self.adyacencias):
+            return False
+
+        if y in self.adyacencias[x]:
+            indice = self.adyacencias[x][y]
+            for atributo,columna in self.atributos.items():
+                columna[indice] = self._valor(pesos,atributo)
+            self.version += 1
+            return True
+
+        if self.libres:
+            indice = self.libres.pop()
+            self.extremos[indice] = (x,y)
+            for atributo,columna in self.atributos.items():
+                columna[indice] = self._valor(pesos,atributo)
+        else:
+            indice = len(self.extremos)
+            self.extremos.append((x,y))
+            for atributo,columna in self.atributos.items():
+                columna.append(self._valor(pesos,atributo))
+
+        self.adyacencias[x][y] = indice
+        self.adyacencias[y][x] = indice
+        self.aristas += 1
+        self.version += 1
+        return True
+
+    def remover_arista(self,x,y):
+        """ Quita la arista x-y y devuelve el diccionario con sus pesos, o
+        None si no existía. El lugar que ocupaba en los arreglos de
+        atributos queda libre para la próxima arista. Opera en O(1). """
+
+        if not self.ver_adyacencia(x,y):
+            return None
+
+        pesos = self.ver_pesos(x,y)
+        indice = self.adyacencias[x].pop(y)
+        if y != x:
+            self.adyacencias[y].pop(x)
+        self.extremos[indice] = None
+        self.libres.append(indice)
+        self.aristas -= 1
+        self.version += 1
+        return pesos
+
+    def ver_peso(self,x,y,atributo):
+        """ Devuelve el atributo indicado de la arista x-y, o None si la
+        arista no existe. Es O(1). """
+
+        if not self.ver_adyacencia(x,y):
+            return None
+        return self._columna(atributo)[self.adyacencias[x][y]]
+
+    def ver_pesos(self,x,y):
+        """ Devuelve un diccionario {atributo: valor} con todos los pesos de
+        la arista x-y, o None si la arista no existe. Es O(1). """
+
+        if not self.ver_adyacencia(x,y):
+            return None
+        indice = self.adyacencias[x][y]
+        pesos = {atributo:columna[indice] for atributo,columna in self.atributos.items()}
+        for atributo in self.derivados:
+            if atributo not in pesos:
+                pesos[atributo] = self._valor(pesos,atributo)
+        return pesos
+
+    def cambiar_peso(self,x,y,peso,atributo):
+        """ Cambia el atributo indicado de la arista x-y (y los derivados de
+        él ya armados). Devuelve False si la arista no existe, True en caso
+        contrario. Es O(1). """
+
+        if not self.ver_adyacencia(x,y):
+            return False
+        indice = self.adyacencias[x][y]
+        self._columna(atributo)[indice] = peso
+        for derivado,(tipo,origen,funcion) in self.derivados.items():
+            if origen == atributo and derivado in self.atributos:
+                self.atributos[derivado][indice] = funcion(peso)
+        self.version += 1
+        return True
+
+    def esta_vacio(self):
+        """ Devuelve True si está vacío, False en caso contrario, en O(1). """
+
+        return self.vertices == 0
+
+    def ver_vertices(self):
+        """Devuelve una lista con todos los vértices."""
+
+        return [*self.adyacencias]
+
+    def vertice_aleatorio(self):
+        """En caso de no estar vacío el grafo, devuelve un vértice random.
+        De lo contrario devuelve 'None'."""
+
+        if self.vertices > 0:
+            return random.choice(list(self.adyacencias.keys()))
+        return None
+
+    def ver_aristas(self,atributo):
+        """Devuelve una lista de tuplas ((v,w),peso), una por arista, con el
+        atributo indicado como peso. Opera en O(|E|)."""
+
+        columna = self._columna(atributo)
+        return [(extremos,columna[indice]) for indice,extremos in enumerate(self.extremos) if extremos is not None]
+
+    def cantidad_aristas(self):
+        """Devuelve la cantidad de aristas en O(1)."""
+        return self.aristas
+
+    def cantidad_vertices(self):
+        """Devuelve la cantidad de vértices en O(1)."""
+        return self.vertices
+
+
+class VistaPeso:
+
+    #
+    #   Vista de solo lectura de un GrafoMultipeso para un único atributo.
+    #   Tiene la misma interfaz de consulta que Grafo, de modo que los
+    #   algoritmos de la biblioteca la usan sin saber que detrás hay varios
+    #   pesos por arista. No copia nada: cualquier cambio en el grafo se ve
+    #   inmediatamente a través de la vista.
+    #
+
+    def __init__(self,grafo,atributo):
+
+        self.grafo = grafo
+        self.atributo = atributo
+        self.columna = grafo.atributos[atributo]
+
+    def __str__(self):
+        return str({v:dict(self.ver_a_adyacentes(v)) for v in self.grafo.adyacencias})
+
+    @property
+    def version(self):
+        return self.grafo.version
+
+    def __contains__(self,x):
+        return x in self.grafo
+
+    def vista(self,atributo):
+        return self.grafo.vista(atributo)
+
+    def ver_adyacencia(self,x,y):
+        return self.grafo.ver_adyacencia(x,y)
+
+    def ver_a_adyacentes(self,x):
+        """ Itera las tuplas vértice-peso asociadas al vértice 'x'. """
+
+        if x not in self.grafo.adyacencias:
+            return
+        columna = self.columna
+        for w,indice in self.grafo.adyacencias[x].items():
+            yield w,columna[indice]
+
+    def ver_v_adyacentes(self,x):
+        return self.grafo.ver_v_adyacentes(x)
+
+    def ver_peso(self,x,y):
+        return self.grafo.ver_peso(x,y,self.atributo)
+
+    def esta_vacio(self):
+        return self.grafo.esta_vacio()
+
+    def ver_vertices(self):
+        return self.grafo.ver_vertices()
+
+    def vertice_aleatorio(self):
+        return self.grafo.vertice_aleatorio()
+
+    def ver_aristas(self):
+        return self.grafo.ver_aristas(self.atributo)
+
+    def cantidad_aristas(self):
+        return self.grafo.cantidad_aristas()
+
+    def cantidad_vertices(self):
+        return self.grafo.cantidad_vertices()
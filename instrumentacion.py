@@ -0,0 +1,192 @@
+#
+#   Instrumentación de los comandos de flycombi: por cada comando registra
+#   el tiempo total, los vértices expandidos, las aristas recorridas, las
+#   operaciones de heap y los aciertos y fallos de la cache de caminos.
+#
+#   Apagada no cuesta nada: los contadores se enganchan reemplazando, al
+#   activarla, los métodos que recorren adyacencias de cada tipo de grafo,
+#   los de HeapIndexado y los heappush/heappop que importan biblioteca.py y
+#   contraccion.py (no los de heapq, que usan también asyncio y cualquier
+#   otra biblioteca), así que los algoritmos no tienen ni un 'if' de más.
+#   Una vez activada queda activa en todo el proceso (y en los procesos
+#   hijos creados con fork).
+#
+#   Se activa con --instrumentar o con la variable de entorno
+#   FLYCOMBI_INSTRUMENTAR. El valor es la ruta de un archivo al que se
+#   agrega una línea JSON por comando, o SALIDA_ERROR ("-") para escribir
+#   un resumen legible por stderr. Opcionalmente, cada comando se puede
+#   correr bajo cProfile (las funciones que más tiempo acumulan) o
+#   tracemalloc (el pico de memoria y los lugares que más reservan).
+#
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+import biblioteca
+import contraccion
+from grafo import Grafo, GrafoCSR, GrafoMultipeso, HeapIndexado, VistaPeso
+
+VARIABLE_ENTORNO = "FLYCOMBI_INSTRUMENTAR"
+VARIABLE_PERFIL = "FLYCOMBI_PERFIL"
+SALIDA_ERROR = "-"
+PERFIL_CPROFILE = "cprofile"
+PERFIL_TRACEMALLOC = "tracemalloc"
+PERFILES = (PERFIL_CPROFILE,PERFIL_TRACEMALLOC)
+LINEAS_PERFIL = 10 # Funciones (o lugares de reserva) que se informan por comando
+
+CONTADORES = ("expandidos","aristas","encolados","desencolados")
+contadores = dict.fromkeys(CONTADORES,0)
+_enganchado = False
+
+
+def _contar_iterador(adyacentes):
+    for adyacente in adyacentes:
+        contadores["aristas"] += 1
+        yield adyacente
+
+def _contar_adyacentes(metodo):
+    """Cuenta un vértice expandido por llamada y una arista por adyacente.
+    Los métodos que devuelven una lista la siguen devolviendo."""
+    def contado(self,*args):
+        contadores["expandidos"] += 1
+        adyacentes = metodo(self,*args)
+        if isinstance(adyacentes,list):
+            contadores["aristas"] += len(adyacentes)
+            return adyacentes
+        return _contar_iterador(adyacentes)
+    contado.__doc__ = metodo.__doc__
+    return contado
+
+def _contar(metodo,contador):
+    def contado(*args):
+        contadores[contador] += 1
+        return metodo(*args)
+    contado.__doc__ = metodo.__doc__
+    return contado
+
+def enganchar():
+    """Reemplaza los métodos que se cuentan por versiones que cuentan. Sólo la
+    primera llamada tiene efecto."""
+    global _enganchado
+    if _enganchado:
+        return
+    _enganchado = True
+    # VistaPeso.ver_v_adyacentes llama a la de GrafoMultipeso: se cuenta una sola vez.
+    for clase,metodos in ((Grafo,("ver_a_adyacentes","ver_v_adyacentes")),
+                          (GrafoCSR,("ver_a_adyacentes","ver_v_adyacentes")),
+                          (GrafoMultipeso,("ver_a_adyacentes","ver_v_adyacentes")),
+                          (VistaPeso,("ver_a_adyacentes",))):
+        for nombre in metodos:
+            setattr(clase,nombre,_contar_adyacentes(getattr(clase,nombre)))
+    HeapIndexado.encolar = _contar(HeapIndexado.encolar,"encolados")
+    HeapIndexado.desencolar = _contar(HeapIndexado.desencolar,"desencolados")
+    for modulo in (biblioteca,contraccion):
+        modulo.heappush = _contar(modulo.heappush,"encolados")
+        modulo.heappop = _contar(modulo.heappop,"desencolados")
+
+
+def desde_entorno(destino=None,perfil=None,comandos=None):
+    """Devuelve la Instrumentacion pedida por los argumentos o, si no se pidió
+    ninguna, por las variables de entorno; None si está apagada."""
+
+    destino = destino or os.environ.get(VARIABLE_ENTORNO)
+    if not destino:
+        return None
+    perfil = perfil or os.environ.get(VARIABLE_PERFIL)
+    if perfil is not None and perfil not in PERFILES:
+        raise ValueError(f"Perfil desconocido '{perfil}', se esperaba uno de {', '.join(PERFILES)}.")
+    return Instrumentacion(destino,perfil,comandos)
+
+
+def _perfil_cprofile(perfilador):
+    """Devuelve las LINEAS_PERFIL funciones con más tiempo acumulado."""
+    filas = []
+    for (archivo,linea,funcion),(_,llamadas,propio,acumulado,_) in pstats.Stats(perfilador).stats.items():
+        filas.append({"funcion":f"{os.path.basename(archivo)}:{linea}({funcion})","llamadas":llamadas,
+                      "propio":round(propio,6),"acumulado":round(acumulado,6)})
+    filas.sort(key=lambda fila: fila["acumulado"],reverse=True)
+    return filas[:LINEAS_PERFIL]
+
+def _perfil_tracemalloc(captura,pico):
+    """Devuelve el pico de memoria y los LINEAS_PERFIL lugares que más reservaron."""
+    lugares = captura.statistics("lineno")[:LINEAS_PERFIL]
+    return {"pico_bytes":pico,
+            "lugares":[{"lugar":f"{os.path.basename(l.traceback[0].filename)}:{l.traceback[0].lineno}",
+                        "bytes":l.size,"reservas":l.count} for l in lugares]}
+
+
+                    ########################
+                    #                      #
+                    #        CLASES        #
+                    #                      #
+                    ########################
+
+class Instrumentacion:
+
+    def __init__(self,destino=SALIDA_ERROR,perfil=None,comandos=None):
+        """'destino' es SALIDA_ERROR o la ruta del archivo JSON lines; 'perfil'
+        es None, PERFIL_CPROFILE o PERFIL_TRACEMALLOC, y se aplica sólo a los
+        'comandos' indicados (a todos si es None)."""
+
+        self.destino = destino
+        self.perfil = perfil
+        self.comandos = None if comandos is None else set(comandos)
+        self.archivo = None if destino == SALIDA_ERROR else open(destino,"a",buffering=1)
+        enganchar()
+
+    def medir(self,linea,ejecutar,cache=None):
+        """Ejecuta 'ejecutar()' (que corre la línea de comando) y registra lo
+        que costó. Devuelve lo que devuelva 'ejecutar'."""
+
+        comando = linea.split(" ",1)[0].strip()
+        perfil = self.perfil if self.comandos is None or comando in self.comandos else None
+        antes = dict(contadores)
+        cache_antes = None if cache is None else (cache.aciertos,cache.fallos)
+
+        perfilador = None
+        if perfil == PERFIL_CPROFILE:
+            perfilador = cProfile.Profile()
+            perfilador.enable()
+        elif perfil == PERFIL_TRACEMALLOC:
+            tracemalloc.start()
+        inicio = time.perf_counter()
+        try:
+            return ejecutar()
+        finally:
+            registro = {"comando":comando,"linea":linea.rstrip("\n"),"segundos":round(time.perf_counter() - inicio,6)}
+            for contador in CONTADORES:
+                registro[contador] = contadores[contador] - antes[contador]
+            if cache is not None:
+                registro["aciertos_cache"] = cache.aciertos - cache_antes[0]
+                registro["fallos_cache"] = cache.fallos - cache_antes[1]
+            if perfilador is not None:
+                perfilador.disable()
+                registro["perfil"] = _perfil_cprofile(perfilador)
+            elif perfil == PERFIL_TRACEMALLOC:
+                captura = tracemalloc.take_snapshot()
+                pico = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                registro["memoria"] = _perfil_tracemalloc(captura,pico)
+            self.registrar(registro)
+
+    def registrar(self,registro):
+        if self.archivo is not None:
+            self.archivo.write(json.dumps(registro,ensure_ascii=False) + "\n")
+            return
+        datos = ", ".join(f"{clave}: {registro[clave]}" for clave in registro if clave not in ("linea","perfil","memoria"))
+        print(f"[instrumentación] {datos}", file=sys.stderr)
+        for fila in registro.get("perfil",()):
+            print(f"    {fila['acumulado']:>10.6f}s {fila['llamadas']:>9} {fila['funcion']}", file=sys.stderr)
+        if "memoria" in registro:
+            print(f"    pico: {registro['memoria']['pico_bytes']} bytes", file=sys.stderr)
+            for lugar in registro["memoria"]["lugares"]:
+                print(f"    {lugar['bytes']:>10} bytes {lugar['reservas']:>7} reservas {lugar['lugar']}", file=sys.stderr)
+
+    def cerrar(self):
+        if self.archivo is not None:
+            self.archivo.close()
+            self.archivo = None
@@ -0,0 +1,171 @@
+#
+#   Versión vectorizada (NumPy, y SciPy si está instalado) de los cálculos
+#   que recorren toda la red: niveles bfs desde varios orígenes, grados y
+#   pesos totales por vértice, y PageRank.
+#
+#   El grafo se pasa una vez a una MatrizAdyacencia (matriz dispersa en
+#   formato CSR, con los vértices internados a enteros) y cada algoritmo es
+#   una secuencia de productos matriz-vector: la frontera del bfs es un
+#   vector de 0 y 1, y cada iteración de PageRank multiplica la matriz de
+#   pesos por el vector de rangos. Con SciPy el producto es el de
+#   scipy.sparse; sin SciPy se hace con np.bincount sobre los arreglos CSR.
+#
+#   Como el grafo es no dirigido la matriz es simétrica, y los resultados
+#   son los mismos que los de niveles_bfs, grados_ponderados y pagerank de
+#   biblioteca.py (salvo redondeo en PageRank); ver benchmarks/matricial.py.
+#   Sin NumPy, DISPONIBLE es False y hay que usar esas versiones.
+#
+
+try:
+    import numpy as np
+except ImportError: # NumPy es opcional: sin él se usan las versiones de biblioteca.py
+    np = None
+try:
+    from scipy import sparse
+except ImportError: # SciPy es opcional: sin él los productos se hacen con NumPy
+    sparse = None
+from biblioteca import _seleccionar
+from biblioteca import AMORTIGUACION_PAGERANK, TOLERANCIA_PAGERANK, ITERACIONES_PAGERANK
+from grafo import GrafoCSR
+
+DISPONIBLE = np is not None
+SIN_NIVEL = -1 # Nivel de los vértices que el bfs no alcanza
+
+
+def niveles_bfs(matriz,origenes):
+    """Bfs desde varios orígenes (códigos) a la vez. Devuelve el arreglo de
+    niveles, indexado como matriz.codigos, con SIN_NIVEL en los vértices no
+    alcanzables. Cada nivel es un producto de la matriz por la frontera:
+    opera en O(D*(|V| + |E|)), con D la cantidad de niveles."""
+
+    nivel = np.full(matriz.vertices,SIN_NIVEL,dtype=np.int64)
+    frontera = np.zeros(matriz.vertices,dtype=np.float64)
+    for v in origenes:
+        if v in matriz.indices:
+            frontera[matriz.indices[v]] = 1
+    alcanzados = frontera > 0
+    nivel[alcanzados] = 0
+    actual = 0
+    while alcanzados.any():
+        actual += 1
+        alcanzados = (matriz.producto(frontera,ponderado=False) > 0) & (nivel == SIN_NIVEL)
+        nivel[alcanzados] = actual
+        frontera = alcanzados.astype(np.float64)
+    return nivel
+
+
+def grados_ponderados(matriz):
+    """Devuelve los arreglos de cantidad de aristas y de suma de pesos de
+    cada vértice, indexados como matriz.codigos. Opera en O(|V| + |E|)."""
+
+    return np.diff(matriz.inicios),matriz.producto(np.ones(matriz.vertices))
+
+
+def resumen(valores):
+    """Estadísticas de un arreglo de valores por vértice (por ejemplo, los
+    grados): mínimo, máximo, media, mediana, percentil 90 y desvío."""
+
+    if len(valores) == 0:
+        return {}
+    return {"minimo":float(valores.min()),"maximo":float(valores.max()),"media":float(valores.mean()),
+            "mediana":float(np.median(valores)),"p90":float(np.percentile(valores,90)),"desvio":float(valores.std())}
+
+
+def pagerank(matriz,amortiguacion=AMORTIGUACION_PAGERANK,tolerancia=TOLERANCIA_PAGERANK,max_iteraciones=ITERACIONES_PAGERANK):
+    """PageRank con los pesos de la matriz, como pagerank de biblioteca.py.
+    Devuelve el arreglo de rangos, indexado como matriz.codigos. Cada
+    iteración es un producto matriz-vector: opera en O(|V| + |E|)."""
+
+    n = matriz.vertices
+    if n == 0:
+        return np.zeros(0)
+    totales = matriz.producto(np.ones(n))
+    colgantes = totales <= 0
+    inversos = np.divide(1.0,totales,out=np.zeros(n),where=~colgantes)
+    rango = np.full(n,1 / n)
+    for i in range(max_iteraciones):
+        nuevo = amortiguacion * matriz.producto(rango * inversos)
+        nuevo += (1 - amortiguacion + amortiguacion * rango[colgantes].sum()) / n
+        cambio = np.abs(nuevo - rango).sum()
+        rango = nuevo
+        if cambio < tolerancia:
+            break
+    return rango
+
+
+                    ########################
+                    #                      #
+                    #        CLASES        #
+                    #                      #
+                    ########################
+
+class MatrizAdyacencia:
+
+    #
+    #   Matriz de adyacencia dispersa de un grafo, en formato CSR: las
+    #   columnas de la fila 'i' son vecinos[inicios[i]:inicios[i+1]], con sus
+    #   pesos en la misma posición de 'pesos'. 'filas' repite 'i' en cada
+    #   posición de su tramo, para hacer el producto con np.bincount. Es una
+    #   copia: si el grafo cambia hay que volver a armarla.
+    #
+
+    def __init__(self,codigos,inicios,vecinos,pesos):
+
+        self.codigos = codigos
+        self.indices = {c:i for i,c in enumerate(codigos)}
+        self.vertices = len(codigos)
+        self.inicios = np.asarray(inicios,dtype=np.int64)
+        self.vecinos = np.asarray(vecinos,dtype=np.int64)
+        self.pesos = np.asarray(pesos,dtype=np.float64)
+        self.filas = np.repeat(np.arange(self.vertices,dtype=np.int64),np.diff(self.inicios))
+        self._matrices = {}
+
+    @classmethod
+    def desde_grafo(cls,grafo,peso=None):
+        """Arma la matriz de un grafo con la interfaz de consulta de Grafo,
+        tomando como peso el atributo 'peso' si es multipeso. De un GrafoCSR
+        usa directamente sus arreglos. Opera en O(|V| + |E|)."""
+
+        grafo = _seleccionar(grafo,peso)
+        if isinstance(grafo,GrafoCSR):
+            return cls(grafo.codigos,grafo.inicios,grafo.vecinos,grafo.pesos)
+        codigos = grafo.ver_vertices()
+        indices = {c:i for i,c in enumerate(codigos)}
+        inicios = [0]
+        vecinos = []
+        pesos = []
+        for v in codigos:
+            for w,peso_arista in grafo.ver_a_adyacentes(v):
+                vecinos.append(indices[w])
+                pesos.append(peso_arista)
+            inicios.append(len(vecinos))
+        return cls(codigos,inicios,vecinos,pesos)
+
+    def cantidad_aristas(self):
+        """Cantidad de entradas no nulas: cada arista cuenta dos veces."""
+        return len(self.vecinos)
+
+    def producto(self,x,ponderado=True):
+        """Devuelve el producto de la matriz (la de pesos, o la de unos si no
+        es 'ponderado') por el vector 'x'. Opera en O(|V| + |E|)."""
+
+        if sparse is not None:
+            if ponderado not in self._matrices:
+                datos = self.pesos if ponderado else np.ones(len(self.vecinos))
+                self._matrices[ponderado] = sparse.csr_matrix((datos,self.vecinos,self.inicios),
+                                                              shape=(self.vertices,self.vertices))
+            return self._matrices[ponderado] @ x
+        valores = x[self.vecinos]
+        if ponderado:
+            valores = valores * self.pesos
+        return np.bincount(self.filas,weights=valores,minlength=self.vertices)
+
+    def a_diccionario(self,valores,incluir=None):
+        """Pasa un arreglo indexado como self.codigos a un diccionario
+        código -> valor (de Python). Si se indica 'incluir' (un arreglo de
+        booleanos), sólo los vértices en los que es verdadero."""
+
+        lista = valores.tolist()
+        if incluir is None:
+            return dict(zip(self.codigos,lista))
+        return {self.codigos[i]:lista[i] for i in np.flatnonzero(incluir).tolist()}
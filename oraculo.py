@@ -0,0 +1,149 @@
+#
+#   Oráculo de caminos entre ciudades hub: se precalculan, para cada peso
+#   (precio, tiempo), los caminos mínimos entre todos los pares de ciudades
+#   de un conjunto de hubs y se guardan en disco. Una consulta camino_mas
+#   entre dos hubs pasa a ser una búsqueda en la tabla más el armado del
+#   camino; el resto de las consultas sigue usando Dijkstra.
+#
+#   Por defecto los hubs son las ciudades con más vuelos. Cada camino se
+#   calcula con la misma búsqueda que camino_mas (Dijkstra desde todos los
+#   aeropuertos de la ciudad de origen hasta el primero de la de destino),
+#   así que el oráculo responde lo mismo que la búsqueda.
+#
+#   El archivo usa el formato de snapshot.py (con su propia MAGIA). Por cada
+#   peso hay tres arreglos, indexados por par (i, j) de hubs en la posición
+#   i * cantidad_hubs + j:
+#
+#       <peso>_dist     distancia del camino (-1 si no hay camino)
+#       <peso>_inicios  el camino del par ocupa caminos[inicios[p]:inicios[p+1]]
+#       <peso>_caminos  índices de aeropuerto (en 'codigos') de cada camino
+#
+#   Igual que el snapshot, se regenera si los csv cambiaron.
+#
+
+import sys
+from array import array
+from biblioteca import BusquedaDijkstra
+from carga import leer_red
+from snapshot import firmas, esta_actualizado, leer_encabezado, guardar_arreglos, mapear_arreglos
+
+MAGIA = b"FLYORACU"
+FORMATO = 1
+CANTIDAD_HUBS = 300
+
+
+def elegir_hubs(grafo,cities,cantidad):
+    """Devuelve las 'cantidad' ciudades con más vuelos (sumando todos sus
+    aeropuertos), de mayor a menor; a igual cantidad, por nombre."""
+
+    grados = {ciudad:sum(sum(1 for _ in grafo.ver_v_adyacentes(aeropuerto)) for aeropuerto in aeropuertos)
+              for ciudad,aeropuertos in cities.items()}
+    return sorted(grados,key=lambda ciudad: (-grados[ciudad],ciudad))[:cantidad]
+
+
+def calcular_tablas(grafo,cities,hubs,peso):
+    """Calcula los caminos mínimos según 'peso' entre todos los pares de hubs.
+    Devuelve los arreglos (dist, inicios, caminos) descriptos arriba, con los
+    aeropuertos como índices en grafo.ver_vertices(). Opera en
+    O(|hubs| * |E| * log(|V|))."""
+
+    indices = {codigo:i for i,codigo in enumerate(grafo.ver_vertices())}
+    dist = array('d')
+    inicios = array('q',[0])
+    caminos = array('q')
+    for origen in hubs:
+        busqueda = BusquedaDijkstra(grafo,cities[origen],peso)
+        for destino in hubs:
+            llegada = busqueda.avanzar(cities[destino])
+            if llegada is None:
+                dist.append(-1)
+            else:
+                dist.append(busqueda.dist[llegada])
+                camino = []
+                while llegada is not None:
+                    camino.append(indices[llegada])
+                    llegada = busqueda.padre[llegada]
+                caminos.extend(reversed(camino))
+            inicios.append(len(caminos))
+    return dist,inicios,caminos
+
+
+def compilar(aeropuertos,vuelos,ruta,columnas,pesos,cantidad=CANTIDAD_HUBS,informe=sys.stderr):
+    """Carga la red, elige los hubs, calcula las tablas de cada peso y las
+    guarda en 'ruta'."""
+
+    grafo,cities,flights = leer_red(aeropuertos,vuelos,columnas,informe=None)
+    hubs = elegir_hubs(grafo,cities,cantidad)
+    arreglos = []
+    for peso in pesos:
+        for nombre,datos in zip(("dist","inicios","caminos"),calcular_tablas(grafo,cities,hubs,peso)):
+            arreglos.append((f"{peso}_{nombre}",datos))
+
+    guardar_arreglos(ruta,MAGIA,FORMATO,{
+        "fuentes": firmas(aeropuertos,vuelos),
+        "codigos": grafo.ver_vertices(),
+        "cantidad": cantidad,
+        "hubs": hubs,
+        "pesos": list(pesos),
+    },arreglos)
+    if informe is not None:
+        print(f"{ruta}: {len(hubs)} hubs, {len(hubs) ** 2 * len(pesos)} caminos precalculados", file=informe)
+
+
+def cargar(ruta):
+    """Mapea el oráculo guardado en 'ruta' y lo devuelve."""
+
+    metadatos,arreglos = mapear_arreglos(ruta,MAGIA,FORMATO)
+    return Oraculo(metadatos["codigos"],metadatos["hubs"],
+                   {peso:tuple(arreglos[f"{peso}_{nombre}"] for nombre in ("dist","inicios","caminos"))
+                    for peso in metadatos["pesos"]})
+
+
+def cargar_o_compilar(aeropuertos,vuelos,ruta,columnas,pesos,cantidad=CANTIDAD_HUBS):
+    """Carga el oráculo de 'ruta', generándolo antes si no existe, si los csv
+    cambiaron o si se pidió otra cantidad de hubs u otros pesos."""
+
+    metadatos = leer_encabezado(ruta,MAGIA,FORMATO)
+    if (not esta_actualizado(ruta,aeropuertos,vuelos,MAGIA,FORMATO) or metadatos["pesos"] != list(pesos)
+            or metadatos["cantidad"] != cantidad):
+        compilar(aeropuertos,vuelos,ruta,columnas,pesos,cantidad)
+    return cargar(ruta)
+
+
+                    ########################
+                    #                      #
+                    #        CLASES        #
+                    #                      #
+                    ########################
+
+class Oraculo:
+
+    def __init__(self,codigos,hubs,tablas):
+        """Recibe la tabla de códigos de aeropuerto, la lista de hubs y, por
+        cada peso, la terna de arreglos (dist, inicios, caminos)."""
+
+        self.codigos = [sys.intern(codigo) for codigo in codigos]
+        self.hubs = {ciudad:i for i,ciudad in enumerate(hubs)}
+        self.tablas = tablas
+        self.consultas = 0
+
+    def __len__(self):
+        return len(self.hubs)
+
+    def cubre(self,peso,origen,destino):
+        """Devuelve True si el oráculo tiene el camino de 'origen' a 'destino'
+        (dos ciudades) según 'peso'. Opera en O(1)."""
+
+        return peso in self.tablas and origen in self.hubs and destino in self.hubs
+
+    def camino(self,peso,origen,destino):
+        """Devuelve (camino, distancia) entre dos ciudades hub, con el camino
+        como lista de aeropuertos, o (None, None) si no hay camino. Opera en
+        O(largo del camino)."""
+
+        dist,inicios,caminos = self.tablas[peso]
+        par = self.hubs[origen] * len(self.hubs) + self.hubs[destino]
+        self.consultas += 1
+        if dist[par] < 0:
+            return None,None
+        return [self.codigos[i] for i in caminos[inicios[par]:inicios[par + 1]]],dist[par]
@@ -0,0 +1,194 @@
+#
+#   Servidor de consultas: carga la red una sola vez y atiende a muchos
+#   clientes a la vez, por TCP o por un socket Unix, con asyncio.
+#
+#   El protocolo es el mismo que el de la entrada estándar: cada línea que
+#   manda el cliente es un comando de flycombi, y el servidor contesta con
+#   las líneas que el comando imprime seguidas de una línea vacía, que marca
+#   el fin de la respuesta. Los comandos de cada conexión se responden en
+#   orden. Si un comando falla (por ejemplo, con una ciudad que no existe),
+#   la respuesta es una única línea que empieza con ERROR y la conexión
+#   sigue abierta para los comandos siguientes.
+#
+#   Las consultas cortas (camino_mas, camino_escalas, cambios en los
+#   vuelos) se ejecutan directamente en el bucle de eventos y comparten la
+#   cache de caminos. Los comandos pesados (centralidad, vacaciones, ...) se
+#   mandan a un pool de procesos, para que no demoren a las consultas
+#   cortas de los demás clientes. Los procesos del pool trabajan sobre una
+#   copia de la red: si un cambio en los vuelos la modifica, el pool se
+#   vuelve a crear antes del siguiente comando pesado.
+#
+#   El comando estadisticas_servidor devuelve, por comando, la cantidad de
+#   pedidos y los percentiles de latencia de los últimos MUESTRAS_LATENCIA.
+#
+
+import asyncio
+import io
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+
+ESTADISTICAS_SERVIDOR = "estadisticas_servidor"
+MUESTRAS_LATENCIA = 10000 # Latencias que se guardan por comando
+PERCENTILES = (50,90,99)
+FIN_RESPUESTA = "\n"
+ERROR = "ERROR"
+
+_estado_trabajador = None # Estado y función de ejecución de cada proceso del pool
+_ejecutar_trabajador = None
+
+
+def ejecutar_capturando(ejecutar,estado,linea):
+    """Ejecuta el comando y devuelve lo que imprime, en lugar de imprimirlo."""
+
+    salida = io.StringIO()
+    with redirect_stdout(salida):
+        ejecutar(estado,linea)
+    return salida.getvalue()
+
+def _iniciar_trabajador(estado,ejecutar):
+    """Deja la red disponible para _ejecutar_en_trabajador en un proceso del pool."""
+    global _estado_trabajador,_ejecutar_trabajador
+    _estado_trabajador = estado
+    _ejecutar_trabajador = ejecutar
+
+def _ejecutar_en_trabajador(linea):
+    return ejecutar_capturando(_ejecutar_trabajador,_estado_trabajador,linea)
+
+def percentil(ordenadas,p):
+    """Devuelve el percentil 'p' (0 a 100) de una lista ordenada, por el
+    método del rango más cercano."""
+
+    if not ordenadas:
+        return 0
+    posicion = max(0,-(-p * len(ordenadas) // 100) - 1)
+    return ordenadas[posicion]
+
+
+                    ########################
+                    #                      #
+                    #        CLASES        #
+                    #                      #
+                    ########################
+
+class Servidor:
+
+    def __init__(self,estado,ejecutar,pesados,procesos=2):
+        """Recibe el estado de flycombi (red, cache y argumentos), la función que
+        ejecuta una línea de comando sobre él y el conjunto de comandos que deben
+        ir al pool de 'procesos' procesos."""
+
+        self.estado = estado
+        self.ejecutar = ejecutar
+        self.pesados = set(pesados)
+        self.procesos = procesos
+        self.pool = None
+        self.version_pool = None
+        self.latencias = {}
+        self.pedidos = {}
+        self.clientes = 0
+
+    def _pool(self):
+        """Devuelve el pool de procesos, creándolo de nuevo si la red cambió
+        desde que se creó el anterior. Donde se puede usar fork, los procesos
+        heredan la red sin copiarla ni serializarla."""
+
+        version = (id(self.estado.grafo),self.estado.grafo.version)
+        if self.pool is not None and self.version_pool == version:
+            return self.pool
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+        if "fork" in multiprocessing.get_all_start_methods():
+            _iniciar_trabajador(self.estado,self.ejecutar)
+            self.pool = ProcessPoolExecutor(self.procesos,mp_context=multiprocessing.get_context("fork"))
+        else:
+            self.pool = ProcessPoolExecutor(self.procesos,initializer=_iniciar_trabajador,
+                                            initargs=(self.estado,self.ejecutar))
+        self.version_pool = version
+        return self.pool
+
+    async def responder(self,linea):
+        """Devuelve la respuesta a una línea de comando y registra su latencia."""
+
+        inicio = time.perf_counter()
+        comando = linea.split(" ",1)[0].strip()
+        if comando == ESTADISTICAS_SERVIDOR:
+            respuesta = self.estadisticas()
+        elif comando in self.pesados:
+            loop = asyncio.get_running_loop()
+            respuesta = await loop.run_in_executor(self._pool(),_ejecutar_en_trabajador,linea)
+        else:
+            respuesta = ejecutar_capturando(self.ejecutar,self.estado,linea)
+        self.registrar(comando,time.perf_counter() - inicio)
+        return respuesta
+
+    def registrar(self,comando,latencia):
+        if comando not in self.latencias:
+            self.latencias[comando] = deque(maxlen=MUESTRAS_LATENCIA)
+            self.pedidos[comando] = 0
+        self.latencias[comando].append(latencia)
+        self.pedidos[comando] += 1
+
+    def estadisticas(self):
+        """Devuelve una línea por comando con la cantidad de pedidos atendidos y
+        los percentiles de latencia (en milisegundos) de los últimos pedidos."""
+
+        lineas = [f"clientes: {self.clientes}"]
+        for comando in sorted(self.latencias):
+            ordenadas = sorted(self.latencias[comando])
+            valores = [f"p{p}: {1000 * percentil(ordenadas,p):.2f}ms" for p in PERCENTILES]
+            valores.append(f"max: {1000 * ordenadas[-1]:.2f}ms")
+            lineas.append(f"{comando}: pedidos: {self.pedidos[comando]}, " + ", ".join(valores))
+        return "\n".join(lineas) + "\n"
+
+    def respuesta_error(self,error):
+        """Devuelve la línea de respuesta para un comando que lanzó 'error'. Si
+        el que falló fue el pool de procesos (murió alguno), lo descarta para
+        que el próximo comando pesado cree otro."""
+
+        if isinstance(error,BrokenProcessPool):
+            self.pool = None
+        detalle = str(error).replace("\n"," ")
+        return f"{ERROR}: {type(error).__name__}: {detalle}\n"
+
+    async def atender(self,lector,escritor):
+        """Atiende a un cliente hasta que cierra la conexión."""
+
+        self.clientes += 1
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                linea = linea.decode().rstrip("\r\n")
+                if not linea.strip():
+                    continue
+                try:
+                    respuesta = await self.responder(linea)
+                except Exception as error: # Un comando que falla no corta la conexión
+                    respuesta = self.respuesta_error(error)
+                escritor.write((respuesta + FIN_RESPUESTA).encode())
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clientes -= 1
+            escritor.close()
+
+    async def servir(self,host=None,puerto=None,ruta_unix=None):
+        """Escucha en 'ruta_unix' si se indica, o si no en host:puerto, hasta
+        que se interrumpa el proceso."""
+
+        if ruta_unix is not None:
+            servidor = await asyncio.start_unix_server(self.atender,path=ruta_unix)
+        else:
+            servidor = await asyncio.start_server(self.atender,host,puerto)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown(wait=False,cancel_futures=True)
@@ -0,0 +1,184 @@
+#
+#   Snapshot binario de la red de vuelos, para no volver a leer los csv en
+#   cada arranque.
+#
+#   Formato (versión FORMATO), todos los enteros en el orden de bytes de
+#   la máquina que lo generó (queda registrado en los metadatos):
+#
+#       MAGIA (8 bytes) | FORMATO (uint32) | largo de metadatos (uint64)
+#       metadatos en JSON: archivos fuente (mtime y tamaño), tabla de
+#           códigos, índice ciudad -> aeropuertos, y la ubicación de cada
+#           arreglo dentro del archivo
+#       arreglos CSR (inicios, vecinos y un arreglo por atributo),
+#           alineados a 8 bytes
+#
+#   Al cargarlo, el archivo se mapea en memoria y los arreglos se usan
+#   directamente como memoryview, sin copiarlos. Si alguno de los csv
+#   cambió (mtime o tamaño) desde que se generó, se vuelve a generar.
+#
+#   guardar_arreglos y mapear_arreglos sirven para cualquier otro archivo
+#   precalculado a partir de los csv (con su propia MAGIA y FORMATO).
+#
+
+import os
+import sys
+import mmap
+import json
+import struct
+from array import array
+from grafo import GrafoCSR
+from carga import leer_red, TIPOS
+
+MAGIA = b"FLYCOMBI"
+FORMATO = 1
+ENCABEZADO = struct.Struct("<8sIQ")
+ALINEACION = 8
+
+
+def _firma(ruta):
+    """Identifica la versión de un archivo fuente por su mtime y tamaño."""
+    estado = os.stat(ruta)
+    return [estado.st_mtime_ns,estado.st_size]
+
+
+def firmas(aeropuertos,vuelos):
+    """Firmas de los dos csv, tal como se guardan en los metadatos."""
+    return {"aeropuertos":_firma(aeropuertos),"vuelos":_firma(vuelos)}
+
+
+def compilar(aeropuertos,vuelos,ruta,columnas):
+    """Lee los csv de aeropuertos y vuelos y guarda el snapshot en 'ruta'.
+    'columnas' es un diccionario {atributo: (tipo, columna, conversion)} que
+    indica, para cada peso, su tipo de arreglo, la columna del csv de vuelos
+    de la que sale y la función que convierte el texto al valor."""
+
+    grafo,cities,flights = leer_red(aeropuertos,vuelos,columnas,informe=None)
+    escribir(grafo,cities,ruta,firmas(aeropuertos,vuelos))
+
+
+def escribir(grafo,cities,ruta,fuentes):
+    """Guarda un GrafoCSR (con sus atributos) y el índice de ciudades en 'ruta'."""
+
+    arreglos = [("inicios",array('q',grafo.inicios)),("vecinos",array('q',grafo.vecinos))]
+    for atributo,columna in grafo.atributos.items():
+        tipo = columna.typecode if isinstance(columna,array) else columna.format
+        arreglos.append((atributo,array(TIPOS[tipo],columna)))
+
+    guardar_arreglos(ruta,MAGIA,FORMATO,{
+        "fuentes": fuentes,
+        "codigos": grafo.codigos,
+        "ciudades": cities,
+        "aristas": grafo.aristas,
+    },arreglos)
+
+
+def guardar_arreglos(ruta,magia,formato,metadatos,arreglos):
+    """Escribe en 'ruta' un archivo con el encabezado (magia, formato), los
+    'metadatos' en JSON y la lista de 'arreglos' [(nombre, array)], con el
+    mismo formato que el snapshot. Se escribe en un temporal y se reemplaza
+    al final, para no dejar nunca un archivo a medias."""
+
+    ubicaciones = []
+    desplazamiento = 0
+    for nombre,datos in arreglos:
+        ubicaciones.append({"nombre":nombre,"tipo":datos.typecode,"desplazamiento":desplazamiento,"largo":len(datos)})
+        desplazamiento += _alinear(len(datos) * datos.itemsize)
+
+    metadatos = json.dumps(dict(metadatos,orden_bytes=sys.byteorder,arreglos=ubicaciones)).encode()
+
+    temporal = ruta + ".tmp"
+    with open(temporal,"wb") as archivo:
+        archivo.write(ENCABEZADO.pack(magia,formato,len(metadatos)))
+        archivo.write(metadatos)
+        archivo.write(bytes(_alinear(archivo.tell()) - archivo.tell()))
+        for nombre,datos in arreglos:
+            archivo.write(datos.tobytes())
+            archivo.write(bytes(_alinear(len(datos) * datos.itemsize) - len(datos) * datos.itemsize))
+    os.replace(temporal,ruta)
+
+
+def _alinear(n):
+    return (n + ALINEACION - 1) // ALINEACION * ALINEACION
+
+
+def _leer_metadatos(datos,magia=MAGIA,formato=FORMATO):
+    """Valida el encabezado y devuelve (metadatos, inicio de los arreglos),
+    o None si el archivo no es de este tipo y formato."""
+
+    if len(datos) < ENCABEZADO.size:
+        return None
+    leida,version,largo = ENCABEZADO.unpack_from(datos)
+    if leida != magia or version != formato:
+        return None
+    metadatos = json.loads(bytes(datos[ENCABEZADO.size:ENCABEZADO.size + largo]))
+    if metadatos["orden_bytes"] != sys.byteorder:
+        return None
+    return metadatos,_alinear(ENCABEZADO.size + largo)
+
+
+def leer_encabezado(ruta,magia=MAGIA,formato=FORMATO):
+    """Devuelve los metadatos de 'ruta' leyendo sólo el principio del
+    archivo, o None si no existe o no es de este tipo y formato."""
+
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta,"rb") as archivo:
+        encabezado = archivo.read(ENCABEZADO.size)
+        if len(encabezado) < ENCABEZADO.size:
+            return None
+        largo = ENCABEZADO.unpack(encabezado)[2]
+        leido = _leer_metadatos(encabezado + archivo.read(largo),magia,formato)
+    return None if leido is None else leido[0]
+
+
+def esta_actualizado(ruta,aeropuertos,vuelos,magia=MAGIA,formato=FORMATO):
+    """Devuelve True si existe en 'ruta' un archivo válido generado a partir
+    de las versiones actuales de los csv."""
+
+    metadatos = leer_encabezado(ruta,magia,formato)
+    return metadatos is not None and metadatos["fuentes"] == firmas(aeropuertos,vuelos)
+
+
+def mapear_arreglos(ruta,magia=MAGIA,formato=FORMATO):
+    """Mapea el archivo en memoria y devuelve (metadatos, {nombre: arreglo}),
+    con cada arreglo como memoryview que apunta directo al archivo."""
+
+    with open(ruta,"rb") as archivo:
+        mapa = mmap.mmap(archivo.fileno(),0,access=mmap.ACCESS_READ)
+    leido = _leer_metadatos(mapa,magia,formato)
+    if leido is None:
+        raise ValueError(f"'{ruta}' no es un archivo válido de este tipo.")
+    metadatos,inicio = leido
+
+    vista = memoryview(mapa)
+    arreglos = {}
+    for ubicacion in metadatos["arreglos"]:
+        desde = inicio + ubicacion["desplazamiento"]
+        tamanio = ubicacion["largo"] * array(ubicacion["tipo"]).itemsize
+        arreglos[ubicacion["nombre"]] = vista[desde:desde + tamanio].cast(ubicacion["tipo"])
+    return metadatos,arreglos
+
+
+def cargar(ruta,derivados=None):
+    """Mapea el snapshot en memoria y devuelve (grafo, cities, flights), con
+    el grafo como GrafoCSR cuyos arreglos apuntan directo al archivo. Los
+    'derivados' no se guardan en el snapshot: se arman al pedirlos."""
+
+    metadatos,arreglos = mapear_arreglos(ruta)
+    codigos = [sys.intern(codigo) for codigo in metadatos["codigos"]]
+    inicios = arreglos.pop("inicios")
+    vecinos = arreglos.pop("vecinos")
+    grafo = GrafoCSR(codigos,inicios,vecinos,atributos=arreglos,aristas=metadatos["aristas"],derivados=derivados)
+
+    cities = {ciudad:[sys.intern(codigo) for codigo in aeropuertos] for ciudad,aeropuertos in metadatos["ciudades"].items()}
+    flights = {codigo:ciudad for ciudad,aeropuertos in cities.items() for codigo in aeropuertos}
+    return grafo,cities,flights
+
+
+def cargar_o_compilar(aeropuertos,vuelos,ruta,columnas,derivados=None):
+    """Carga el snapshot de 'ruta', generándolo antes si no existe o si los
+    csv cambiaron. Devuelve (grafo, cities, flights)."""
+
+    if not esta_actualizado(ruta,aeropuertos,vuelos):
+        compilar(aeropuertos,vuelos,ruta,columnas)
+    return cargar(ruta,derivados)